@@ -10,52 +10,58 @@ A multi-agent system for interacting with GitHub repositories using specialized
 ──────────────────────────────────────────────────────────────────
 Prereqs
 -------
-pip install llama-index-core llama-index-llms-openrouter requests pydantic
+pip install llama-index-core llama-index-llms-openrouter requests aiohttp pydantic
 Environment variables
 ---------------------
 GITHUB_PERSONAL_ACCESS_TOKEN  # your fine-grained or classic PAT
 GITHUB_USERNAME              # your GitHub username
 OPENROUTER_API_KEY           # for LLM access
+
+Server mode
+-----------
+python agent_server.py        # HTTP/JSON, many sessions on one warm instance
+
+Webhooks
+--------
+GITHUB_WEBHOOK_SECRET        # enables POST /webhooks/github (cache invalidation)
+GITHUB_WEBHOOK_PORT          # interactive mode: also run a receiver on this port
+
+Agent modes
+-----------
+AGENT_MODE=flat              # one agent, AGENT_FLAT_TOP_K retrieved tools per request,
+                             # instead of master + specialists (one LLM hop fewer)
+AGENT_TOOLS_EMBED_MODEL      # optional embeddings for tool retrieval
+AGENT_SPECIALIST_MODE=function
+                             # specialists as function-calling agents: several tool
+                             # calls per LLM turn, run concurrently (AGENT_TOOL_PARALLEL)
+
+Streaming
+---------
+Answers stream token by token, specialists' included; AGENT_STREAM=0 prints
+them only once complete.
 """
 from __future__ import annotations
 
+import functools
 import os
 import sys
 import json
-from typing import List, Optional, Dict, Any, Tuple
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Tuple
 from dotenv import load_dotenv
 
-from llama_index.core.tools import FunctionTool, ToolMetadata
-from llama_index.core.agent import ReActAgent
-from llama_index.llms.openrouter import OpenRouter
-
-# Import Repo tools
-from mcp_tools.repos import (
-    create_repository_tool,
-    create_or_update_file_tool,
-    create_branch_tool,
-    fork_repository_tool,
-    get_file_contents_tool,
-    list_branches_tool,
-    search_repositories_tool
-)
-
-from mcp_tools.issues import (
-    close_issue,
-    comment_issue,
-    create_issue,
-    get_issue,
-    list_issues,
-    search_issues
-)
-
-from mcp_tools.users import (
-    get_authenticated_user,
-    get_user,
-    list_followers,
-    list_following,
-    list_user_repos
-)
+# llama_index and the OpenRouter client take seconds to import: they are
+# loaded inside the functions that need them, and tools load on first use
+# through the lazy registry (mcp_tools.registry).
+if TYPE_CHECKING:
+    from llama_index.core.agent import ReActAgent
+    from llama_index.core.tools import FunctionTool
+    from llama_index.llms.openrouter import OpenRouter
+
+from mcp_tools import (common, dispatch, function_calling, gitdata, issue_store, projection,
+                       registry, streaming, tool_index, tracing)
+from mcp_tools import repos as repo_tools, issues as issue_tools, users as user_tools
+from mcp_tools.llm_cache import LLMCache, picks_tool
+from mcp_tools.router import Router
 
 # Define agent types
 class AgentType:
@@ -63,6 +69,12 @@ class AgentType:
     ISSUE = "issue"
     USER = "user"
     MASTER = "master"
+    FLAT = "flat"
+
+# "hierarchical": master delegates to specialists; "flat": one agent, retrieved tools
+AGENT_MODE = os.getenv("AGENT_MODE", "hierarchical")
+# Specialists: "react" (one tool call per LLM turn) or "function" (parallel tool calls)
+SPECIALIST_MODE = os.getenv("AGENT_SPECIALIST_MODE", "react")
 
 def load_environment_variables() -> tuple:
     """Load environment variables and prompt for missing ones."""
@@ -91,33 +103,206 @@ def load_environment_variables() -> tuple:
     
     return github_token, github_username, openrouter_key
 
+@functools.lru_cache(maxsize=None)
+def cached_openrouter_class() -> type:
+    """OpenRouter subclass with an LLMCache (defined on first use: see imports)."""
+    from llama_index.core.bridge.pydantic import PrivateAttr
+    from llama_index.core.llms import ChatMessage, ChatResponse
+    from llama_index.llms.openrouter import OpenRouter
+
+    # Function calling: tool calls and the ids answering them are part of the key
+    def _cache_content(m: ChatMessage) -> str:
+        extra = {k: m.additional_kwargs[k] for k in ("tool_calls", "tool_call_id")
+                 if k in m.additional_kwargs}
+        return (m.content or "") + (f"\0{json.dumps(extra, sort_keys=True, default=str)}" if extra else "")
+
+    # Only final answers may be reused for a similar (not identical) request
+    def _final_answer(r: ChatResponse) -> bool:
+        return not r.message.additional_kwargs.get("tool_calls") and not picks_tool(r.message.content)
+
+    class CachedOpenRouter(OpenRouter):
+        """OpenRouter client whose chat/achat completions are served from an LLMCache."""
+
+        _cache: Optional[LLMCache] = PrivateAttr(default=None)
+
+        def _cache_args(self, messages: List[ChatMessage], kwargs: Dict[str, Any]):
+            msgs = [(str(m.role.value), _cache_content(m)) for m in messages]
+            settings = {"model": self.model, "temperature": self.temperature,
+                        "max_tokens": self.max_tokens, **{k: repr(v) for k, v in kwargs.items()}}
+            return msgs, settings
+
+        def chat(self, messages: List[ChatMessage], **kwargs: Any) -> ChatResponse:
+            if self._cache is None:
+                return super().chat(messages, **kwargs)
+            msgs, settings = self._cache_args(messages, kwargs)
+            cached = self._cache.get(msgs, settings)
+            if cached is not None:
+                with tracing.span("llm.chat", model=self.model, cache="hit"):
+                    return cached.model_copy(deep=True)
+            response = super().chat(messages, **kwargs)
+            self._cache.put(msgs, settings, response.model_copy(deep=True),
+                            semantic=_final_answer(response))
+            return response
+
+        async def achat(self, messages: List[ChatMessage], **kwargs: Any) -> ChatResponse:
+            if self._cache is None:
+                return await super().achat(messages, **kwargs)
+            msgs, settings = self._cache_args(messages, kwargs)
+            cached = self._cache.get(msgs, settings)
+            if cached is not None:
+                with tracing.span("llm.chat", model=self.model, cache="hit"):
+                    return cached.model_copy(deep=True)
+            response = await super().achat(messages, **kwargs)
+            self._cache.put(msgs, settings, response.model_copy(deep=True),
+                            semantic=_final_answer(response))
+            return response
+
+        # Streams share the entries of chat/achat: a hit is replayed as one
+        # chunk, a miss is stored once the last chunk has gone by.
+        def _replay(self, cached: ChatResponse) -> ChatResponse:
+            chunk = cached.model_copy(deep=True)
+            chunk.delta = chunk.message.content
+            return chunk
+
+        def _final(self, chunk: ChatResponse) -> ChatResponse:
+            final = chunk.model_copy(deep=True)
+            final.delta = None
+            return final
+
+        def stream_chat(self, messages: List[ChatMessage], **kwargs: Any):
+            if self._cache is None:
+                return super().stream_chat(messages, **kwargs)
+            msgs, settings = self._cache_args(messages, kwargs)
+            cached = self._cache.get(msgs, settings)
+            if cached is not None:
+                with tracing.span("llm.chat", model=self.model, cache="hit"):
+                    return iter([self._replay(cached)])
+            stream = super().stream_chat(messages, **kwargs)
+
+            def gen():
+                chunk = None
+                for chunk in stream:
+                    yield chunk
+                if chunk is not None:
+                    final = self._final(chunk)
+                    self._cache.put(msgs, settings, final, semantic=_final_answer(final))
+            return gen()
+
+        async def astream_chat(self, messages: List[ChatMessage], **kwargs: Any):
+            if self._cache is None:
+                return await super().astream_chat(messages, **kwargs)
+            msgs, settings = self._cache_args(messages, kwargs)
+            cached = self._cache.get(msgs, settings)
+            if cached is not None:
+                with tracing.span("llm.chat", model=self.model, cache="hit"):
+                    chunk = self._replay(cached)
+
+                async def hit():
+                    yield chunk
+                return hit()
+            stream = await super().astream_chat(messages, **kwargs)
+
+            async def gen():
+                chunk = None
+                async for chunk in stream:
+                    yield chunk
+                if chunk is not None:
+                    final = self._final(chunk)
+                    self._cache.put(msgs, settings, final, semantic=_final_answer(final))
+            return gen()
+
+    return CachedOpenRouter
+
+# Shared by every agent; dropped entries follow GitHub writes (see common.on_mutation).
+llm_response_cache: Optional[LLMCache] = None
+
+def create_cache_embedding(env: str = "LLM_CACHE_EMBED_MODEL"):
+    """Embedding function for the semantic cache tier (or tool retrieval), if ``env`` is set."""
+    model = os.getenv(env)
+    if not model:
+        return None
+    try:
+        from llama_index.embeddings.openai import OpenAIEmbedding
+    except ImportError:
+        print(f"{env} needs llama-index-embeddings-openai; using exact matching only.")
+        return None
+    return OpenAIEmbedding(model=model).get_text_embedding
+
 def create_llm(openrouter_key: str) -> OpenRouter:
-    """Create an OpenRouter LLM instance."""
-    return OpenRouter(
+    """Create an OpenRouter LLM instance (with a response cache unless LLM_CACHE=0)."""
+    global llm_response_cache
+    llm = cached_openrouter_class()(
         model="openai/gpt-4o-mini",  # You can change this to any model OpenRouter supports
         api_key=openrouter_key,
+        is_function_calling_model=True,  # needed by AGENT_SPECIALIST_MODE=function
     )
+    if llm_response_cache is None:
+        llm_response_cache = LLMCache.from_env(embed=create_cache_embedding())
+        if llm_response_cache:
+            common.on_mutation(llm_response_cache.invalidate_path)
+    llm._cache = llm_response_cache
+    return tracing.instrument_llm(llm)
 
-def build_repo_agent(llm: OpenRouter) -> Optional[ReActAgent]:
+def create_specialist(
+    tools: List[FunctionTool],
+    llm: OpenRouter,
+    agent_type: str,
+    system_prompt: str,
+    verbose: bool = True,
+    mode: Optional[str] = None
+) -> ReActAgent:
+    """Build a specialist agent in ``mode`` (or AGENT_SPECIALIST_MODE) with bounded memory."""
+    from mcp_tools import memory as agent_memory
+    
+    memory = agent_memory.for_agent(agent_type, llm)
+    if (mode or SPECIALIST_MODE) == "function":
+        return function_calling.build_agent(
+            tools,
+            llm,
+            memory=memory,
+            verbose=verbose,
+            system_prompt=system_prompt + (
+                " When a request needs several independent lookups, request all "
+                "the tool calls in one response: they run in parallel."
+            )
+        )
+    
+    from llama_index.core.agent import ReActAgent
+    return ReActAgent.from_tools(
+        tools=tools,
+        llm=llm,
+        verbose=verbose,
+        memory=memory,
+        max_iterations=5,
+        system_prompt=system_prompt
+    )
+
+def build_repo_agent(llm: OpenRouter, verbose: bool = True,
+                     mode: Optional[str] = None) -> Optional[ReActAgent]:
     """Build a specialized agent for repository operations."""
     try:
         # Collect repository tools
-        repo_tools = [
-            create_repository_tool,
-            create_or_update_file_tool,
-            create_branch_tool,
-            fork_repository_tool,
-            get_file_contents_tool,
-            list_branches_tool,
-            search_repositories_tool,
+        tools = [
+            repo_tools.create_repository_tool,
+            repo_tools.create_or_update_file_tool,
+            repo_tools.create_branch_tool,
+            repo_tools.commit_files_tool,
+            repo_tools.fetch_repo_overview_tool,
+            repo_tools.fork_repository_tool,
+            repo_tools.get_file_contents_tool,
+            repo_tools.get_repository_tree_tool,
+            repo_tools.list_branches_tool,
+            repo_tools.read_repository_files_tool,
+            repo_tools.search_repositories_tool,
         ]
         
-        # Create ReAct agent
-        agent = ReActAgent.from_tools(
-            tools=repo_tools,
-            llm=llm,
-            verbose=True,
-            max_iterations=5,
+        # ReAct, or function calling with parallel tool calls (AGENT_SPECIALIST_MODE)
+        agent = create_specialist(
+            tools,
+            llm,
+            AgentType.REPO,
+            verbose=verbose,
+            mode=mode,
             system_prompt=(
                 "You are a specialized GitHub Repository Agent. "
                 "You handle repository-related operations like creating repositories, "
@@ -132,25 +317,27 @@ def build_repo_agent(llm: OpenRouter) -> Optional[ReActAgent]:
         print(f"Error building repository agent: {e}")
         return None
 
-def build_issue_agent(llm: OpenRouter) -> Optional[ReActAgent]:
+def build_issue_agent(llm: OpenRouter, verbose: bool = True,
+                      mode: Optional[str] = None) -> Optional[ReActAgent]:
     """Build a specialized agent for issue operations."""
     try:
         # Collect issue tools
-        issue_tools = [
-            close_issue.close_issue_tool,
-            comment_issue.comment_issue_tool,
-            create_issue.create_issue_tool,
-            get_issue.get_issue_tool,
-            list_issues.list_issues_tool,
-            search_issues.search_issues_tool,
+        tools = [
+            issue_tools.close_issue_tool,
+            issue_tools.comment_issue_tool,
+            issue_tools.create_issue_tool,
+            issue_tools.get_issue_tool,
+            issue_tools.list_issues_tool,
+            issue_tools.search_issues_tool,
         ]
         
-        # Create ReAct agent
-        agent = ReActAgent.from_tools(
-            tools=issue_tools,
-            llm=llm,
-            verbose=True,
-            max_iterations=5,
+        # ReAct, or function calling with parallel tool calls (AGENT_SPECIALIST_MODE)
+        agent = create_specialist(
+            tools,
+            llm,
+            AgentType.ISSUE,
+            verbose=verbose,
+            mode=mode,
             system_prompt=(
                 "You are a specialized GitHub Issue Agent. "
                 "You handle issue-related operations like creating issues, "
@@ -165,24 +352,26 @@ def build_issue_agent(llm: OpenRouter) -> Optional[ReActAgent]:
         print(f"Error building issue agent: {e}")
         return None
 
-def build_user_agent(llm: OpenRouter) -> Optional[ReActAgent]:
+def build_user_agent(llm: OpenRouter, verbose: bool = True,
+                     mode: Optional[str] = None) -> Optional[ReActAgent]:
     """Build a specialized agent for user operations."""
     try:
         # Collect user tools
-        user_tools = [
-            get_authenticated_user.get_authenticated_user_tool,
-            get_user.get_user_tool,
-            list_followers.list_followers_tool,
-            list_following.list_following_tool,
-            list_user_repos.list_user_repos_tool,
+        tools = [
+            user_tools.get_authenticated_user_tool,
+            user_tools.get_user_tool,
+            user_tools.list_followers_tool,
+            user_tools.list_following_tool,
+            user_tools.list_user_repos_tool,
         ]
         
-        # Create ReAct agent
-        agent = ReActAgent.from_tools(
-            tools=user_tools,
-            llm=llm,
-            verbose=True,
-            max_iterations=5,
+        # ReAct, or function calling with parallel tool calls (AGENT_SPECIALIST_MODE)
+        agent = create_specialist(
+            tools,
+            llm,
+            AgentType.USER,
+            verbose=verbose,
+            mode=mode,
             system_prompt=(
                 "You are a specialized GitHub User Agent. "
                 "You handle user-related operations like getting user information, "
@@ -199,22 +388,56 @@ def build_user_agent(llm: OpenRouter) -> Optional[ReActAgent]:
 
 def create_agent_tool(agent: ReActAgent, agent_type: str) -> FunctionTool:
     """Create a tool that represents a specialized agent."""
+    from llama_index.core.tools import FunctionTool, ToolMetadata
     
-    # Use a lambda function to directly handle the input parameter
+    # With a token sink open (streaming.stream_to) the specialist's answer
+    # streams to the user while the master receives it as the observation.
+    def _chat(**kwargs) -> str:
+        with tracing.span("agent.chat", agent=agent_type), function_calling.observe(agent):
+            return streaming.chat(agent, kwargs.get('input', ''), agent_type)
+
+    async def _achat(**kwargs) -> str:
+        with tracing.span("agent.chat", agent=agent_type), function_calling.observe(agent):
+            return await streaming.achat(agent, kwargs.get('input', ''), agent_type)
+
     return FunctionTool(
-        fn=lambda **kwargs: str(agent.chat(kwargs.get('input', ''))),
+        fn=_chat,
+        async_fn=_achat,
         metadata=ToolMetadata(
             name=f"{agent_type}_agent",
             description=f"Use the {agent_type} agent to handle {agent_type}-related operations."
         )
     )
 
+def create_plan_tool(agents: Dict[str, ReActAgent]) -> FunctionTool:
+    """Create a tool that runs a dependency graph of specialist sub-tasks concurrently."""
+    from llama_index.core.tools import FunctionTool
+
+    def _run(plan) -> str:
+        return json.dumps(dispatch.run_plan(plan, agents), separators=(",", ":"))
+
+    async def _arun(plan) -> str:
+        return json.dumps(await dispatch.arun_plan(plan, agents), separators=(",", ":"))
+
+    return FunctionTool.from_defaults(
+        fn=_run,
+        async_fn=_arun,
+        name="run_agent_plan",
+        description=(
+            "Run several specialist sub-tasks in one step. `plan` is a JSON list of "
+            '{"id", "agent" (repository|issue|user), "input", "depends_on": [ids]}. '
+            "Tasks without pending dependencies run in parallel; write {id} in an input "
+            "to insert that task's result. Returns every result in plan order."
+        ),
+    )
+
 def build_master_agent(
     repo_agent: ReActAgent,
     issue_agent: ReActAgent,
     user_agent: ReActAgent,
     llm: OpenRouter,
-    github_username: str
+    github_username: str,
+    verbose: bool = True
 ) -> Optional[ReActAgent]:
     """Build a master agent that orchestrates the specialized agents."""
     try:
@@ -223,18 +446,29 @@ def build_master_agent(
         issue_agent_tool = create_agent_tool(issue_agent, AgentType.ISSUE)
         user_agent_tool = create_agent_tool(user_agent, AgentType.USER)
         
+        plan_tool = create_plan_tool({
+            AgentType.REPO: repo_agent,
+            AgentType.ISSUE: issue_agent,
+            AgentType.USER: user_agent,
+        })
+        
         # Collect all agent tools
         agent_tools = [
             repo_agent_tool,
             issue_agent_tool,
             user_agent_tool,
+            plan_tool,
         ]
         
+        from llama_index.core.agent import ReActAgent
+        from mcp_tools import memory as agent_memory
+        
         # Create ReAct agent
         agent = ReActAgent.from_tools(
             tools=agent_tools,
             llm=llm,
-            verbose=True,
+            verbose=verbose,
+            memory=agent_memory.for_agent(AgentType.MASTER, llm, master=True),
             max_iterations=10,
             system_prompt=(
                 f"You are a Master GitHub Agent that orchestrates specialized agents. "
@@ -245,6 +479,8 @@ def build_master_agent(
                 f"All operations will only access repositories owned by: {github_username}\n\n"
                 f"When given a task, analyze it and delegate to the appropriate specialized agent. "
                 f"For complex tasks that require multiple agents, break down the task and delegate each part. "
+                f"When a task has two or more sub-tasks, send them all at once with run_agent_plan: "
+                f"independent sub-tasks run in parallel, and depends_on orders the rest. "
                 f"Ensure that you handle dependencies between tasks correctly."
             )
         )
@@ -255,6 +491,80 @@ def build_master_agent(
         print(f"Error building master agent: {e}")
         return None
 
+@functools.lru_cache(maxsize=None)
+def get_tool_index() -> tool_index.ToolIndex:
+    """Retrieval index over every tool (shared; built from the manifest)."""
+    return tool_index.ToolIndex.from_registry(embed=create_cache_embedding("AGENT_TOOLS_EMBED_MODEL"))
+
+def build_flat_agent(llm: OpenRouter, github_username: str, verbose: bool = True) -> Optional[ReActAgent]:
+    """Build a single agent that sees the top-k tools for each request (AGENT_MODE=flat)."""
+    try:
+        from llama_index.core.agent import ReActAgent
+        from mcp_tools import memory as agent_memory
+        
+        # One hop: the agent calls GitHub tools itself, chosen per request
+        agent = ReActAgent.from_tools(
+            tool_retriever=tool_index.ToolRetriever(get_tool_index()),
+            llm=llm,
+            verbose=verbose,
+            memory=agent_memory.for_agent(AgentType.FLAT, llm, master=True),
+            max_iterations=10,
+            system_prompt=(
+                f"You are a GitHub Agent working with repositories, issues and users. "
+                f"All operations will only access repositories owned by: {github_username}\n"
+                f"The tools offered are the ones most relevant to the request; "
+                f"use them directly and answer concisely."
+            )
+        )
+        
+        return agent
+    
+    except Exception as e:
+        print(f"Error building flat agent: {e}")
+        return None
+
+def build_agent_set(
+    llm: OpenRouter,
+    github_username: str,
+    verbose: bool = True,
+    mode: Optional[str] = None,
+    specialist_mode: Optional[str] = None
+) -> Optional[Tuple[ReActAgent, Dict[str, ReActAgent]]]:
+    """Build one master agent and its specialists (each set has its own chat memory).
+
+    In flat mode (``mode`` or AGENT_MODE) a single tool-retrieving agent
+    stands in for all of them; ``specialist_mode`` overrides AGENT_SPECIALIST_MODE.
+    """
+    if (mode or AGENT_MODE) == "flat":
+        agent = build_flat_agent(llm, github_username, verbose)
+        if not agent:
+            return None
+        return agent, {kind: agent for kind in (AgentType.REPO, AgentType.ISSUE,
+                                                AgentType.USER, AgentType.MASTER)}
+    
+    repo_agent = build_repo_agent(llm, verbose, specialist_mode)
+    issue_agent = build_issue_agent(llm, verbose, specialist_mode)
+    user_agent = build_user_agent(llm, verbose, specialist_mode)
+    
+    if not repo_agent or not issue_agent or not user_agent:
+        print("Failed to build one or more specialized agents.")
+        return None
+    
+    master_agent = build_master_agent(repo_agent, issue_agent, user_agent, llm, github_username, verbose)
+    
+    if not master_agent:
+        print("Failed to build master agent.")
+        return None
+    
+    # Create a dictionary of all agents
+    agents = {
+        AgentType.REPO: repo_agent,
+        AgentType.ISSUE: issue_agent,
+        AgentType.USER: user_agent,
+        AgentType.MASTER: master_agent
+    }
+    return master_agent, agents
+
 def build_multi_agent_system() -> Optional[Tuple[ReActAgent, Dict[str, ReActAgent]]]:
     """Build a multi-agent system with specialized agents and a master agent."""
     try:
@@ -266,39 +576,27 @@ def build_multi_agent_system() -> Optional[Tuple[ReActAgent, Dict[str, ReActAgen
         # Create LLM
         llm = create_llm(openrouter_key)
         
-        # Build specialized agents
-        print("\nBuilding specialized agents...")
-        repo_agent = build_repo_agent(llm)
-        issue_agent = build_issue_agent(llm)
-        user_agent = build_user_agent(llm)
-        
-        if not repo_agent or not issue_agent or not user_agent:
-            print("Failed to build one or more specialized agents.")
-            return None
-        
-        # Build master agent
-        print("\nBuilding master agent...")
-        master_agent = build_master_agent(repo_agent, issue_agent, user_agent, llm, github_username)
-        
-        if not master_agent:
-            print("Failed to build master agent.")
+        # Build specialized agents and the master agent
+        print("\nBuilding specialized agents and master agent...")
+        result = build_agent_set(llm, github_username)
+        if not result:
             return None
-        
-        # Create a dictionary of all agents
-        agents = {
-            AgentType.REPO: repo_agent,
-            AgentType.ISSUE: issue_agent,
-            AgentType.USER: user_agent,
-            AgentType.MASTER: master_agent
-        }
+        master_agent, agents = result
         
         # Print available agents
+        if AGENT_MODE == "flat":
+            print(f"\nFlat mode: one agent with the {tool_index.TOP_K} most relevant tools per request")
+            print(f"All operations will only access repositories owned by: {github_username}")
+            return master_agent, agents
+        
         print("\nAvailable specialized agents:")
         print(f"All agents will only access repositories owned by: {github_username}")
         
         for agent_type in agents:
             if agent_type != AgentType.MASTER:
                 print(f"- {agent_type.capitalize()} Agent")
+        if SPECIALIST_MODE == "function":
+            print("Specialists use function calling (parallel tool calls)")
         
         return master_agent, agents
     
@@ -306,7 +604,68 @@ def build_multi_agent_system() -> Optional[Tuple[ReActAgent, Dict[str, ReActAgen
         print(f"Error building multi-agent system: {e}")
         return None
 
-def run_interactive_loop(master_agent: ReActAgent, agents: Dict[str, ReActAgent]) -> None:
+def build_fast_path_router() -> Router:
+    """Build the rule-based router that answers simple commands without the LLM."""
+    return Router(registry.tools)
+
+def print_github_stats() -> None:
+    """Print GitHub client metrics: pools, cache, rate limits, output sizes."""
+    print("\nConnection pools:")
+    for host, stats in common.pool_stats().items():
+        print(f"  {host}: {stats}")
+    print(f"\nResponse cache: {common.response_cache.stats()}")
+    print(f"Request coalescing: {common.coalesce_stats()}")
+    blob_store = gitdata.get_blob_store()
+    if blob_store:
+        print(f"Blob store: {blob_store.stats()}")
+    issue_mirror = issue_store.get_issue_store()
+    if issue_mirror:
+        print(f"Issue mirror: {issue_mirror.stats()}")
+    print("\nRate limits:")
+    for bucket, stats in common.rate_limit_stats().items():
+        print(f"  {bucket}: remaining={stats['remaining']}/{stats['limit']} "
+              f"waits={stats['waits']} retries={stats['retries']}")
+    if llm_response_cache:
+        print(f"\nLLM response cache: {llm_response_cache.stats()}")
+    print(f"Streaming: {streaming.stats()}")
+    if AGENT_MODE == "flat":
+        print(f"Tool retrieval: {tool_index.stats()}")
+    else:
+        print(f"Specialist turns: {function_calling.stats()}")
+    if "mcp_tools.memory" in sys.modules:        # loaded with the agents
+        print(f"Agent memory: {sys.modules['mcp_tools.memory'].stats()}")
+    print("\nTool output projection:")
+    print(projection.report())
+
+class ConsoleStream:
+    """Token sink writer: prints each agent's answer as it arrives."""
+
+    def __init__(self) -> None:
+        self.agent: Optional[str] = None
+
+    def __call__(self, agent: str, text: str) -> None:
+        if agent != self.agent:
+            label = "Master Agent" if agent == AgentType.MASTER else f"[{agent.capitalize()} Agent]"
+            print(f"\n{label}: ", end="")
+            self.agent = agent
+            text = text.lstrip()
+        print(text, end="", flush=True)
+
+def chat_turn(agent: ReActAgent, message: str, agent_type: str) -> Tuple[str, bool]:
+    """Run one turn, streaming to the console unless AGENT_STREAM=0.
+
+    Returns the answer and whether any of it was printed already.
+    """
+    if os.getenv("AGENT_STREAM", "1") == "0":
+        return str(agent.chat(message)), False
+    with streaming.stream_to(ConsoleStream()) as sink:
+        response = streaming.chat(agent, message, agent_type)
+    if sink.deltas:
+        print()
+    return response, bool(sink.deltas)
+
+def run_interactive_loop(master_agent: ReActAgent, agents: Dict[str, ReActAgent],
+                         router: Optional[Router] = None) -> None:
     """Run an interactive loop for communicating with the multi-agent system."""
     print("\n=== Multi-Agent MCP Tools System ===")
     print("Type 'exit' to quit the program.")
@@ -330,6 +689,8 @@ def run_interactive_loop(master_agent: ReActAgent, agents: Dict[str, ReActAgent]
                 print("  exit/quit - Exit the program")
                 print("  clear - Clear the screen")
                 print("  agents - Show available agents")
+                print("  stats - Show GitHub client statistics")
+                print("  trace - Show where this session's time went (AGENT_TRACE=1)")
                 print("  Any other input will be sent to the master agent")
                 continue
             
@@ -342,6 +703,21 @@ def run_interactive_loop(master_agent: ReActAgent, agents: Dict[str, ReActAgent]
                 print("  4. User Agent - Handles user operations")
                 continue
             
+            # Check for stats command
+            if user_input.lower() == "stats":
+                print_github_stats()
+                if router:
+                    print(f"\nFast-path router: {router.stats()}")
+                continue
+            
+            # Check for trace command
+            if user_input.lower() == "trace":
+                if tracing.enabled():
+                    print(tracing.format_summary(tracing.summary()))
+                else:
+                    print("Tracing is off; set AGENT_TRACE=1 or AGENT_TRACE_FILE=<path>.")
+                continue
+            
             # Check for clear command
             if user_input.lower() == "clear":
                 os.system("cls" if os.name == "nt" else "clear")
@@ -374,15 +750,26 @@ def run_interactive_loop(master_agent: ReActAgent, agents: Dict[str, ReActAgent]
                     continue
                 
                 print(f"\n{agent_type.capitalize()} Agent is thinking...")
-                response = agent.chat(query)
-                print(f"\n{agent_type.capitalize()} Agent: {response}")
+                with tracing.span("turn", agent=agent_type, route=agent_type):
+                    response, streamed = chat_turn(agent, query, agent_type)
+                if not streamed:
+                    print(f"\n{agent_type.capitalize()} Agent: {response}")
             else:
-                # Send input to master agent
-                print("\nMaster Agent is thinking...")
-                response = master_agent.chat(user_input)
+                with tracing.span("turn", agent=AgentType.MASTER, route="fast_path") as turn:
+                    # Simple commands go straight to their tool
+                    routed = router.route(user_input) if router else None
+                    if routed is None:
+                        # Send input to master agent
+                        turn.set(route=AgentType.MASTER)
+                        print("\nMaster Agent is thinking...")
+                        response, streamed = chat_turn(master_agent, user_input, AgentType.MASTER)
+                if routed is not None:
+                    print(f"\nFast path: {routed}")
+                    continue
                 
-                # Display agent response
-                print(f"\nMaster Agent: {response}")
+                # Display agent response (already printed if it streamed)
+                if not streamed:
+                    print(f"\nMaster Agent: {response}")
             
         except KeyboardInterrupt:
             print("\nOperation interrupted by user. Type 'exit' to quit.")
@@ -400,9 +787,14 @@ def main():
             sys.exit(1)
         
         master_agent, agents = result
+
+        if os.getenv("GITHUB_WEBHOOK_PORT"):
+            from mcp_tools import webhooks
+            receiver = webhooks.start_receiver(port=int(os.environ["GITHUB_WEBHOOK_PORT"]))
+            print(f"Webhook receiver on port {receiver.server_port}")
         
         # Run interactive loop
-        run_interactive_loop(master_agent, agents)
+        run_interactive_loop(master_agent, agents, build_fast_path_router())
         
     except KeyboardInterrupt:
         print("\nProgram terminated by user.")
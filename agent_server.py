@@ -0,0 +1,388 @@
+"""
+Agent Server
+────────────
+Long-running HTTP/JSON front end for the multi-agent system.  One process
+keeps a single warm LLM client, tool registry, fast-path router, caches and
+GitHub connection pools; every session gets its own master + specialist
+agents, so chat memory never leaks between sessions.
+
+Endpoints
+---------
+POST   /sessions                  → {"session_id"}
+POST   /sessions/{id}/chat        {"message", "agent"?, "stream"?} → {"response", "route", "seconds"}
+POST   /chat                      {"message", "session_id"?, "agent"?, "stream"?} (creates the session)
+DELETE /sessions/{id}
+GET    /sessions/{id}/trace       time per span, LLM tokens, GitHub calls (AGENT_TRACE=1)
+POST   /webhooks/github           GitHub deliveries → cache invalidation (GITHUB_WEBHOOK_SECRET)
+GET    /health, /stats
+
+Admission control
+-----------------
+AGENT_SERVER_MAX_INFLIGHT         chat turns running at once (default 8)
+AGENT_SERVER_QUEUE_TIMEOUT        seconds a turn may wait for a slot before 503 (default 10)
+AGENT_SERVER_SESSION_CONCURRENCY  turns per session at once; more get 429 (default 1)
+AGENT_SERVER_MAX_SESSIONS         open sessions; more get 503 (default 100)
+AGENT_SERVER_SESSION_TTL          idle seconds before a session is dropped, checked on every request (default 1800)
+
+Streaming
+---------
+With ``"stream": true`` a chat answers ``text/event-stream``: ``token`` events
+``{"agent", "text"}`` as the master and its specialists produce their answers,
+then ``done`` with the usual result plus ``ttft_ms`` (or ``error``).
+
+Run with ``python agent_server.py [--host 127.0.0.1] [--port 8080]``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+import Rest_API_as_tool as app
+from mcp_tools import (common, function_calling, issue_store, projection, streaming, tool_index,
+                       tracing, webhooks)
+
+MAX_INFLIGHT        = int(os.getenv("AGENT_SERVER_MAX_INFLIGHT", "8"))
+QUEUE_TIMEOUT       = float(os.getenv("AGENT_SERVER_QUEUE_TIMEOUT", "10"))
+SESSION_CONCURRENCY = int(os.getenv("AGENT_SERVER_SESSION_CONCURRENCY", "1"))
+MAX_SESSIONS        = int(os.getenv("AGENT_SERVER_MAX_SESSIONS", "100"))
+SESSION_TTL         = float(os.getenv("AGENT_SERVER_SESSION_TTL", "1800"))
+MAX_BODY_BYTES      = 1 << 20
+
+AGENT_ALIASES = {"repo": app.AgentType.REPO, "repository": app.AgentType.REPO,
+                 "issue": app.AgentType.ISSUE, "user": app.AgentType.USER,
+                 "master": app.AgentType.MASTER}
+
+
+class ServerError(Exception):
+    """An error answered with ``status`` and a JSON ``{"error": message}``."""
+
+    def __init__(self, status: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class Session:
+    def __init__(self, session_id: str, master_agent, agents: Dict[str, Any]):
+        self.id = session_id
+        self.master_agent = master_agent
+        self.agents = agents
+        self.slots = threading.BoundedSemaphore(SESSION_CONCURRENCY)
+        self.created = self.last_used = time.monotonic()
+        self.turns = 0
+
+
+class AgentService:
+    """Shared state of the server: LLM, router and the session table."""
+
+    def __init__(self, llm, github_username: str, router=None):
+        self.llm = llm
+        self.github_username = github_username
+        self.router = router
+        self.sessions: Dict[str, Session] = {}
+        self._pending = 0                      # sessions being built, holding a slot
+        self._lock = threading.Lock()
+        self._inflight = threading.BoundedSemaphore(MAX_INFLIGHT)
+        self.counters = {"turns": 0, "fast_path": 0, "rejected_busy": 0,
+                         "rejected_overload": 0, "errors": 0, "sessions_expired": 0}
+        self.started = time.time()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counters[key] += 1
+
+    # -- sessions ------------------------------------------------------- #
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - SESSION_TTL
+        with self._lock:
+            for sid in [s.id for s in self.sessions.values() if s.last_used < cutoff]:
+                del self.sessions[sid]
+                self.counters["sessions_expired"] += 1
+
+    def create_session(self) -> Session:
+        self._expire()
+        with self._lock:
+            if len(self.sessions) + self._pending >= MAX_SESSIONS:
+                self.counters["rejected_overload"] += 1
+                raise ServerError(503, "too many open sessions", retry_after=30)
+            self._pending += 1
+        try:
+            result = app.build_agent_set(self.llm, self.github_username, verbose=False)
+            if not result:
+                raise ServerError(500, "failed to build agents")
+            session = Session(uuid.uuid4().hex, *result)
+            with self._lock:
+                self.sessions[session.id] = session
+            return session
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def get_session(self, session_id: str) -> Session:
+        self._expire()
+        with self._lock:
+            session = self.sessions.get(session_id)
+        if session is None:
+            raise ServerError(404, f"unknown session {session_id}")
+        return session
+
+    def close_session(self, session_id: str) -> None:
+        with self._lock:
+            if self.sessions.pop(session_id, None) is None:
+                raise ServerError(404, f"unknown session {session_id}")
+
+    # -- turns ---------------------------------------------------------- #
+    def chat(self, session: Session, message: str, agent: Optional[str] = None,
+             on_token: Optional[streaming.Writer] = None) -> Dict[str, Any]:
+        """Run one turn; with ``on_token`` answers are streamed to it as they arrive."""
+        if not message:
+            raise ServerError(400, "message required")
+        target = AGENT_ALIASES.get((agent or "master").lower())
+        if target is None:
+            raise ServerError(400, f"unknown agent {agent}")
+        if not session.slots.acquire(blocking=False):
+            self._count("rejected_busy")
+            raise ServerError(429, "session is busy with another turn", retry_after=1)
+        session.last_used = time.monotonic()
+        try:
+            if not self._inflight.acquire(timeout=QUEUE_TIMEOUT):
+                self._count("rejected_overload")
+                raise ServerError(503, "server busy", retry_after=QUEUE_TIMEOUT)
+            try:
+                with tracing.session(session.id), tracing.span("turn", agent=target) as turn:
+                    result = self._run_turn(session, message, target, on_token)
+                    turn.set(route=result["route"])
+                return result
+            finally:
+                self._inflight.release()
+        finally:
+            session.last_used = time.monotonic()
+            session.slots.release()
+
+    def _run_turn(self, session: Session, message: str, target: str,
+                  on_token: Optional[streaming.Writer] = None) -> Dict[str, Any]:
+        start = time.perf_counter()
+        self._count("turns")
+        session.turns += 1
+        route = target
+        response = None
+        if target == app.AgentType.MASTER and self.router is not None:
+            response = self.router.route(message)
+            if response is not None:
+                route = "fast_path"
+                self._count("fast_path")
+        with streaming.stream_to(on_token) if on_token else nullcontext() as sink:
+            if response is None:
+                try:
+                    response = streaming.chat(session.agents[target], message, target)
+                except Exception as e:
+                    self._count("errors")
+                    raise ServerError(502, f"agent error: {e}")
+            elif sink is not None:
+                sink.emit(route, response)
+        result = {"session_id": session.id, "route": route, "response": response,
+                  "seconds": round(time.perf_counter() - start, 3)}
+        if sink is not None:
+            result["ttft_ms"] = sink.first_token_ms
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        self._expire()
+        with self._lock:
+            counters = dict(self.counters)
+            sessions = len(self.sessions)
+        stats: Dict[str, Any] = {"uptime_seconds": round(time.time() - self.started),
+                                 "sessions": sessions, **counters,
+                                 "pools": common.pool_stats(),
+                                 "response_cache": common.response_cache.stats(),
+                                 "rate_limits": common.rate_limit_stats(),
+                                 "coalescing": common.coalesce_stats(),
+                                 "projection": projection.stats()}
+        issue_mirror = issue_store.get_issue_store()
+        if issue_mirror:
+            stats["issue_mirror"] = issue_mirror.stats()
+        if self.router is not None:
+            stats["fast_path_router"] = self.router.stats()
+        if app.llm_response_cache:
+            stats["llm_cache"] = app.llm_response_cache.stats()
+        stats["streaming"] = streaming.stats()
+        if app.AGENT_MODE == "flat":
+            stats["tool_retrieval"] = tool_index.stats()
+        else:
+            stats["specialists"] = function_calling.stats()
+        from mcp_tools import memory          # loaded with the first session's agents
+        stats["agent_memory"] = memory.stats()
+        if webhooks.SECRET:
+            stats["webhooks"] = webhooks.get_processor().stats()
+        return stats
+
+
+class AgentRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    service: AgentService        # set by make_server
+
+    def _send(self, status: int, payload: Dict[str, Any],
+              retry_after: Optional[float] = None) -> None:
+        body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if retry_after is not None:
+            self.send_header("Retry-After", str(int(retry_after + 0.999)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _length(self, limit: int) -> int:
+        """The request's Content-Length: digits only, at most ``limit``."""
+        length = self.headers.get("Content-Length") or "0"
+        if not length.isdigit():
+            self.close_connection = True     # the body is left unread
+            raise ServerError(400, "bad Content-Length")
+        if int(length) > limit:
+            self.close_connection = True
+            raise ServerError(413, "request body too large")
+        return int(length)
+
+    def _body(self) -> Dict[str, Any]:
+        length = self._length(MAX_BODY_BYTES)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            raise ServerError(400, "invalid JSON body")
+        if not isinstance(body, dict):
+            raise ServerError(400, "JSON object expected")
+        return body
+
+    def _stream_chat(self, session: Session, body: Dict[str, Any]) -> None:
+        """Answer a turn as server-sent events: ``token`` … then ``done`` or ``error``.
+
+        Headers go out with the first event, so admission errors before it
+        are still plain JSON responses with their status code.
+        """
+        started = False
+
+        def send(event: str, data: Dict[str, Any]) -> None:
+            nonlocal started
+            if not started:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                started = True
+            payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+            self.wfile.write(f"event: {event}\ndata: {payload}\n\n".encode())
+            self.wfile.flush()
+
+        try:
+            result = self.service.chat(session, body.get("message", ""), body.get("agent"),
+                                       on_token=lambda agent, text: send("token", {"agent": agent, "text": text}))
+        except Exception as e:
+            if not started:
+                raise
+            send("error", {"error": str(e)})
+        else:
+            send("done", result)
+
+    def _route(self, method: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+        svc = self.service
+        if method == "GET" and parts == ["health"]:
+            return 200, {"status": "ok"}
+        if method == "GET" and parts == ["stats"]:
+            return 200, svc.stats()
+        if method == "POST" and parts == ["webhooks", "github"]:
+            length = self._length(webhooks.MAX_BODY_BYTES)
+            status, reply = webhooks.receive(self.headers, self.rfile.read(length))
+            if status >= 400:
+                raise ServerError(status, reply["error"])
+            return status, reply
+        if method == "POST" and parts == ["sessions"]:
+            return 201, {"session_id": svc.create_session().id}
+        if method == "POST" and parts == ["chat"]:
+            body = self._body()
+            sid = body.get("session_id")
+            session = svc.get_session(sid) if sid else svc.create_session()
+            if body.get("stream"):
+                return self._stream_chat(session, body)
+            return 200, svc.chat(session, body.get("message", ""), body.get("agent"))
+        if len(parts) == 3 and parts[0] == "sessions" and parts[2] == "chat" and method == "POST":
+            body = self._body()
+            if body.get("stream"):
+                return self._stream_chat(svc.get_session(parts[1]), body)
+            return 200, svc.chat(svc.get_session(parts[1]), body.get("message", ""), body.get("agent"))
+        if len(parts) == 3 and parts[0] == "sessions" and parts[2] == "trace" and method == "GET":
+            if not tracing.enabled():
+                raise ServerError(404, "tracing is off (set AGENT_TRACE=1)")
+            svc.get_session(parts[1])
+            return 200, tracing.summary(parts[1])
+        if len(parts) == 2 and parts[0] == "sessions" and method == "DELETE":
+            svc.close_session(parts[1])
+            return 200, {"closed": parts[1]}
+        raise ServerError(404, f"no route for {method} {self.path}")
+
+    def _handle(self, method: str) -> None:
+        try:
+            routed = self._route(method)
+            if routed is not None:           # streamed responses are already written
+                self._send(*routed)
+        except ServerError as e:
+            self._send(e.status, {"error": str(e)}, e.retry_after)
+        except Exception as e:
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if os.getenv("AGENT_SERVER_ACCESS_LOG", "0") != "0":
+            super().log_message(format, *args)
+
+
+def make_server(service: AgentService, host: str = "127.0.0.1", port: int = 8080) -> ThreadingHTTPServer:
+    handler = type("BoundAgentRequestHandler", (AgentRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def build_service() -> AgentService:
+    """Load credentials and build the shared LLM and router once."""
+    _, github_username, openrouter_key = app.load_environment_variables()
+    return AgentService(app.create_llm(openrouter_key), github_username,
+                        app.build_fast_path_router())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the multi-agent system over HTTP/JSON.")
+    parser.add_argument("--host", default=os.getenv("AGENT_SERVER_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("AGENT_SERVER_PORT", "8080")))
+    args = parser.parse_args()
+    server = make_server(build_service(), args.host, args.port)
+    print(f"Agent server listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+        common.close_session()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Batch Runner
+────────────
+Headless mode: run many prompts from a JSONL file (or stdin) through the
+multi-agent system with a bounded number of workers.
+
+Input lines are JSON objects ``{"id"?, "prompt", "agent"?}`` (``message`` is
+accepted for ``prompt``) or bare strings; any other line, JSON or not, is
+taken as the prompt text.  Ids default to the line number.
+Results are appended to the output JSONL as they complete::
+
+    {"id", "route", "response" | "error", "seconds"}
+
+The output file doubles as the checkpoint: with ``--resume`` every id already
+answered in it is skipped, so an interrupted run continues where it stopped
+and prompts that failed are tried again.  Each worker keeps its own agents
+and resets their memory between prompts; simple commands go through the
+fast-path router.  Throughput and latency percentiles
+are printed to stderr at the end.  With ``AGENT_TRACE_FILE`` set, spans are
+tagged with the prompt id as their session id.
+
+Usage::
+
+    python batch_runner.py prompts.jsonl -o results.jsonl --workers 8 --resume
+    cat prompts.jsonl | python batch_runner.py - -o results.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Set, TextIO
+
+import Rest_API_as_tool as app
+from mcp_tools import tracing
+
+AGENT_ALIASES = {"repo": app.AgentType.REPO, "repository": app.AgentType.REPO,
+                 "issue": app.AgentType.ISSUE, "user": app.AgentType.USER,
+                 "master": app.AgentType.MASTER}
+
+
+def read_prompts(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """Yield ``{"id", "prompt", "agent"}`` for every non-empty input line."""
+    for lineno, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            item = line
+        if not isinstance(item, dict):
+            item = {"prompt": item if isinstance(item, str) else line}
+        yield {"id": str(item.get("id", lineno)),
+               "prompt": item.get("prompt") or item.get("message") or "",
+               "agent": item.get("agent")}
+
+
+def completed_ids(path: str) -> Set[str]:
+    """Ids answered in ``path`` by an earlier run (failed ones are retried)."""
+    done: Set[str] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                record = json.loads(line)
+                if "response" in record:
+                    done.add(str(record["id"]))
+            except (ValueError, KeyError, TypeError):
+                continue                 # a line cut short by the interruption
+    return done
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+class BatchRunner:
+    def __init__(self, llm, github_username: str, router=None):
+        self.llm = llm
+        self.github_username = github_username
+        self.router = router
+        self._local = threading.local()
+
+    def _agents(self) -> Dict[str, Any]:
+        agents = getattr(self._local, "agents", None)
+        if agents is None:
+            result = app.build_agent_set(self.llm, self.github_username, verbose=False)
+            if not result:
+                raise RuntimeError("failed to build agents")
+            agents = self._local.agents = result[1]
+        return agents
+
+    def run_one(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        out: Dict[str, Any] = {"id": item["id"]}
+        try:
+            target = AGENT_ALIASES.get((item["agent"] or "master").lower())
+            if target is None:
+                raise ValueError(f"unknown agent {item['agent']}")
+            if not item["prompt"]:
+                raise ValueError("empty prompt")
+            with tracing.session(item["id"]), tracing.span("turn", agent=target) as turn:
+                response = None
+                if target == app.AgentType.MASTER and self.router is not None:
+                    response = self.router.route(item["prompt"])
+                    if response is not None:
+                        out["route"] = "fast_path"
+                if response is None:
+                    agents = self._agents()
+                    for agent in agents.values():
+                        agent.reset()            # prompts are independent
+                    response = str(agents[target].chat(item["prompt"]))
+                    out["route"] = target
+                turn.set(route=out["route"])
+            out["response"] = response
+        except Exception as e:
+            out["error"] = f"{type(e).__name__}: {e}"
+        out["seconds"] = round(time.perf_counter() - start, 3)
+        return out
+
+    def run(self, prompts: Iterator[Dict[str, Any]], output: TextIO, workers: int = 4,
+            skip: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """Run ``prompts`` with at most ``workers`` in flight; returns summary stats."""
+        skip = skip or set()
+        latencies: List[float] = []
+        counts = {"ok": 0, "errors": 0, "skipped": 0}
+        started = time.perf_counter()
+        running: Set[Future] = set()
+
+        def drain(block: bool) -> None:
+            nonlocal running
+            done, running = wait(running, timeout=None if block else 0,
+                                 return_when=FIRST_COMPLETED)
+            for fut in done:
+                result = fut.result()
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output.flush()
+                latencies.append(result["seconds"])
+                counts["errors" if "error" in result else "ok"] += 1
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for item in prompts:
+                if item["id"] in skip:
+                    counts["skipped"] += 1
+                    continue
+                while len(running) >= workers * 2:
+                    drain(block=True)
+                running.add(pool.submit(self.run_one, item))
+                drain(block=False)
+            while running:
+                drain(block=True)
+
+        wall = time.perf_counter() - started
+        done = counts["ok"] + counts["errors"]
+        return {**counts, "wall_seconds": round(wall, 2),
+                "throughput_per_s": round(done / wall, 2) if wall else 0.0,
+                "p50": round(percentile(latencies, 50), 3),
+                "p90": round(percentile(latencies, 90), 3),
+                "p99": round(percentile(latencies, 99), 3),
+                "max": round(max(latencies, default=0.0), 3)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run prompts from a JSONL file through the agents.")
+    parser.add_argument("input", help="prompts JSONL file, or - for stdin")
+    parser.add_argument("-o", "--output", required=True, help="results JSONL (appended)")
+    parser.add_argument("-w", "--workers", type=int, default=int(os.getenv("BATCH_WORKERS", "4")))
+    parser.add_argument("--resume", action="store_true", help="skip ids already answered in the output")
+    args = parser.parse_args()
+
+    _, github_username, openrouter_key = app.load_environment_variables()
+    runner = BatchRunner(app.create_llm(openrouter_key), github_username,
+                         app.build_fast_path_router())
+    skip = completed_ids(args.output) if args.resume else set()
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        with open(args.output, "a", encoding="utf-8") as output:
+            summary = runner.run(read_prompts(source), output, max(1, args.workers), skip)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print(f"\nprompts: {summary['ok']} ok, {summary['errors']} failed, {summary['skipped']} skipped "
+          f"in {summary['wall_seconds']}s ({summary['throughput_per_s']}/s)", file=sys.stderr)
+    print(f"latency: p50={summary['p50']}s p90={summary['p90']}s "
+          f"p99={summary['p99']}s max={summary['max']}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
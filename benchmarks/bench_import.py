@@ -0,0 +1,84 @@
+"""Cold-start benchmark: wall time of fresh-interpreter imports.
+
+Each scenario runs in a new ``python`` process (``-X importtime`` would skew
+the numbers), ``--repeat`` times, and the median is reported.
+
+    python benchmarks/bench_import.py                       # table
+    python benchmarks/bench_import.py --json > import.json  # save a baseline
+    python benchmarks/bench_import.py --baseline import.json --tolerance 0.25
+
+With ``--baseline`` the run fails (exit 1) when a scenario is slower than the
+baseline by more than ``--tolerance`` (fraction).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "mcp_tools": "import mcp_tools",
+    "mcp_tools.common": "import mcp_tools.common",
+    "mcp_tools.repos": "import mcp_tools.repos",
+    "first_tool": "from mcp_tools.repos import list_branches_tool",
+    "all_tools": "from mcp_tools.registry import tools; [tools[n] for n in tools]",
+    "Rest_API_as_tool": "import Rest_API_as_tool",
+    "fast_path_router": "import Rest_API_as_tool as app; app.build_fast_path_router()",
+}
+
+_TIMER = ("import time, warnings; warnings.filterwarnings('ignore'); "
+          "t = time.perf_counter(); {code}; print(time.perf_counter() - t)")
+
+
+def measure(code: str, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _TIMER.format(code=code)], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", choices=sorted(SCENARIOS))
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--baseline", help="JSON file from an earlier --json run")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.only or SCENARIOS:
+        samples = measure(SCENARIOS[name], args.repeat)
+        results[name] = {"median_s": round(statistics.median(samples), 4),
+                         "min_s": round(min(samples), 4)}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'scenario':<20}{'median ms':>12}{'min ms':>10}")
+        for name, r in results.items():
+            print(f"{name:<20}{r['median_s'] * 1000:>12.1f}{r['min_s'] * 1000:>10.1f}")
+
+    if not args.baseline:
+        return 0
+    baseline = json.loads(Path(args.baseline).read_text())
+    failed = False
+    for name, r in results.items():
+        if name not in baseline:
+            continue
+        before, now = baseline[name]["median_s"], r["median_s"]
+        if now > before * (1 + args.tolerance):
+            print(f"REGRESSION {name}: {before * 1000:.1f} ms -> {now * 1000:.1f} ms", file=sys.stderr)
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
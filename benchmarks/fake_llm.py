@@ -0,0 +1,271 @@
+"""Scripted stand-in for the OpenRouter LLM.
+
+``ScriptedLLM`` speaks the ReAct format the agents expect, so the real agent
+loops, tools and HTTP client run end to end without a model:
+
+* the tools on offer are read from the system prompt (``> Tool Name: x``);
+* the user request is matched against ``Scenario`` patterns; the scripted
+  actions whose tool is on offer are emitted one per call as
+  ``Action`` / ``Action Input`` (``{input}`` expands to the request);
+* once every such action has an ``Observation`` the model answers with a
+  short summary of the last one.
+
+It is also a function-calling model: called with ``tools`` (a
+function-calling agent) it requests all of a scenario's actions on offer
+at once as ``tool_calls``, then summarises the tool results.
+
+Simulated latency is ``think_ms`` per call plus ``ms_per_token`` per output
+token (~4 characters).  ``stream_chat`` yields the reply word by word after
+``think_ms``, so time to first token is measurable.  Call and token counts
+are kept for the reports.
+"""
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence, Tuple
+
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.llms import (ChatMessage, ChatResponse, ChatResponseAsyncGen,
+                                   ChatResponseGen, CompletionResponse, CustomLLM,
+                                   LLMMetadata, MessageRole)
+from llama_index.core.llms.callbacks import llm_chat_callback, llm_completion_callback
+from llama_index.core.llms.function_calling import FunctionCallingLLM
+from llama_index.core.llms.llm import ToolSelection
+
+_TOOL_NAME = re.compile(r"^> Tool Name: (\S+)", re.M)
+_WORD = re.compile(r"\s*\S+")
+
+
+@dataclass
+class Scenario:
+    """A request pattern and the tool call each agent makes for it."""
+    name: str
+    pattern: str
+    actions: List[Tuple[str, Dict[str, Any]]] = field(default_factory=list)
+
+    def matches(self, text: str) -> bool:
+        return re.search(self.pattern, text, re.I) is not None
+
+
+def delegate(agent: str) -> Tuple[str, Dict[str, Any]]:
+    """Master-level action: hand the whole request to ``<agent>_agent``."""
+    return f"{agent}_agent", {"input": "{input}"}
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("list_issues", r"\bopen issues\b.*\bdemo\b",
+             [delegate("issue"), ("list_issues", {"repo": "demo", "state": "open"})]),
+    Scenario("get_issue", r"\bissue 42\b",
+             [delegate("issue"), ("get_issue", {"repo": "demo", "number": 42})]),
+    Scenario("compare_issues", r"\bissues 42 and 7\b",
+             [delegate("issue")] + [("get_issue", {"repo": "demo", "number": n}) for n in (42, 7)]),
+    Scenario("search_issues", r"\bcrash",
+             [delegate("issue"), ("search_issues", {"query": "crash", "repo": "demo"})]),
+    Scenario("list_branches", r"\bbranches\b",
+             [delegate("repository"), ("list_branches", {"repo": "demo"})]),
+    Scenario("read_file", r"\breadme\b",
+             [delegate("repository"), ("get_file_contents", {"repo": "demo", "path": "README.md"})]),
+    Scenario("followers", r"\bfollowers\b",
+             [delegate("user"), ("list_followers", {"allPages": True})]),
+    Scenario("my_repos", r"\bmy repositories\b",
+             [delegate("user"), ("list_user_repos", {"allPages": True})]),
+]
+
+
+def _render(value: Any, request: str) -> Any:
+    if isinstance(value, str):
+        return value.replace("{input}", request)
+    if isinstance(value, dict):
+        return {k: _render(v, request) for k, v in value.items()}
+    return value
+
+
+class ScriptedLLM(CustomLLM, FunctionCallingLLM):
+    think_ms: float = 0.0
+    ms_per_token: float = 0.0
+
+    _scenarios: List[Scenario] = PrivateAttr(default_factory=list)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _stats: Dict[str, int] = PrivateAttr(default_factory=dict)
+
+    def __init__(self, scenarios: Sequence[Scenario] = SCENARIOS, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._scenarios = list(scenarios)
+        self._stats = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "ScriptedLLM"
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata(is_chat_model=True, is_function_calling_model=True,
+                           model_name="scripted", context_window=128000)  # as gpt-4o-mini
+
+    # -- script ---------------------------------------------------------- #
+    def actions(self, request: str, tools: set) -> List[Tuple[str, Dict[str, Any]]]:
+        """The first matching scenario's actions whose tool is on offer."""
+        for scenario in self._scenarios:
+            if scenario.matches(request):
+                actions = [(t, _render(a, request)) for t, a in scenario.actions if t in tools]
+                if actions:
+                    return actions
+        return []
+
+    def reply(self, messages: Sequence[ChatMessage]) -> str:
+        system = next((m.content or "" for m in messages if m.role == MessageRole.SYSTEM), "")
+        tools = set(_TOOL_NAME.findall(system))
+        done = 0
+        for m in reversed(messages):
+            if not (m.content or "").startswith("Observation:"):
+                if m.role == MessageRole.USER:
+                    break
+                continue
+            done += 1
+        request = next((m.content or "" for m in reversed(messages) if m.role == MessageRole.USER
+                        and not (m.content or "").startswith("Observation:")), "")
+        actions = self.actions(request, tools)
+        if done < len(actions):
+            tool, args = actions[done]
+            return (f"Thought: I need to use a tool to help me answer the question.\n"
+                    f"Action: {tool}\nAction Input: {json.dumps(args)}")
+        last = messages[-1].content or ""
+        if last.startswith("Observation:"):
+            summary = " ".join(last[len("Observation:"):].split())[:300]
+            return f"Thought: I can answer without using any more tools.\nAnswer: {summary}"
+        return "Thought: I can answer without using any more tools.\nAnswer: Nothing to do."
+
+    def reply_with_tools(self, messages: Sequence[ChatMessage], tools: set) -> ChatMessage:
+        """Function-calling turn: every scripted call at once, then a summary."""
+        results = []
+        for m in reversed(messages):
+            if m.role != MessageRole.TOOL:
+                break
+            results.insert(0, " ".join((m.content or "").split()))
+        if results:
+            return ChatMessage(role=MessageRole.ASSISTANT, content=" | ".join(results)[:300])
+        request = next((m.content or "" for m in reversed(messages) if m.role == MessageRole.USER), "")
+        calls = [{"id": f"call_{i}", "name": tool, "arguments": args}
+                 for i, (tool, args) in enumerate(self.actions(request, tools))]
+        if not calls:
+            return ChatMessage(role=MessageRole.ASSISTANT, content="Nothing to do.")
+        return ChatMessage(role=MessageRole.ASSISTANT, content="",
+                           additional_kwargs={"tool_calls": calls})
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = {k: 0 for k in self._stats}
+
+    def _count(self, prompt_chars: int, completion_chars: int) -> None:
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["prompt_tokens"] += prompt_chars // 4
+            self._stats["completion_tokens"] += completion_chars // 4
+
+    def _respond(self, messages: Sequence[ChatMessage]) -> str:
+        text = self.reply(messages)
+        self._count(sum(len(m.content or "") for m in messages), len(text))
+        return text
+
+    def _respond_with_tools(self, messages: Sequence[ChatMessage], tools: List[Dict[str, Any]]) -> ChatMessage:
+        message = self.reply_with_tools(messages, {t["function"]["name"] for t in tools})
+        # tool schemas and tool-call arguments are billed like any other tokens
+        self._count(sum(len(m.content or "") + len(json.dumps(m.additional_kwargs.get("tool_calls", [])))
+                        for m in messages) + len(json.dumps(tools)),
+                    len(message.content or "") + len(json.dumps(message.additional_kwargs)))
+        return message
+
+    # -- function calling ---------------------------------------------------- #
+    def _prepare_chat_with_tools(self, tools: Sequence[Any], user_msg: Any = None,
+                                 chat_history: List[ChatMessage] | None = None,
+                                 verbose: bool = False, allow_parallel_tool_calls: bool = False,
+                                 **kwargs: Any) -> Dict[str, Any]:
+        messages = list(chat_history or [])
+        if user_msg is not None:
+            messages.append(user_msg if isinstance(user_msg, ChatMessage)
+                            else ChatMessage(role=MessageRole.USER, content=user_msg))
+        return {"messages": messages, "tools": [t.metadata.to_openai_tool() for t in tools]}
+
+    def get_tool_calls_from_response(self, response: ChatResponse,
+                                     error_on_no_tool_call: bool = True, **kwargs: Any) -> List[ToolSelection]:
+        calls = response.message.additional_kwargs.get("tool_calls", [])
+        if not calls and error_on_no_tool_call:
+            raise ValueError("Expected at least one tool call")
+        return [ToolSelection(tool_id=c["id"], tool_name=c["name"], tool_kwargs=c["arguments"])
+                for c in calls]
+
+    def _delay(self, text: str) -> float:
+        return (self.think_ms + self.ms_per_token * len(text) / 4) / 1000
+
+    # -- LLM interface ----------------------------------------------------- #
+    @llm_chat_callback()
+    def chat(self, messages: Sequence[ChatMessage], tools: Any = None, **kwargs: Any) -> ChatResponse:
+        if tools is not None:
+            message = self._respond_with_tools(messages, tools)
+            time.sleep(self._delay(message.content or ""))
+            return ChatResponse(message=message)
+        text = self._respond(messages)
+        time.sleep(self._delay(text))
+        return ChatResponse(message=ChatMessage(role=MessageRole.ASSISTANT, content=text))
+
+    @llm_chat_callback()
+    async def achat(self, messages: Sequence[ChatMessage], tools: Any = None, **kwargs: Any) -> ChatResponse:
+        import asyncio
+        if tools is not None:
+            message = self._respond_with_tools(messages, tools)
+            await asyncio.sleep(self._delay(message.content or ""))
+            return ChatResponse(message=message)
+        text = self._respond(messages)
+        await asyncio.sleep(self._delay(text))
+        return ChatResponse(message=ChatMessage(role=MessageRole.ASSISTANT, content=text))
+
+    @llm_chat_callback()
+    def stream_chat(self, messages: Sequence[ChatMessage], **kwargs: Any) -> ChatResponseGen:
+        text = self._respond(messages)
+
+        def gen() -> ChatResponseGen:
+            time.sleep(self.think_ms / 1000)
+            content = ""
+            for word in _WORD.findall(text):
+                time.sleep(self.ms_per_token / 1000)
+                content += word
+                yield ChatResponse(message=ChatMessage(role=MessageRole.ASSISTANT, content=content),
+                                   delta=word)
+        return gen()
+
+    @llm_chat_callback()
+    async def astream_chat(self, messages: Sequence[ChatMessage], **kwargs: Any) -> ChatResponseAsyncGen:
+        import asyncio
+        text = self._respond(messages)
+
+        async def gen() -> ChatResponseAsyncGen:
+            await asyncio.sleep(self.think_ms / 1000)
+            content = ""
+            for word in _WORD.findall(text):
+                await asyncio.sleep(self.ms_per_token / 1000)
+                content += word
+                yield ChatResponse(message=ChatMessage(role=MessageRole.ASSISTANT, content=content),
+                                   delta=word)
+        return gen()
+
+    @llm_completion_callback()
+    def complete(self, prompt: str, formatted: bool = False, **kwargs: Any) -> CompletionResponse:
+        text = self._respond([ChatMessage(role=MessageRole.USER, content=prompt)])
+        time.sleep(self._delay(text))
+        return CompletionResponse(text=text)
+
+    @llm_completion_callback()
+    def stream_complete(self, prompt: str, formatted: bool = False, **kwargs: Any):
+        response = self.complete(prompt, formatted=formatted, **kwargs)
+
+        def gen():
+            yield CompletionResponse(text=response.text, delta=response.text)
+        return gen()
@@ -0,0 +1,434 @@
+"""Local stand-in for api.github.com used by the benchmarks.
+
+Serves deterministic data for the endpoints the tools call, with
+configurable latency, page size, rate-limit headers, ETags and injected
+errors.  Point the client at it with ``GITHUB_API_BASE``::
+
+    server = MockGitHub(MockConfig(latency_ms=20, error_rate=0.05)).start()
+    os.environ["GITHUB_API_BASE"] = server.url
+
+Running this file serves until interrupted (``--port``, ``--latency-ms`` …).
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+
+@dataclass
+class MockConfig:
+    owner: str = "me"
+    repos: int = 12
+    issues_per_repo: int = 120
+    branches_per_repo: int = 8
+    followers: int = 75
+    files_per_repo: int = 40
+    latency_ms: float = 0.0           # added to every response
+    jitter_ms: float = 0.0            # uniform extra 0..jitter
+    page_size: int = 30               # default per_page
+    rate_limit: int = 5000            # X-RateLimit-Limit (core); 0 disables the headers
+    search_rate_limit: int = 1000     # GitHub's is 30/min: kept high so runs never stall
+    etag: bool = True                 # send ETags and answer If-None-Match with 304
+    error_rate: float = 0.0           # fraction of requests answered with error_status
+    error_status: int = 502
+    throttle_rate: float = 0.0        # fraction answered 429 + Retry-After
+    seed: int = 7
+
+
+def _blob_sha(data: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class _Data:
+    """Deterministic fixtures shaped like GitHub REST payloads."""
+
+    def __init__(self, cfg: MockConfig):
+        self.cfg = cfg
+        self.repo_names = [f"repo-{i}" for i in range(cfg.repos)] + ["demo"]
+        self.closed: Dict[Tuple[str, int], bool] = {}
+        self.created: Dict[str, List[Dict[str, Any]]] = {}
+        self.touched: Dict[Tuple[str, int], str] = {}     # updated_at after a write
+        self.lock = threading.Lock()
+
+    def user(self, login: str) -> Dict[str, Any]:
+        api = f"https://api.github.com/users/{login}"
+        return {"login": login, "id": zlib.crc32(login.encode()) % 10**7, "node_id": "MDQ6VXNlcjE=",
+                "avatar_url": "https://avatars.githubusercontent.com/u/1?v=4", "gravatar_id": "",
+                "url": api, "html_url": f"https://github.com/{login}",
+                "followers_url": f"{api}/followers", "following_url": f"{api}/following{{/other_user}}",
+                "gists_url": f"{api}/gists{{/gist_id}}", "starred_url": f"{api}/starred{{/owner}}{{/repo}}",
+                "subscriptions_url": f"{api}/subscriptions", "organizations_url": f"{api}/orgs",
+                "repos_url": f"{api}/repos", "events_url": f"{api}/events{{/privacy}}",
+                "received_events_url": f"{api}/received_events", "type": "User", "site_admin": False,
+                "name": login.title(), "company": None, "blog": "", "location": "Earth",
+                "email": None, "bio": "Benchmark user", "public_repos": self.cfg.repos,
+                "followers": self.cfg.followers, "following": 10,
+                "created_at": "2020-01-01T00:00:00Z", "updated_at": "2024-01-01T00:00:00Z"}
+
+    def repo(self, name: str) -> Dict[str, Any]:
+        owner = self.cfg.owner
+        api = f"https://api.github.com/repos/{owner}/{name}"
+        return {"id": zlib.crc32(name.encode()) % 10**8, "node_id": "R_kgDO", "name": name,
+                "full_name": f"{owner}/{name}", "private": False, "owner": self.user(owner),
+                "html_url": f"https://github.com/{owner}/{name}", "description": f"The {name} project",
+                "fork": False, "url": api, **{f"{k}_url": f"{api}/{k}" for k in (
+                    "forks", "keys", "collaborators", "teams", "hooks", "issue_events", "events",
+                    "assignees", "branches", "tags", "blobs", "git_tags", "git_refs", "trees",
+                    "statuses", "languages", "stargazers", "contributors", "subscribers",
+                    "subscription", "commits", "git_commits", "comments", "issue_comment",
+                    "contents", "compare", "merges", "archive", "downloads", "issues", "pulls",
+                    "milestones", "notifications", "labels", "releases", "deployments")},
+                "created_at": "2021-01-01T00:00:00Z", "updated_at": "2024-05-01T00:00:00Z",
+                "pushed_at": "2024-05-01T00:00:00Z", "size": 1024, "stargazers_count": 42,
+                "watchers_count": 42, "language": "Python", "forks_count": 3,
+                "open_issues_count": self.cfg.issues_per_repo, "default_branch": "main",
+                "visibility": "public", "topics": ["benchmark"]}
+
+    def issue(self, repo: str, n: int) -> Dict[str, Any]:
+        owner = self.cfg.owner
+        api = f"https://api.github.com/repos/{owner}/{repo}/issues/{n}"
+        closed = self.closed.get((repo, n), n % 5 == 0)
+        issue = {"url": api, "repository_url": f"https://api.github.com/repos/{owner}/{repo}",
+                 "labels_url": f"{api}/labels{{/name}}", "comments_url": f"{api}/comments",
+                 "events_url": f"{api}/events", "html_url": f"https://github.com/{owner}/{repo}/issues/{n}",
+                 "id": zlib.crc32(f"{repo}#{n}".encode()), "node_id": "I_kwDO", "number": n,
+                 "title": f"Issue {n}: {'crash' if n % 3 == 0 else 'improvement'} in {repo}",
+                 "user": self.user(owner),
+                 "labels": [{"id": 1, "node_id": "LA_kw", "url": f"{api}/labels/bug", "name":
+                             "bug" if n % 2 else "enhancement", "color": "d73a4a", "default": True,
+                             "description": "Something isn't working"}],
+                 "state": "closed" if closed else "open", "locked": False, "assignee": None,
+                 "assignees": [self.user("alice")] if n % 4 == 0 else [], "milestone": None,
+                 "comments": n % 7, "created_at": f"2024-01-{1 + n % 28:02d}T00:00:00Z",
+                 "updated_at": self.touched.get((repo, n), f"2024-02-{1 + n % 28:02d}T00:00:00Z"),
+                 "closed_at": "2024-03-01T00:00:00Z" if closed else None,
+                 "author_association": "OWNER", "active_lock_reason": None,
+                 "body": f"Steps to reproduce issue {n}.\n\n" + "Details. " * 20,
+                 "reactions": {"url": f"{api}/reactions", "total_count": 0, "+1": 0, "-1": 0},
+                 "timeline_url": f"{api}/timeline", "performed_via_github_app": None,
+                 "state_reason": "completed" if closed else None}
+        return issue
+
+    def issues(self, repo: str, state: str, since: str = "") -> List[Dict[str, Any]]:
+        items = [self.issue(repo, n) for n in range(self.cfg.issues_per_repo, 0, -1)]
+        items = self.created.get(repo, []) + items
+        return [i for i in items if (state == "all" or i["state"] == state) and i["updated_at"] >= since]
+
+    def touch(self, repo: str, n: int) -> str:
+        self.touched[(repo, n)] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        return self.touched[(repo, n)]
+
+    def files(self, repo: str) -> Dict[str, bytes]:
+        files = {"README.md": f"# {repo}\n\nBenchmark fixture.\n".encode()}
+        for i in range(self.cfg.files_per_repo - 1):
+            files[f"src/module_{i}.py"] = f"def f_{i}(x):\n    return x * {i}\n".encode() * 8
+        return files
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "MockGitHub._Server"
+
+    # -- plumbing ------------------------------------------------------ #
+    def _reply(self, status: int, body: Any = None, headers: Optional[Dict[str, str]] = None) -> None:
+        mock = self.server.mock
+        payload = b"" if body is None else json.dumps(body).encode()
+        hdrs = {"Content-Type": "application/json; charset=utf-8",
+                "Content-Length": str(len(payload)), **(headers or {})}
+        if mock.cfg.rate_limit:
+            hdrs.update(mock.rate_headers(self.path))
+        if mock.cfg.etag and status == 200 and self.command == "GET" and payload:
+            etag = '"%s"' % hashlib.md5(payload).hexdigest()
+            hdrs["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                status, payload = 304, b""
+                hdrs["Content-Length"] = "0"
+        head = [f"HTTP/1.1 {status} {self.responses.get(status, ('',))[0]}"]
+        head += [f"{k}: {v}" for k, v in hdrs.items()]
+        mock.count(self.command, status)     # before the write: the client may read counters next
+        # one write: headers and body in the same segment (no Nagle stall)
+        self.wfile.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+
+    def _page(self, items: List[Any], query: Dict[str, str]) -> None:
+        per_page = min(int(query.get("per_page") or self.server.mock.cfg.page_size), 100)
+        page = max(int(query.get("page") or 1), 1)
+        chunk = items[(page - 1) * per_page: page * per_page]
+        headers = {}
+        if page * per_page < len(items):
+            parts = urlsplit(self.path)
+            nxt = dict(query, page=str(page + 1), per_page=str(per_page))
+            qs = "&".join(f"{k}={v}" for k, v in nxt.items())
+            headers["Link"] = f'<{self.server.mock.url}{parts.path}?{qs}>; rel="next"'
+        self._reply(200, chunk, headers)
+
+    def _body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def _handle(self) -> None:
+        mock = self.server.mock
+        delay = mock.cfg.latency_ms + mock.rng_uniform(0, mock.cfg.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+        fault = mock.fault()
+        if fault == "error":
+            self._body()
+            self._reply(mock.cfg.error_status, {"message": "Injected failure"})
+            return
+        if fault == "throttle":
+            self._body()
+            self._reply(429, {"message": "Injected throttle"}, {"Retry-After": "0"})
+            return
+        parts = urlsplit(self.path)
+        query = dict(parse_qsl(parts.query))
+        for method, pattern, fn in _ROUTES:
+            if method == self.command:
+                m = pattern.match(parts.path)
+                if m:
+                    fn(self, mock.data, query, *m.groups())
+                    return
+        self._body()
+        self._reply(404, {"message": "Not Found", "documentation_url": "https://docs.github.com/rest"})
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _handle
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+# -- endpoints ---------------------------------------------------------- #
+def _user(h, d, q):                      h._reply(200, d.user(d.cfg.owner))
+def _user_named(h, d, q, login):         h._reply(200, d.user(login))
+def _followers(h, d, q, login=None):     h._page([d.user(f"follower{i}") for i in range(d.cfg.followers)], q)
+def _following(h, d, q, login=None):     h._page([d.user(f"friend{i}") for i in range(10)], q)
+def _user_repos(h, d, q, login=None):    h._page([d.repo(n) for n in d.repo_names], q)
+def _repo(h, d, q, owner, repo):         h._reply(200, d.repo(repo))
+def _issue(h, d, q, owner, repo, n):     h._reply(200, d.issue(repo, int(n)))
+
+
+def _create_repo(h, d, q):
+    body = h._body()
+    d.repo_names.append(body.get("name", "new-repo"))
+    h._reply(201, d.repo(d.repo_names[-1]))
+
+
+def _branches(h, d, q, owner, repo):
+    sha = hashlib.sha1(repo.encode()).hexdigest()
+    h._page([{"name": "main" if i == 0 else f"feature-{i}",
+              "commit": {"sha": sha, "url": f"https://api.github.com/repos/{owner}/{repo}/commits/{sha}"},
+              "protected": i == 0} for i in range(d.cfg.branches_per_repo)], q)
+
+
+def _issues(h, d, q, owner, repo):
+    h._page(d.issues(repo, q.get("state", "open"), q.get("since", "")), q)
+
+
+def _create_issue(h, d, q, owner, repo):
+    body = h._body()
+    with d.lock:
+        created = d.created.setdefault(repo, [])
+        issue = d.issue(repo, d.cfg.issues_per_repo + len(created) + 1)
+        issue.update(title=body.get("title", ""), body=body.get("body"), state="open",
+                     updated_at=d.touch(repo, issue["number"]))
+        created.insert(0, issue)
+    h._reply(201, issue)
+
+
+def _patch_issue(h, d, q, owner, repo, n):
+    body = h._body()
+    with d.lock:
+        if "state" in body:
+            d.closed[(repo, int(n))] = body["state"] == "closed"
+        d.touch(repo, int(n))
+    h._reply(200, d.issue(repo, int(n)))
+
+
+def _comment(h, d, q, owner, repo, n):
+    body = h._body()
+    with d.lock:
+        d.touch(repo, int(n))
+    h._reply(201, {"id": int(n) * 7, "user": d.user(d.cfg.owner), "body": body.get("body", ""),
+                   "created_at": "2024-06-01T00:00:00Z",
+                   "html_url": f"https://github.com/{owner}/{repo}/issues/{n}#issuecomment-1"})
+
+
+def _search(items_fn):
+    def handler(h, d, q):
+        text = q.get("q", "").lower()
+        words = [w for w in re.split(r"\s+", text) if w and ":" not in w]
+        items = [i for i in items_fn(d, text) if all(w in json.dumps(i).lower() for w in words)]
+        per_page = min(int(q.get("per_page") or d.cfg.page_size), 100)
+        page = max(int(q.get("page") or 1), 1)
+        h._reply(200, {"total_count": len(items), "incomplete_results": False,
+                       "items": items[(page - 1) * per_page: page * per_page]})
+    return handler
+
+
+def _issue_pool(d, text):
+    m = re.search(r"repo:[^/\s]+/([^\s]+)", text)
+    repos = [m.group(1)] if m else d.repo_names[:3]
+    return [i for r in repos for i in d.issues(r, "all")]
+
+
+def _contents(h, d, q, owner, repo, path):
+    files = d.files(repo)
+    if path not in files:
+        h._reply(404, {"message": "Not Found"})
+        return
+    data = files[path]
+    h._reply(200, {"name": path.rsplit("/", 1)[-1], "path": path, "sha": _blob_sha(data),
+                   "size": len(data), "type": "file", "encoding": "base64",
+                   "content": base64.encodebytes(data).decode(),
+                   "url": f"https://api.github.com/repos/{owner}/{repo}/contents/{path}",
+                   "html_url": f"https://github.com/{owner}/{repo}/blob/main/{path}",
+                   "git_url": None, "download_url": None, "_links": {}})
+
+
+def _put_contents(h, d, q, owner, repo, path):
+    body = h._body()
+    data = base64.b64decode(body.get("content", ""))
+    sha = _blob_sha(data)
+    h._reply(200, {"content": {"name": path.rsplit("/", 1)[-1], "path": path, "sha": sha},
+                   "commit": {"sha": hashlib.sha1(path.encode()).hexdigest(),
+                              "html_url": f"https://github.com/{owner}/{repo}/commit/x"}})
+
+
+def _tree(h, d, q, owner, repo, ref):
+    files = d.files(repo)
+    tree = [{"path": "src", "mode": "040000", "type": "tree", "sha": "0" * 40}]
+    tree += [{"path": p, "mode": "100644", "type": "blob", "sha": _blob_sha(c), "size": len(c)}
+             for p, c in files.items()]
+    h._reply(200, {"sha": hashlib.sha1(repo.encode()).hexdigest(), "tree": tree, "truncated": False})
+
+
+def _blob(h, d, q, owner, repo, sha):
+    for data in d.files(repo).values():
+        if _blob_sha(data) == sha:
+            h._reply(200, {"sha": sha, "size": len(data), "encoding": "base64",
+                           "content": base64.encodebytes(data).decode()})
+            return
+    h._reply(404, {"message": "Not Found"})
+
+
+_R = re.compile
+_ROUTES = [
+    ("GET",   _R(r"^/user$"), _user),
+    ("POST",  _R(r"^/user/repos$"), _create_repo),
+    ("GET",   _R(r"^/user/followers$"), _followers),
+    ("GET",   _R(r"^/user/following$"), _following),
+    ("GET",   _R(r"^/user/repos$"), _user_repos),
+    ("GET",   _R(r"^/users/([^/]+)$"), _user_named),
+    ("GET",   _R(r"^/users/([^/]+)/followers$"), _followers),
+    ("GET",   _R(r"^/users/([^/]+)/following$"), _following),
+    ("GET",   _R(r"^/users/([^/]+)/repos$"), _user_repos),
+    ("GET",   _R(r"^/search/issues$"), _search(_issue_pool)),
+    ("GET",   _R(r"^/search/repositories$"), _search(lambda d, t: [d.repo(n) for n in d.repo_names])),
+    ("GET",   _R(r"^/repos/([^/]+)/([^/]+)$"), _repo),
+    ("GET",   _R(r"^/repos/([^/]+)/([^/]+)/branches$"), _branches),
+    ("GET",   _R(r"^/repos/([^/]+)/([^/]+)/issues$"), _issues),
+    ("POST",  _R(r"^/repos/([^/]+)/([^/]+)/issues$"), _create_issue),
+    ("GET",   _R(r"^/repos/([^/]+)/([^/]+)/issues/(\d+)$"), _issue),
+    ("PATCH", _R(r"^/repos/([^/]+)/([^/]+)/issues/(\d+)$"), _patch_issue),
+    ("POST",  _R(r"^/repos/([^/]+)/([^/]+)/issues/(\d+)/comments$"), _comment),
+    ("GET",   _R(r"^/repos/([^/]+)/([^/]+)/contents/(.+)$"), _contents),
+    ("PUT",   _R(r"^/repos/([^/]+)/([^/]+)/contents/(.+)$"), _put_contents),
+    ("GET",   _R(r"^/repos/([^/]+)/([^/]+)/git/trees/([^/]+)$"), _tree),
+    ("GET",   _R(r"^/repos/([^/]+)/([^/]+)/git/blobs/([0-9a-f]+)$"), _blob),
+]
+
+
+class MockGitHub:
+    """The mock API server; ``start()`` serves it on a background thread."""
+
+    class _Server(ThreadingHTTPServer):
+        daemon_threads = True
+        mock: "MockGitHub"
+
+    def __init__(self, cfg: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.cfg = cfg or MockConfig()
+        self.data = _Data(self.cfg)
+        self._rng = random.Random(self.cfg.seed)
+        self._lock = threading.Lock()
+        self._remaining: Counter = Counter()
+        self._reset = int(time.time()) + 3600
+        self.requests: Counter = Counter()
+        self._server = self._Server((host, port), _Handler)
+        self._server.mock = self
+        self.url = f"http://{host}:{self._server.server_port}"
+
+    def start(self) -> "MockGitHub":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    # -- state used by the handler --------------------------------------- #
+    def rng_uniform(self, lo: float, hi: float) -> float:
+        if hi <= lo:
+            return lo
+        with self._lock:
+            return self._rng.uniform(lo, hi)
+
+    def fault(self) -> Optional[str]:
+        if not (self.cfg.error_rate or self.cfg.throttle_rate):
+            return None
+        with self._lock:
+            r = self._rng.random()
+        if r < self.cfg.error_rate:
+            return "error"
+        if r < self.cfg.error_rate + self.cfg.throttle_rate:
+            return "throttle"
+        return None
+
+    def rate_headers(self, path: str) -> Dict[str, str]:
+        resource = "search" if path.startswith("/search/") else "core"
+        limit = self.cfg.search_rate_limit if resource == "search" else self.cfg.rate_limit
+        with self._lock:
+            self._remaining[resource] += 1
+            used = self._remaining[resource]
+        return {"X-RateLimit-Limit": str(limit), "X-RateLimit-Remaining": str(max(limit - used, 0)),
+                "X-RateLimit-Used": str(used), "X-RateLimit-Reset": str(self._reset),
+                "X-RateLimit-Resource": resource}
+
+    def count(self, method: str, status: int) -> None:
+        with self._lock:
+            self.requests[f"{method} {status}"] += 1
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self._remaining.clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the mock GitHub API.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--page-size", type=int, default=30)
+    args = parser.parse_args()
+    cfg = MockConfig(latency_ms=args.latency_ms, error_rate=args.error_rate, page_size=args.page_size)
+    server = MockGitHub(cfg, port=args.port)
+    print(f"mock GitHub API on {server.url}  (export GITHUB_API_BASE={server.url})")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
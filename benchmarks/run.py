@@ -0,0 +1,332 @@
+"""Offline benchmark suite: mock GitHub API + scripted LLM.
+
+Starts ``mock_github.MockGitHub`` on a free port, points the client at it
+(``GITHUB_API_BASE``) and measures three suites:
+
+* ``client`` – raw ``github_request`` calls, sequential and from a thread pool,
+  and ``branches_fanout``: ``--workers`` threads sending the same GET at once
+  (single-flight coalescing makes it one HTTP request; the mock answers in
+  at least 20 ms so the callers overlap)
+* ``tools``  – every read tool through ``FunctionTool.call``
+* ``agents`` – full master → specialist → tool turns with ``ScriptedLLM``,
+  each once more in flat mode (``<case>_flat``: one agent, retrieved tools),
+  with function-calling specialists (``<case>_fc``: parallel tool calls;
+  ``compare_issues_fc`` needs two lookups, which a ReAct specialist's
+  five reasoning steps cannot fit) and streamed (``<case>_streamed``) for
+  time to first token,
+  and ``long_session``: the same prompts in one conversation without resets,
+  so chat memory grows (LLM prompt tokens per turn show the memory budget)
+
+For each case it reports p50/p95 latency, throughput, HTTP requests per
+operation and peak allocated KiB per operation (``tracemalloc``)::
+
+    python benchmarks/run.py                                   # table
+    python benchmarks/run.py --latency-ms 30 --suite agents
+    python benchmarks/run.py --save-baseline                   # baselines/default.json
+    python benchmarks/run.py --baseline benchmarks/baselines/default.json --tolerance 0.5
+
+With ``--baseline`` the run fails (exit 1) when a case's p50 is slower than
+the baseline by more than ``--tolerance`` (fraction) plus 1 ms of noise (p50
+time to first token likewise), when it makes more HTTP requests per
+operation, or when it sends over 5% more LLM prompt tokens.  Request and
+token counts are exact; latencies depend on the machine, so save a baseline
+on the box that checks it.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+HERE = Path(__file__).resolve().parent
+sys.path[:0] = [str(HERE.parent), str(HERE)]
+DEFAULT_BASELINE = HERE / "baselines" / "default.json"
+
+from mock_github import MockConfig, MockGitHub  # noqa: E402
+
+TOOL_CASES: Dict[str, Dict[str, Any]] = {
+    "get_authenticated_user": {},
+    "list_user_repos": {"allPages": True},
+    "list_followers": {"allPages": True},
+    "list_branches": {"repo": "demo"},
+    "get_repository_tree": {"repo": "demo"},
+    "get_file_contents": {"repo": "demo", "path": "README.md"},
+    "list_issues": {"repo": "demo", "state": "open"},
+    "get_issue": {"repo": "demo", "number": 42},
+    "search_issues": {"query": "crash", "repo": "demo"},
+    "search_repositories": {"query": "demo"},
+}
+
+AGENT_CASES: Dict[str, str] = {
+    "list_issues": "What are the open issues in demo?",
+    "get_issue": "Summarise issue 42 for me",
+    "list_branches": "Which branches does demo have?",
+    "read_file": "What does the README of demo say?",
+    "followers": "How many followers do I have?",
+}
+FUNCTION_CALLING_CASES: Dict[str, str] = {**AGENT_CASES, "compare_issues": "Compare issues 42 and 7"}
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _attempt(op: Callable[[], Any]) -> bool:
+    try:
+        op()
+        return True
+    except Exception:                    # injected errors (--error-rate) surface here
+        return False
+
+
+def measure(op: Callable[[], Any], iterations: int, mock: MockGitHub, warmup: int = 1) -> Dict[str, float]:
+    """Time ``op`` sequentially; one more run is traced for peak allocations."""
+    for _ in range(warmup):
+        _attempt(op)
+    mock.reset_counters()
+    samples, errors = [], 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        errors += not _attempt(op)
+        samples.append(time.perf_counter() - start)
+    requests = sum(mock.requests.values())
+    tracemalloc.start()
+    _attempt(op)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"p50_ms": round(statistics.median(samples) * 1000, 2),
+            "p95_ms": round(_percentile(samples, 95) * 1000, 2),
+            "ops_per_s": round(iterations / sum(samples), 1),
+            "requests_per_op": round(requests / iterations, 2),
+            "peak_kib": round(peak / 1024, 1),
+            "errors": errors}
+
+
+def measure_concurrent(op: Callable[[], Any], iterations: int, workers: int) -> Dict[str, float]:
+    samples: List[float] = []
+
+    def timed(_: int) -> None:
+        start = time.perf_counter()
+        op()
+        samples.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(timed, range(iterations)))
+    wall = time.perf_counter() - started
+    return {"p50_ms": round(statistics.median(samples) * 1000, 2),
+            "p95_ms": round(_percentile(samples, 95) * 1000, 2),
+            "ops_per_s": round(iterations / wall, 1)}
+
+
+# -- suites ------------------------------------------------------------------ #
+def suite_client(mock: MockGitHub, iterations: int, workers: int) -> Dict[str, Dict[str, float]]:
+    from mcp_tools import common
+    owner = mock.cfg.owner
+    ops = {
+        "get_repo": lambda: common.github_request("GET", f"/repos/{owner}/demo"),
+        "list_issues_page": lambda: common.github_request("GET", f"/repos/{owner}/demo/issues",
+                                                          params={"state": "open"}),
+        "paginate_issues": lambda: list(common.paginate(f"/repos/{owner}/demo/issues",
+                                                        {"state": "all"})),
+    }
+    results = {name: measure(op, iterations, mock) for name, op in ops.items()}
+    results["get_repo_threaded"] = measure_concurrent(ops["get_repo"], iterations * workers, workers)
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+
+    def fanout() -> None:
+        start = threading.Barrier(workers)
+
+        def one(_: int) -> str:
+            start.wait()
+            return common.github_request("GET", f"/repos/{owner}/demo/branches")
+        list(pool.map(one, range(workers)))
+
+    latency, mock.cfg.latency_ms = mock.cfg.latency_ms, max(mock.cfg.latency_ms, 20.0)
+    before = common.coalesce_stats()
+    try:
+        results["branches_fanout"] = measure(fanout, iterations, mock)
+    finally:
+        mock.cfg.latency_ms = latency
+        pool.shutdown()
+    after = common.coalesce_stats()
+    calls = (after["leaders"] + after["coalesced"]) - (before["leaders"] + before["coalesced"])
+    results["branches_fanout"]["coalesce_rate"] = round(
+        (after["coalesced"] - before["coalesced"]) / calls, 3) if calls else 0.0
+    return results
+
+
+def _mirror_issues() -> None:
+    """Fill the issue mirror up front: the suites measure its steady state,
+    not the background backfill racing the first iterations."""
+    from mcp_tools import issue_store
+    store = issue_store.get_issue_store()
+    if store is not None:
+        for repo in store.repos():
+            if not store.is_mirrored(repo):
+                store.sync(repo)
+
+
+def suite_tools(mock: MockGitHub, iterations: int, workers: int) -> Dict[str, Dict[str, float]]:
+    from mcp_tools.registry import tools
+    _mirror_issues()
+    return {name: measure(lambda t=tools[name], a=args: t.call(**a), iterations, mock)
+            for name, args in TOOL_CASES.items()}
+
+
+def suite_agents(mock: MockGitHub, iterations: int, workers: int,
+                 think_ms: float = 0.0) -> Dict[str, Dict[str, float]]:
+    import Rest_API_as_tool as app
+    from fake_llm import ScriptedLLM
+    from mcp_tools import streaming
+    llm = ScriptedLLM(think_ms=think_ms)
+    _mirror_issues()
+    master, agents = app.build_agent_set(llm, mock.cfg.owner, verbose=False)
+    flat_master, flat_agents = app.build_agent_set(llm, mock.cfg.owner, verbose=False, mode="flat")
+    fc_master, fc_agents = app.build_agent_set(llm, mock.cfg.owner, verbose=False,
+                                               specialist_mode="function")
+
+    def turn(prompt: str, master: Any = master, agents: Dict[str, Any] = agents) -> str:
+        for agent in agents.values():
+            agent.reset()
+        return str(master.chat(prompt))
+
+    def llm_stats(result: Dict[str, float], runs: int) -> Dict[str, float]:
+        stats = llm.stats()
+        result["llm_calls_per_op"] = round(stats["calls"] / runs, 2)
+        result["prompt_tokens_per_op"] = round(stats["prompt_tokens"] / runs)
+        return result
+
+    def streamed_turn(prompt: str, ttfts: List[float]) -> str:
+        for agent in agents.values():
+            agent.reset()
+        with streaming.stream_to(lambda agent, text: None) as sink:
+            answer = streaming.chat(master, prompt, app.AgentType.MASTER)
+        ttfts.append(sink.first_token_ms)
+        return answer
+
+    results = {}
+    for name, prompt in AGENT_CASES.items():
+        llm.reset_stats()
+        results[name] = llm_stats(measure(lambda p=prompt: turn(p), iterations, mock), iterations + 2)
+        llm.reset_stats()
+        results[f"{name}_flat"] = llm_stats(measure(lambda p=prompt: turn(p, flat_master, flat_agents),
+                                                    iterations, mock), iterations + 2)
+        ttfts: List[float] = []
+        results[f"{name}_streamed"] = measure(lambda p=prompt: streamed_turn(p, ttfts), iterations, mock)
+        results[f"{name}_streamed"]["ttft_p50_ms"] = statistics.median(t for t in ttfts if t is not None)
+    for name, prompt in FUNCTION_CALLING_CASES.items():
+        llm.reset_stats()
+        results[f"{name}_fc"] = llm_stats(measure(lambda p=prompt: turn(p, fc_master, fc_agents),
+                                                  iterations, mock), iterations + 2)
+
+    for agent in agents.values():
+        agent.reset()
+    prompts = list(AGENT_CASES.values())
+    turns = iter(range(1 << 30))
+    llm.reset_stats()
+    session_turns = max(iterations, 100)     # long enough for memory to hit its budget
+    results["long_session"] = measure(lambda: str(master.chat(prompts[next(turns) % len(prompts)])),
+                                      session_turns, mock)
+    results["long_session"]["prompt_tokens_per_op"] = round(llm.stats()["prompt_tokens"] / (session_turns + 2))
+    return results
+
+
+SUITES = {"client": suite_client, "tools": suite_tools, "agents": suite_agents}
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    regressions = []
+    for suite, cases in results.items():
+        for case, r in cases.items():
+            base = baseline.get(suite, {}).get(case, {})
+            if "p50_ms" in base and r["p50_ms"] > base["p50_ms"] * (1 + tolerance) + 1.0:
+                regressions.append(f"{suite}/{case}: {base['p50_ms']:.2f} ms -> {r['p50_ms']:.2f} ms")
+            if "ttft_p50_ms" in base and r["ttft_p50_ms"] > base["ttft_p50_ms"] * (1 + tolerance) + 1.0:
+                regressions.append(f"{suite}/{case}: first token {base['ttft_p50_ms']:.2f} ms -> "
+                                   f"{r['ttft_p50_ms']:.2f} ms")
+            if "prompt_tokens_per_op" in base and r["prompt_tokens_per_op"] > base["prompt_tokens_per_op"] * 1.05:
+                regressions.append(f"{suite}/{case}: {base['prompt_tokens_per_op']} -> "
+                                   f"{r['prompt_tokens_per_op']} LLM prompt tokens per op")
+            if "requests_per_op" in base and r["requests_per_op"] > base["requests_per_op"] + 0.05:
+                regressions.append(f"{suite}/{case}: {base['requests_per_op']} -> "
+                                   f"{r['requests_per_op']} requests per op")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--suite", nargs="*", choices=sorted(SUITES), help="default: all")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="mock server latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 502 responses")
+    parser.add_argument("--page-size", type=int, default=30)
+    parser.add_argument("--think-ms", type=float, default=0.0, help="scripted LLM latency per call")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--save-baseline", nargs="?", const=str(DEFAULT_BASELINE), metavar="PATH")
+    parser.add_argument("--baseline", help="JSON file from an earlier --save-baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    args = parser.parse_args()
+
+    cfg = MockConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                     error_rate=args.error_rate, page_size=args.page_size)
+    mock = MockGitHub(cfg).start()
+    # the client reads these at import time
+    scratch = tempfile.mkdtemp(prefix="bench-")
+    os.environ.update({"GITHUB_API_BASE": mock.url, "GITHUB_PERSONAL_ACCESS_TOKEN": "bench",
+                       "GITHUB_USERNAME": cfg.owner,
+                       "GITHUB_BLOB_DIR": os.path.join(scratch, "blobs"),
+                       "GITHUB_ISSUE_DB": os.path.join(scratch, "issues.sqlite3")})
+    warnings.filterwarnings("ignore")
+
+    results: Dict[str, Any] = {}
+    try:
+        for name in args.suite or SUITES:
+            if name == "agents":
+                results[name] = suite_agents(mock, args.iterations, args.workers, args.think_ms)
+            else:
+                results[name] = SUITES[name](mock, args.iterations, args.workers)
+    finally:
+        mock.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'case':<34}{'p50 ms':>9}{'p95 ms':>9}{'ops/s':>9}{'req/op':>8}{'peak KiB':>10}{'ttft ms':>9}")
+        for suite, cases in results.items():
+            for case, r in cases.items():
+                print(f"{suite + '/' + case:<34}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['ops_per_s']:>9.1f}"
+                      f"{r.get('requests_per_op', float('nan')):>8.2f}{r.get('peak_kib', float('nan')):>10.1f}"
+                      f"{r.get('ttft_p50_ms', float('nan')):>9.2f}")
+
+    if args.save_baseline:
+        path = Path(args.save_baseline)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline written to {path}", file=sys.stderr)
+    if not args.baseline:
+        return 0
+    regressions = compare(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
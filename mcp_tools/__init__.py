@@ -1,13 +1,16 @@
-"""Entry-point that aggregates all GitHub MCP **repo** FunctionTools."""
+"""GitHub MCP tools.
+
+Tool packages (``repos``, ``issues``, ``users``) load lazily; every ``*_tool``
+is also reachable from here, e.g. ``from mcp_tools import list_branches_tool``.
+"""
 
 from importlib import import_module
-from pathlib import Path
 
-_pkg_path = Path(__file__).parent / "repos"
-for _file in _pkg_path.glob("*.py"):
-    if _file.name == "__init__.py":
-        continue
-    import_module(f"mcp_tools.repos.{_file.stem}")
 
-# Re-export every *_tool object for convenience:
-from mcp_tools.repos import *  # noqa: F401,F403
+def __getattr__(name: str):
+    if name.endswith("_tool"):
+        from mcp_tools.registry import manifest
+        for package, tools in manifest().items():
+            if name in tools:
+                return getattr(import_module(f"mcp_tools.{package}"), name)
+    raise AttributeError(f"module 'mcp_tools' has no attribute {name!r}")
@@ -0,0 +1,181 @@
+"""Content-addressed store for git blobs.
+
+A blob's content never changes for a given SHA, so once downloaded it can be
+served for every ref, branch and fork that contains it.  Layout under
+``GITHUB_BLOB_DIR`` (default ``~/.cache/mcp_tools/blobs``)::
+
+    ab/cdef…          raw blob bytes, named by git SHA-1
+    paths/<key>.json  file metadata for (owner, repo, commit SHA, path)
+
+* blobs are verified against their SHA before they are stored;
+* small blobs are also kept in an in-process LRU, large ones
+  (``GITHUB_BLOB_MMAP_BYTES`` and up) are returned memory-mapped;
+* ``GITHUB_BLOB_QUOTA_BYTES`` caps the disk usage, least recently used
+  blobs are evicted first (file mtimes record the last access).
+"""
+
+from __future__ import annotations
+
+import hashlib, json, mmap, os, re, tempfile, threading
+from collections import OrderedDict
+from typing import Any, Dict
+
+_SHA = re.compile(r"^[0-9a-f]{40}$")
+
+Blob = bytes | mmap.mmap
+
+
+def git_blob_sha(data: bytes) -> str:
+    """SHA-1 git assigns to a blob with this content."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+def is_commit_sha(ref: str | None) -> bool:
+    return bool(ref) and bool(_SHA.match(ref))
+
+
+class BlobStore:
+    def __init__(self, root: str, *, quota_bytes: int = 512 << 20,
+                 mmap_bytes: int = 1 << 20, memory_bytes: int = 16 << 20):
+        self.root = root
+        self.quota_bytes = quota_bytes
+        self.mmap_bytes = mmap_bytes
+        self.memory_bytes = memory_bytes
+        self._mem: "OrderedDict[str, bytes]" = OrderedDict()
+        self._mem_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0,
+                          "bytes_served": 0}
+        os.makedirs(os.path.join(root, "paths"), exist_ok=True)
+        self._disk_bytes = sum(os.path.getsize(p) for p in self._blob_files())
+
+    @classmethod
+    def from_env(cls) -> "BlobStore | None":
+        if os.getenv("GITHUB_BLOB_CACHE", "1") == "0":
+            return None
+        root = os.getenv("GITHUB_BLOB_DIR") or os.path.join(
+            os.path.expanduser("~"), ".cache", "mcp_tools", "blobs")
+        return cls(root,
+                   quota_bytes=int(os.getenv("GITHUB_BLOB_QUOTA_BYTES", str(512 << 20))),
+                   mmap_bytes=int(os.getenv("GITHUB_BLOB_MMAP_BYTES", str(1 << 20))),
+                   memory_bytes=int(os.getenv("GITHUB_BLOB_MEMORY_BYTES", str(16 << 20))))
+
+    # ------------------------------------------------------------------ #
+    def _path(self, sha: str) -> str:
+        return os.path.join(self.root, sha[:2], sha[2:])
+
+    def _blob_files(self):
+        for d in os.listdir(self.root):
+            if len(d) == 2:
+                for name in os.listdir(os.path.join(self.root, d)):
+                    if not name.endswith(".tmp"):
+                        yield os.path.join(self.root, d, name)
+
+    def get(self, sha: str) -> Blob | None:
+        """Blob content, or ``None`` when it has not been stored yet."""
+        with self._lock:
+            data = self._mem.get(sha)
+            if data is not None:
+                self._mem.move_to_end(sha)
+                self._counters["hits"] += 1
+                self._counters["bytes_served"] += len(data)
+                return data
+        path = self._path(sha)
+        try:
+            size = os.path.getsize(path)
+            os.utime(path)                    # LRU bookkeeping
+            with open(path, "rb") as fh:
+                if size >= self.mmap_bytes:
+                    blob: Blob = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    blob = fh.read()
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self._counters["misses"] += 1
+            return None
+        with self._lock:
+            self._counters["hits"] += 1
+            self._counters["bytes_served"] += size
+            if isinstance(blob, bytes):
+                self._remember(sha, blob)
+        return blob
+
+    def put(self, sha: str, data: bytes) -> None:
+        """Store ``data`` under ``sha`` (ignored if it does not hash to ``sha``)."""
+        if git_blob_sha(data) != sha:
+            return
+        path = self._path(sha)
+        with self._lock:
+            if len(data) < self.mmap_bytes:
+                self._remember(sha, data)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self._counters["stores"] += 1
+            self._disk_bytes += len(data)
+            over = self._disk_bytes > self.quota_bytes
+        if over:
+            self._evict()
+
+    # ------------------------------------------------------------------ #
+    def _remember(self, sha: str, data: bytes) -> None:
+        if sha in self._mem:
+            return
+        self._mem[sha] = data
+        self._mem_bytes += len(data)
+        while self._mem_bytes > self.memory_bytes and self._mem:
+            _, old = self._mem.popitem(last=False)
+            self._mem_bytes -= len(old)
+
+    def _evict(self) -> None:
+        """Delete least recently used blobs until 90 % of the quota is left."""
+        files = sorted(((os.stat(p).st_mtime, p) for p in self._blob_files()))
+        target = int(self.quota_bytes * 0.9)
+        for _, path in files:
+            with self._lock:
+                if self._disk_bytes <= target:
+                    return
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                continue
+            sha = os.path.basename(os.path.dirname(path)) + os.path.basename(path)
+            with self._lock:
+                self._disk_bytes -= size
+                self._counters["evictions"] += 1
+                old = self._mem.pop(sha, None)
+                if old is not None:
+                    self._mem_bytes -= len(old)
+
+    # ------------------------------------------------------------------ #
+    # (owner, repo, commit, path) -> file metadata; valid forever because
+    # a commit SHA pins the whole tree.
+    # ------------------------------------------------------------------ #
+    def _meta_path(self, owner: str, repo: str, commit: str, path: str) -> str:
+        key = hashlib.sha256(f"{owner}/{repo}@{commit}:{path}".lower().encode()).hexdigest()
+        return os.path.join(self.root, "paths", key + ".json")
+
+    def get_meta(self, owner: str, repo: str, commit: str, path: str) -> Dict[str, Any] | None:
+        try:
+            with open(self._meta_path(owner, repo, commit, path)) as fh:
+                return json.load(fh)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put_meta(self, owner: str, repo: str, commit: str, path: str,
+                 meta: Dict[str, Any]) -> None:
+        target = self._meta_path(owner, repo, commit, path)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".tmp")
+        with os.fdopen(fd, "w") as fh:
+            json.dump(meta, fh)
+        os.replace(tmp, target)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._counters, "memory_bytes": self._mem_bytes,
+                    "disk_bytes": self._disk_bytes, "quota_bytes": self.quota_bytes}
@@ -0,0 +1,164 @@
+"""Conditional-request cache for GitHub GET responses.
+
+Entries keep the response body together with its ``ETag`` / ``Last-Modified``
+validators.  ``github_request`` replays them as ``If-None-Match`` /
+``If-Modified-Since``; a ``304 Not Modified`` is answered from the cache and
+is not charged against the rate limit.
+
+The in-memory tier is an LRU bounded by entry count and bytes.  Setting
+``GITHUB_CACHE_DIR`` adds a SQLite tier that survives restarts.
+"""
+
+from __future__ import annotations
+
+import hashlib, os, sqlite3, threading, time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple
+from urllib.parse import urlencode
+
+
+class CacheEntry(NamedTuple):
+    etag:          str | None
+    last_modified: str | None
+    body:          str            # raw JSON text as received
+
+
+class ResponseCache:
+    """Thread-safe LRU of validated responses with an optional SQLite tier."""
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 32 << 20,
+                 path: str | None = None, max_disk_bytes: int = 256 << 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._mem: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,"
+                " body TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)")
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+            self._db.commit()
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        cache_dir = os.getenv("GITHUB_CACHE_DIR")
+        return cls(
+            max_entries=int(os.getenv("GITHUB_CACHE_ENTRIES", "512")),
+            max_bytes=int(os.getenv("GITHUB_CACHE_BYTES", str(32 << 20))),
+            path=os.path.join(cache_dir, "responses.sqlite3") if cache_dir else None,
+            max_disk_bytes=int(os.getenv("GITHUB_CACHE_DISK_BYTES", str(256 << 20))),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def key(token: str, path: str, params: Dict[str, Any] | None = None) -> str:
+        """``<token fingerprint> <path>?<sorted query>`` – tokens never share entries."""
+        fp = hashlib.sha256(token.encode()).hexdigest()[:12]
+        query = urlencode(sorted((k, v) for k, v in (params or {}).items() if v is not None))
+        return f"{fp} {path}?{query}" if query else f"{fp} {path}"
+
+    # ------------------------------------------------------------------ #
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                self._mem.move_to_end(key)
+                return entry
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT etag, last_modified, body FROM responses WHERE key = ?",
+                (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?",
+                             (time.time(), key))
+            self._db.commit()
+            entry = CacheEntry(*row)
+            self._remember(key, entry)
+            return entry
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        if not self.enabled or len(entry.body) > self.max_bytes:
+            return
+        with self._lock:
+            self._counters["stores"] += 1
+            self._remember(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, entry.etag, entry.last_modified, entry.body,
+                     len(entry.body), time.time()))
+                self._trim_disk()
+                self._db.commit()
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            self._counters["hits" if hit else "misses"] += 1
+
+    def invalidate(self, prefix: str = "", *, exact: bool = False) -> int:
+        """Drop every entry whose request path starts with ``prefix``.
+
+        With ``exact`` only entries for that very path go (any query string),
+        e.g. a directory listing without the files below it.
+        """
+        def doomed_path(path: str) -> bool:
+            return path.split("?", 1)[0] == prefix if exact else path.startswith(prefix)
+
+        with self._lock:
+            doomed = [k for k in self._mem if doomed_path(k.split(" ", 1)[1])]
+            for k in doomed:
+                self._bytes -= len(self._mem.pop(k).body)
+            if self._db is not None:
+                pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                path = "substr(key, instr(key, ' ') + 1)"
+                if exact:
+                    cur = self._db.execute(
+                        f"DELETE FROM responses WHERE {path} = ? OR {path} LIKE ? ESCAPE '\\'",
+                        (prefix, pattern + "?%"))
+                else:
+                    cur = self._db.execute(
+                        f"DELETE FROM responses WHERE {path} LIKE ? ESCAPE '\\'", (pattern + "%",))
+                self._db.commit()
+                return max(len(doomed), cur.rowcount)
+            return len(doomed)
+
+    def clear(self) -> None:
+        self.invalidate("")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._counters, "entries": len(self._mem), "bytes": self._bytes}
+
+    # ------------------------------------------------------------------ #
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old.body)
+        self._mem[key] = entry
+        self._bytes += len(entry.body)
+        while self._mem and (len(self._mem) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._mem.popitem(last=False)
+            self._bytes -= len(evicted.body)
+            self._counters["evictions"] += 1
+
+    def _trim_disk(self) -> None:
+        total, = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        while total > self.max_disk_bytes:
+            row = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY accessed LIMIT 1").fetchone()
+            if row is None:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            total -= row[1]
@@ -1,10 +1,20 @@
 """Shared helpers for all GitHub MCP repo tools."""
 
-import base64, os
-from json import dumps
-from typing import Any, Dict
+import asyncio, base64, contextvars, os, re, threading, time, weakref
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from json import dumps, loads
+from typing import (Any, AsyncIterator, Awaitable, Callable, Dict, Iterator,
+                    List, Mapping, Tuple)
+from urllib.parse import parse_qsl, urlsplit
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
+from mcp_tools import projection, tracing
+from mcp_tools.cache import CacheEntry, ResponseCache
+from mcp_tools.ratelimit import RateLimiter, RateLimitError  # noqa: F401
+from mcp_tools.singleflight import SingleFlight
 load_dotenv()
 
 GITHUB_API_BASE = os.getenv("GITHUB_API_BASE", "https://api.github.com")
@@ -12,6 +22,37 @@ API_VERSION_HDR = {"X-GitHub-Api-Version": "2022-11-28"}
 TIMEOUT = 15  # s
 GITHUB_USERNAME = os.getenv("GITHUB_USERNAME", "Shreyas-Yadav")
 
+# Connection pool: one keep-alive session shared by every tool and thread.
+POOL_CONNECTIONS = int(os.getenv("GITHUB_POOL_CONNECTIONS", "4"))   # hosts kept
+POOL_MAXSIZE     = int(os.getenv("GITHUB_POOL_MAXSIZE", "16"))      # sockets / host
+KEEP_ALIVE       = os.getenv("GITHUB_KEEP_ALIVE", "1") != "0"
+PREFETCH_PAGES   = os.getenv("GITHUB_PREFETCH_PAGES", "1") != "0"
+# Tool output: compact JSON (no indentation) unless GITHUB_COMPACT_JSON=0.
+COMPACT_JSON     = os.getenv("GITHUB_COMPACT_JSON", "1") != "0"
+PROJECTION_STATS = os.getenv("GITHUB_PROJECTION_STATS", "1") != "0"    # sampled: projection.SAMPLE
+# "graphql" serves the supported read endpoints through mcp_tools.graphql.
+GITHUB_BACKEND   = os.getenv("GITHUB_BACKEND", "rest").lower()
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+_host_requests: Counter = Counter()
+# aiohttp sessions are bound to the loop that created them: keep one per loop.
+_async_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+# ETag / Last-Modified revalidation cache for GET requests.
+response_cache = ResponseCache.from_env()
+# Per-bucket pacing, queueing and retry policy shared by every client.
+rate_limiter = RateLimiter.from_env()
+# Concurrent identical GETs (threads or event loops) share one HTTP exchange.
+coalescer = SingleFlight.from_env()
+
+# A request builder returns (method, path, github_request keyword options).
+RequestSpec = Tuple[str, str, Dict[str, Any]]
+
+# Callbacks run with the API path of every successful write (see on_mutation).
+# A write may change any listing, so reads already in flight take no new callers.
+_mutation_listeners: List[Callable[[str], None]] = [lambda path: coalescer.forget("")]
+
 
 def _get_token() -> str:
     tok = os.getenv("GITHUB_PERSONAL_ACCESS_TOKEN")
@@ -26,34 +67,440 @@ def _headers() -> Dict[str, str]:
         **API_VERSION_HDR,
     }
 
+def _count_request(url: str) -> None:
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    with _session_lock:
+        _host_requests[f"{parts.hostname}:{port}"] += 1
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use.
+
+    ``pool_block`` makes threads wait for a free socket instead of opening
+    throw-away connections once ``POOL_MAXSIZE`` are busy.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS,
+                                      pool_maxsize=POOL_MAXSIZE,
+                                      pool_block=True)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.headers["Connection"] = "keep-alive" if KEEP_ALIVE else "close"
+                _session = s
+    return _session
+
+def close_session() -> None:
+    """Drop the pooled session (open sockets are closed)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _host_requests.clear()
+
+def get_async_session():
+    """Return the aiohttp session of the running event loop (own socket pool)."""
+    import aiohttp  # only needed by async callers
+
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=POOL_MAXSIZE * POOL_CONNECTIONS,
+                                         limit_per_host=POOL_MAXSIZE,
+                                         force_close=not KEEP_ALIVE)
+        session = aiohttp.ClientSession(connector=connector,
+                                        timeout=aiohttp.ClientTimeout(total=TIMEOUT))
+        _async_sessions[loop] = session
+    return session
+
+async def close_async_session() -> None:
+    """Close the running loop's aiohttp session, if any."""
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    """Per-host pool counters: requests sent, sockets opened, idle sockets."""
+    with _session_lock:
+        counts = dict(_host_requests)
+    stats: Dict[str, Dict[str, int]] = {
+        host: {"requests": n, "connections": 0, "idle": 0, "maxsize": POOL_MAXSIZE}
+        for host, n in counts.items()
+    }
+    if _session is None:
+        return stats
+    adapter = _session.get_adapter(GITHUB_API_BASE)
+    pools = adapter.poolmanager.pools
+    for key in pools.keys():
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        host = f"{pool.host}:{pool.port}" if pool.port else pool.host
+        entry = stats.setdefault(host, {"requests": 0, "connections": 0,
+                                        "idle": 0, "maxsize": POOL_MAXSIZE})
+        entry["connections"] = pool.num_connections
+        # the queue is pre-filled with None placeholders for unopened slots
+        entry["idle"] = sum(c is not None for c in list(pool.pool.queue)) if pool.pool else 0
+    return stats
+
+def _revalidate(method: str, path: str, params: Dict[str, Any] | None,
+                headers: Dict[str, str]) -> Tuple[str | None, CacheEntry | None]:
+    """Attach the validators of a cached GET; return its cache key and entry."""
+    if method != "GET" or not response_cache.enabled:
+        return None, None
+    key = response_cache.key(_get_token(), path, params)
+    entry = response_cache.get(key)
+    if entry is not None:
+        if entry.etag:          headers["If-None-Match"]     = entry.etag
+        if entry.last_modified: headers["If-Modified-Since"] = entry.last_modified
+    return key, entry
+
+def _cache_state(status: int, key: str | None, entry: CacheEntry | None) -> str:
+    """Response-cache outcome of one exchange, for tracing."""
+    if key is None:
+        return "bypass"
+    return "revalidated" if status == 304 and entry is not None else "miss"
+
+def _decode(status: int, resp_headers, text: str,
+            key: str | None, entry: CacheEntry | None) -> Any:
+    """Body of a (non-error) response; 304s are answered from the cache."""
+    if status == 304 and entry is not None:
+        response_cache.record(hit=True)
+        return loads(entry.body)
+    if key is not None:
+        response_cache.record(hit=False)
+        etag, modified = resp_headers.get("ETag"), resp_headers.get("Last-Modified")
+        if text and (etag or modified):
+            response_cache.put(key, CacheEntry(etag, modified, text))
+    return loads(text) if text else {"status_code": status}
+
+def on_mutation(callback: Callable[[str], None]) -> None:
+    """Call ``callback(path)`` whenever a GitHub resource under ``path`` changes."""
+    _mutation_listeners.append(callback)
+
+def notify_mutation(path: str) -> None:
+    for callback in list(_mutation_listeners):
+        callback(path)
+
+# New blobs, trees, commits and tag objects change nothing until a ref points
+# at them: a multi-file commit notifies once, for its ref update.
+_GIT_OBJECT = re.compile(r"^/repos/[^/]+/[^/]+/git/(?:blobs|trees|commits|tags)$")
+
+def _after_write(method: str, path: str) -> None:
+    # GraphQL reads are POSTs too; this client sends no GraphQL mutations.
+    if method != "GET" and path != "/graphql" and not (method == "POST" and _GIT_OBJECT.match(path)):
+        notify_mutation(path)
+
+def rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """Remaining budget, waits and retries per rate-limit bucket."""
+    return rate_limiter.stats()
+
+def coalesce_stats() -> Dict[str, Any]:
+    """Single-flight counters: leaders, coalesced callers, coalescing rate."""
+    return coalescer.stats()
+
+def _send(method: str, path: str, params: Dict[str, Any] | None,
+          json: Dict[str, Any] | None) -> Tuple[Any, Mapping[str, str]]:
+    """One request through the pool, limiter and cache: (decoded body, headers).
+
+    Identical GETs in flight at the same time share one exchange and result.
+    """
+    if method == "GET" and coalescer.enabled:
+        return coalescer.do(response_cache.key(_get_token(), path, params),
+                            lambda: _exchange(method, path, params, json))
+    return _exchange(method, path, params, json)
+
+def _exchange(method: str, path: str, params: Dict[str, Any] | None,
+              json: Dict[str, Any] | None) -> Tuple[Any, Mapping[str, str]]:
+    url = f"{GITHUB_API_BASE}{path}"
+    headers = _headers()
+    key, entry = _revalidate(method, path, params, headers)
+    bucket = rate_limiter.bucket_for(path)
+    attempt = 0
+    with tracing.span("http", method=method, path=path) as span:
+        while True:
+            wait = rate_limiter.reserve_slot(bucket)
+            span.add("wait_ms", round(wait * 1000, 1))
+            time.sleep(wait)
+            _count_request(url)
+            resp = get_session().request(
+                method, url, headers=headers,
+                params=params, json=json, timeout=TIMEOUT
+            )
+            rate_limiter.update(bucket, resp.headers)
+            delay = None if resp.ok else rate_limiter.retry_delay(
+                bucket, method, attempt, resp.status_code, resp.headers, resp.text)
+            if delay is None:
+                break
+            span.add("wait_ms", round(delay * 1000, 1))
+            time.sleep(delay)
+            attempt += 1
+        span.set(status=resp.status_code, attempts=attempt + 1, bytes=len(resp.content),
+                 cache=_cache_state(resp.status_code, key, entry))
+        if resp.status_code != 304:
+            resp.raise_for_status()
+        _after_write(method, path)
+        return _decode(resp.status_code, resp.headers, resp.text, key, entry), resp.headers
+
+def render_output(res: Any, fields: projection.Fields | None, tool: str | None) -> str:
+    """Project ``res`` to ``fields`` and serialize it for the LLM."""
+    with tracing.span("json.render", tool=tool) as span:
+        out = projection.project(res, fields)
+        text = (dumps(out, separators=(",", ":"), ensure_ascii=False) if COMPACT_JSON
+                else dumps(out, indent=2))
+        span.set(bytes=len(text))
+    if tool and PROJECTION_STATS:
+        projection.record(tool, res, text)
+    return text
+
+def github_stream(path: str, params: Dict[str, Any] | None = None) -> requests.Response:
+    """GET ``path`` as a streamed response (archives, raw downloads).
+
+    The request is paced by the rate limiter like any other; the caller
+    must close the response.
+    """
+    url = f"{GITHUB_API_BASE}{path}"
+    time.sleep(rate_limiter.reserve_slot(rate_limiter.bucket_for(path)))
+    _count_request(url)
+    resp = get_session().get(url, headers=_headers(), params=params,
+                             stream=True, timeout=TIMEOUT)
+    rate_limiter.update(rate_limiter.bucket_for(path), resp.headers)
+    resp.raise_for_status()
+    return resp
+
+def github_json(method: str, path: str, *,
+                params: Dict[str, Any] | None = None,
+                json:   Dict[str, Any] | None = None) -> Any:
+    """Decoded response body, for helpers that post-process GitHub payloads."""
+    return _send(method, path, params, json)[0]
+
+async def async_github_json(method: str, path: str, *,
+                            params: Dict[str, Any] | None = None,
+                            json:   Dict[str, Any] | None = None) -> Any:
+    return (await _asend(method, path, params, json))[0]
+
+def _graphql_route(method: str, path: str, params: Dict[str, Any] | None):
+    if GITHUB_BACKEND != "graphql" or method != "GET":
+        return None
+    from mcp_tools import graphql  # imports this module
+    return graphql.rest_route(path, params)
+
 def github_request(method: str, path: str, *,
                    params: Dict[str, Any] | None = None,
-                   json:   Dict[str, Any] | None = None) -> Any:
+                   json:   Dict[str, Any] | None = None,
+                   all_pages: bool = False,
+                   max_items: int | None = None,
+                   fields: projection.Fields | None = None,
+                   tool: str | None = None) -> Any:
+    with tracing.span("github.request", method=method, path=path, tool=tool) as span:
+        route = None if all_pages else _graphql_route(method, path, params)
+        if all_pages:
+            res = list(paginate(path, params, max_items=max_items))
+        elif route is not None:
+            from mcp_tools.graphql import graphql_request
+            query, variables, to_rest = route
+            res = to_rest(graphql_request(query, variables))
+        else:
+            res, _ = _send(method, path, params, json)
+        text = render_output(res, fields, tool)
+        span.set(backend="graphql" if route else "rest", output_bytes=len(text))
+        return text
+
+async def _asend(method: str, path: str, params: Dict[str, Any] | None,
+                 json: Dict[str, Any] | None) -> Tuple[Any, Mapping[str, str]]:
+    """Async twin of :func:`_send`."""
+    if method == "GET" and coalescer.enabled:
+        return await coalescer.ado(response_cache.key(_get_token(), path, params),
+                                   lambda: _aexchange(method, path, params, json))
+    return await _aexchange(method, path, params, json)
+
+async def _aexchange(method: str, path: str, params: Dict[str, Any] | None,
+                     json: Dict[str, Any] | None) -> Tuple[Any, Mapping[str, str]]:
     url = f"{GITHUB_API_BASE}{path}"
-    resp = requests.request(
-        method, url, headers=_headers(),
-        params=params, json=json, timeout=TIMEOUT
-    )
-    resp.raise_for_status()
-    res = resp.json() if resp.content else {"status_code": resp.status_code}
-    return dumps(res, indent=2)
+    headers = _headers()
+    key, entry = _revalidate(method, path, params, headers)
+    bucket = rate_limiter.bucket_for(path)
+    attempt = 0
+    with tracing.span("http", method=method, path=path) as span:
+        while True:
+            wait = rate_limiter.reserve_slot(bucket)
+            span.add("wait_ms", round(wait * 1000, 1))
+            await asyncio.sleep(wait)
+            _count_request(url)
+            async with get_async_session().request(
+                method, url, headers=headers, params=params, json=json
+            ) as resp:
+                text = await resp.text()
+            rate_limiter.update(bucket, resp.headers)
+            delay = None if resp.ok else rate_limiter.retry_delay(
+                bucket, method, attempt, resp.status, resp.headers, text)
+            if delay is None:
+                break
+            span.add("wait_ms", round(delay * 1000, 1))
+            await asyncio.sleep(delay)
+            attempt += 1
+        span.set(status=resp.status, attempts=attempt + 1, bytes=len(text),
+                 cache=_cache_state(resp.status, key, entry))
+        if resp.status != 304:
+            resp.raise_for_status()
+        _after_write(method, path)
+        return _decode(resp.status, resp.headers, text, key, entry), resp.headers
+
+async def async_github_request(method: str, path: str, *,
+                               params: Dict[str, Any] | None = None,
+                               json:   Dict[str, Any] | None = None,
+                               all_pages: bool = False,
+                               max_items: int | None = None,
+                               fields: projection.Fields | None = None,
+                               tool: str | None = None) -> Any:
+    """Non-blocking twin of :func:`github_request` (same arguments and output)."""
+    with tracing.span("github.request", method=method, path=path, tool=tool) as span:
+        route = None if all_pages else _graphql_route(method, path, params)
+        if all_pages:
+            res = [item async for item in apaginate(path, params, max_items=max_items)]
+        elif route is not None:
+            from mcp_tools.graphql import async_graphql_request
+            query, variables, to_rest = route
+            res = to_rest(await async_graphql_request(query, variables))
+        else:
+            res, _ = await _asend(method, path, params, json)
+        text = render_output(res, fields, tool)
+        span.set(backend="graphql" if route else "rest", output_bytes=len(text))
+        return text
 
-def put_file(owner: str, repo: str, path: str, message: str, content: str,
-             *, branch: str | None = None, sha: str | None = None):
+# ---------------------------------------------------------------------- #
+# Pagination
+# ---------------------------------------------------------------------- #
+_LINK_NEXT = re.compile(r'<([^>]+)>\s*;\s*rel="next"')
+
+def _next_page(headers: Mapping[str, str]) -> Tuple[str, Dict[str, str]] | None:
+    """(path, params) of the ``Link: rel="next"`` target, if any."""
+    m = _LINK_NEXT.search(headers.get("Link", ""))
+    if not m:
+        return None
+    parts = urlsplit(m.group(1))
+    base_path = urlsplit(GITHUB_API_BASE).path.rstrip("/")
+    path = parts.path[len(base_path):] if parts.path.startswith(base_path) else parts.path
+    return path, dict(parse_qsl(parts.query))
+
+def _page_items(data: Any) -> List[Any]:
+    """List payload of a page: plain lists, or the ``items`` of search results."""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        if isinstance(data.get("items"), list):
+            return data["items"]
+        lists = [v for v in data.values() if isinstance(v, list)]
+        if len(lists) == 1:
+            return lists[0]
+    return [data]
+
+def _first_page_params(params: Dict[str, Any] | None,
+                       max_items: int | None) -> Dict[str, Any]:
+    params = {"per_page": 100, **{k: v for k, v in (params or {}).items() if v is not None}}
+    if max_items:
+        params["per_page"] = min(int(params["per_page"]), max_items)
+    return params
+
+def paginate(path: str, params: Dict[str, Any] | None = None, *,
+             max_items: int | None = None,
+             prefetch: bool = PREFETCH_PAGES) -> Iterator[Any]:
+    """Lazily yield every item of a list/search endpoint.
+
+    Pages are fetched by following ``Link: rel="next"``; nothing beyond
+    ``max_items`` is requested.  With ``prefetch`` the next page is already
+    in flight on a helper thread while the current one is being consumed.
+    """
+    pool = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    yielded = 0
+    try:
+        data, headers = _send("GET", path, _first_page_params(params, max_items), None)
+        while True:
+            items = _page_items(data)
+            nxt = _next_page(headers)
+            if max_items and yielded + len(items) >= max_items:
+                nxt = None
+            pending = (pool.submit(contextvars.copy_context().run, _send, "GET", *nxt, None)
+                       if nxt and pool else None)   # copied context: spans keep their parent
+            for item in items:
+                yield item
+                yielded += 1
+                if max_items and yielded >= max_items:
+                    return
+            if not nxt:
+                return
+            data, headers = pending.result() if pending else _send("GET", *nxt, None)
+    finally:
+        if pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+async def apaginate(path: str, params: Dict[str, Any] | None = None, *,
+                    max_items: int | None = None,
+                    prefetch: bool = PREFETCH_PAGES) -> AsyncIterator[Any]:
+    """Async twin of :func:`paginate`; prefetching runs as a task on the loop."""
+    yielded, pending = 0, None
+    try:
+        data, headers = await _asend("GET", path, _first_page_params(params, max_items), None)
+        while True:
+            items = _page_items(data)
+            nxt = _next_page(headers)
+            if max_items and yielded + len(items) >= max_items:
+                nxt = None
+            pending = asyncio.ensure_future(_asend("GET", *nxt, None)) if nxt and prefetch else None
+            for item in items:
+                yield item
+                yielded += 1
+                if max_items and yielded >= max_items:
+                    return
+            if not nxt:
+                return
+            data, headers = await pending if pending else await _asend("GET", *nxt, None)
+            pending = None
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+def sync_and_async(build: Callable[..., RequestSpec], *, tool: str | None = None
+                   ) -> Tuple[Callable[..., Any], Callable[..., Awaitable[Any]]]:
+    """Turn a request builder into matching sync / async callables.
+
+    Both keep ``build``'s signature and docstring, so ``FunctionTool`` infers
+    the same schema for ``fn`` and ``async_fn``.  ``tool`` labels the
+    projection statistics.
+    """
+    @wraps(build)
+    def fn(*args, **kwargs):
+        method, path, opts = build(*args, **kwargs)
+        return github_request(method, path, tool=tool, **opts)
+
+    @wraps(build)
+    async def afn(*args, **kwargs):
+        method, path, opts = build(*args, **kwargs)
+        return await async_github_request(method, path, tool=tool, **opts)
+
+    return fn, afn
+
+def put_file_spec(owner: str, repo: str, path: str, message: str, content: str,
+                  *, branch: str | None = None, sha: str | None = None) -> RequestSpec:
     """Create / update one file via the Contents API."""
     b64 = base64.b64encode(content.encode()).decode()
     body: Dict[str, Any] = {"message": message, "content": b64}
     if branch: body["branch"] = branch
     if sha:    body["sha"]    = sha
-    return github_request("PUT",
-                          f"/repos/{owner}/{repo}/contents/{path}",
-                          json=body)
+    return ("PUT", f"/repos/{owner}/{repo}/contents/{path}",
+            {"json": body, "fields": projection.FILE_WRITE})
 
-def delete_file(owner: str, repo: str, path: str, message: str, sha: str,
-                *, branch: str | None = None):
+def delete_file_spec(owner: str, repo: str, path: str, message: str, sha: str,
+                     *, branch: str | None = None) -> RequestSpec:
     """Delete one file via the Contents API."""
     body: Dict[str, Any] = {"message": message, "sha": sha}
     if branch: body["branch"] = branch
-    return github_request("DELETE",
-                          f"/repos/{owner}/{repo}/contents/{path}",
-                          json=body)
+    return ("DELETE", f"/repos/{owner}/{repo}/contents/{path}",
+            {"json": body, "fields": projection.FILE_WRITE})
+
+put_file, async_put_file = sync_and_async(put_file_spec)
+delete_file, async_delete_file = sync_and_async(delete_file_spec)
@@ -0,0 +1,201 @@
+"""Planner/executor dispatch of specialist agents.
+
+The master agent can hand over a whole plan instead of delegating one step at
+a time.  A plan is a list of sub-tasks forming a dependency graph::
+
+    [{"id": "repos",  "agent": "user",  "input": "List my repositories"},
+     {"id": "issues", "agent": "issue", "input": "List open issues in Final-Project"},
+     {"id": "file",   "agent": "repository", "depends_on": ["repos"],
+      "input": "Show the README of the most recently updated repo in {repos}"}]
+
+Every task whose dependencies are done starts immediately, so independent
+tasks run concurrently (threads for ``run_plan``, the event loop for
+``arun_plan``).  ``{id}`` in an input is replaced by that dependency's result;
+other dependency results are appended as context.  Agents keep chat memory, so
+tasks for the same agent are serialized by a per-agent lock.  Results come
+back in plan order.  ``AGENT_MAX_PARALLEL`` caps the concurrent tasks.
+Answers stream into the caller's token sink, if any (``mcp_tools.streaming``).
+"""
+
+from __future__ import annotations
+
+import asyncio, contextvars, os, threading, time, weakref
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from json import loads
+from typing import Any, Dict, List, Mapping
+
+from mcp_tools import function_calling, streaming, tracing
+
+MAX_PARALLEL = int(os.getenv("AGENT_MAX_PARALLEL", "4"))
+
+Task = Dict[str, Any]     # {"id", "agent", "input", "depends_on"}
+
+# Per-agent locks, and per event loop for asyncio; weak keys, so an entry goes
+# with its agent (or loop) and a recycled id() never finds a stale lock.
+_locks: "weakref.WeakKeyDictionary[Any, threading.Lock]" = weakref.WeakKeyDictionary()
+_alocks: "weakref.WeakKeyDictionary[Any, weakref.WeakKeyDictionary]" = weakref.WeakKeyDictionary()
+_locks_guard = threading.Lock()
+
+
+def parse_plan(plan: Any, agents: Mapping[str, Any]) -> List[Task]:
+    """Validate ``plan`` (JSON string or list) into tasks in dependency order."""
+    if isinstance(plan, str):
+        plan = loads(plan)
+    if isinstance(plan, dict):
+        plan = plan.get("tasks", [])
+    if not isinstance(plan, list) or not plan:
+        raise ValueError("plan must be a non-empty list of tasks")
+    tasks: List[Task] = []
+    for i, raw in enumerate(plan):
+        task = dict(raw if isinstance(raw, dict) else raw.model_dump())
+        task["id"] = str(task.get("id") or f"t{i + 1}")
+        task["agent"] = str(task.get("agent", "")).lower().removesuffix("_agent")
+        if task["agent"] == "repo":
+            task["agent"] = "repository"
+        if task["agent"] not in agents:
+            raise ValueError(f"task {task['id']}: unknown agent {task['agent']!r} "
+                             f"(expected one of {', '.join(agents)})")
+        if not task.get("input"):
+            raise ValueError(f"task {task['id']}: input required")
+        deps = task.get("depends_on") or []
+        task["depends_on"] = [d.strip() for d in deps.split(",")] if isinstance(deps, str) else list(deps)
+        tasks.append(task)
+    ids = [t["id"] for t in tasks]
+    if len(set(ids)) != len(ids):
+        raise ValueError("task ids must be unique")
+    for t in tasks:
+        missing = set(t["depends_on"]) - set(ids)
+        if missing:
+            raise ValueError(f"task {t['id']}: unknown dependencies {sorted(missing)}")
+    _check_acyclic(tasks)
+    return tasks
+
+
+def _check_acyclic(tasks: List[Task]) -> None:
+    pending = {t["id"]: set(t["depends_on"]) for t in tasks}
+    while pending:
+        ready = [i for i, deps in pending.items() if not deps & pending.keys()]
+        if not ready:
+            raise ValueError(f"dependency cycle between {sorted(pending)}")
+        for i in ready:
+            del pending[i]
+
+
+def render_input(task: Task, results: Mapping[str, Dict[str, Any]]) -> str:
+    """Task input with dependency results substituted or appended."""
+    text = task["input"]
+    context = []
+    for dep in task["depends_on"]:
+        value = results[dep].get("result", "")
+        if "{" + dep + "}" in text:
+            text = text.replace("{" + dep + "}", value)
+        else:
+            context.append(f"[{dep}] {value}")
+    if context:
+        text += "\n\nResults of earlier steps:\n" + "\n".join(context)
+    return text
+
+
+def _blocked(task: Task, results: Mapping[str, Dict[str, Any]]) -> str | None:
+    failed = [d for d in task["depends_on"] if "error" in results[d]]
+    return f"skipped: dependency {', '.join(failed)} failed" if failed else None
+
+
+def _merge(tasks: List[Task], results: Dict[str, Dict[str, Any]], started: float) -> Dict[str, Any]:
+    busy = sum(r.get("seconds", 0.0) for r in results.values())
+    wall = time.perf_counter() - started
+    return {"results": [{"id": t["id"], "agent": t["agent"], **results[t["id"]]} for t in tasks],
+            "wall_seconds": round(wall, 3), "sequential_seconds": round(busy, 3)}
+
+
+def _lock(agent: Any) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(agent, threading.Lock())
+
+
+def _alock(agent: Any) -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    with _locks_guard:
+        per_loop = _alocks.setdefault(loop, weakref.WeakKeyDictionary())
+        return per_loop.setdefault(agent, asyncio.Lock())
+
+
+def _run_one(agent: Any, text: str, name: str) -> Dict[str, Any]:
+    with _lock(agent), tracing.span("agent.chat", agent=name, input_chars=len(text)), \
+            function_calling.observe(agent):
+        start = time.perf_counter()
+        try:
+            out = {"result": streaming.chat(agent, text, name)}
+        except Exception as e:
+            out = {"error": f"{type(e).__name__}: {e}"}
+        out["seconds"] = round(time.perf_counter() - start, 3)
+    return out
+
+
+async def _arun_one(agent: Any, text: str, name: str) -> Dict[str, Any]:
+    async with _alock(agent):
+        with tracing.span("agent.chat", agent=name, input_chars=len(text)), \
+                function_calling.observe(agent):
+            start = time.perf_counter()
+            try:
+                out = {"result": await streaming.achat(agent, text, name)}
+            except Exception as e:
+                out = {"error": f"{type(e).__name__}: {e}"}
+            out["seconds"] = round(time.perf_counter() - start, 3)
+    return out
+
+
+def run_plan(plan: Any, agents: Mapping[str, Any], max_parallel: int = MAX_PARALLEL) -> Dict[str, Any]:
+    """Execute ``plan`` on a thread pool; returns results in plan order."""
+    tasks = parse_plan(plan, agents)
+    started = time.perf_counter()
+    results: Dict[str, Dict[str, Any]] = {}
+    running: Dict[Future, str] = {}
+    waiting = list(tasks)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, len(tasks)))) as pool:
+        while waiting or running:
+            for task in [t for t in waiting if set(t["depends_on"]) <= results.keys()]:
+                waiting.remove(task)
+                skipped = _blocked(task, results)
+                if skipped:
+                    results[task["id"]] = {"error": skipped}
+                    continue
+                fut = pool.submit(contextvars.copy_context().run, _run_one,   # keeps the trace parent
+                                  agents[task["agent"]], render_input(task, results), task["agent"])
+                running[fut] = task["id"]
+            if not running:
+                continue                     # skips may have unblocked more tasks
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                results[running.pop(fut)] = fut.result()
+    return _merge(tasks, results, started)
+
+
+async def arun_plan(plan: Any, agents: Mapping[str, Any],
+                    max_parallel: int = MAX_PARALLEL) -> Dict[str, Any]:
+    """Event-loop twin of :func:`run_plan` (uses ``agent.achat``)."""
+    tasks = parse_plan(plan, agents)
+    started = time.perf_counter()
+    limit = asyncio.Semaphore(max(1, max_parallel))
+    results: Dict[str, Dict[str, Any]] = {}
+    running: Dict[asyncio.Task, str] = {}
+    waiting = list(tasks)
+
+    async def one(task: Task) -> Dict[str, Any]:
+        async with limit:
+            return await _arun_one(agents[task["agent"]], render_input(task, results), task["agent"])
+
+    while waiting or running:
+        for task in [t for t in waiting if set(t["depends_on"]) <= results.keys()]:
+            waiting.remove(task)
+            skipped = _blocked(task, results)
+            if skipped:
+                results[task["id"]] = {"error": skipped}
+                continue
+            running[asyncio.ensure_future(one(task))] = task["id"]
+        if not running:
+            continue
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for fut in done:
+            results[running.pop(fut)] = fut.result()
+    return _merge(tasks, results, started)
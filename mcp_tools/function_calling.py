@@ -0,0 +1,227 @@
+"""Function-calling specialists that run one turn's tool calls in parallel.
+
+A ReAct specialist parses a single ``Action`` per LLM call, so fetching
+three issues costs three round trips.  With ``AGENT_SPECIALIST_MODE=function``
+the specialists are llama_index function-calling agents instead: the model
+may ask for several tools in one response, the worker runs those calls
+concurrently (a thread pool of up to ``AGENT_TOOL_PARALLEL`` for ``chat``,
+the event loop for ``achat``) and hands every result back, in call order, with
+the next request.  Order is kept so that identical turns build identical
+prompts (the LLM response cache keys on them).
+
+The upstream worker cannot stream; here a streamed turn runs like ``chat``
+and the answer reaches the token sink in one piece.
+
+:func:`observe` wraps a specialist turn in either mode and :func:`stats`
+reports, per mode, LLM iterations, tool calls and latency per turn, plus how
+often calls were batched and the tool time saved by running them together.
+llama_index is imported on first use (:func:`worker_class`).  The worker
+reuses ``FunctionCallingAgentWorker._call_function``/``_acall_function``,
+which are not public API; ``requirement.txt`` pins llama-index-core to the
+0.12 series it was written against.
+"""
+
+from __future__ import annotations
+
+import asyncio, contextvars, functools, itertools, os, threading, time, uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Tuple
+
+from mcp_tools import tracing
+
+MAX_PARALLEL = int(os.getenv("AGENT_TOOL_PARALLEL", "8"))
+MAX_CALLS    = int(os.getenv("AGENT_MAX_FUNCTION_CALLS", "10"))     # tool calls per turn
+
+_turns: Dict[str, Dict[str, Any]] = {}
+_batches = {"llm_turns": 0, "tool_calls": 0, "parallel": 0, "max_calls": 0,
+            "tool_ms": 0.0, "wall_ms": 0.0}
+_lock = threading.Lock()
+
+
+class _Outbox(list):
+    """Collects the messages of one tool call (``memory.put`` duck type)."""
+    put = list.append
+
+
+@functools.lru_cache(maxsize=None)
+def worker_class() -> type:
+    """``FunctionCallingAgentWorker`` that runs parallel tool calls concurrently."""
+    from llama_index.core.agent import FunctionCallingAgentWorker
+    from llama_index.core.agent.types import TaskStepOutput
+    from llama_index.core.agent.utils import add_user_step_to_memory
+    from llama_index.core.chat_engine.types import AgentChatResponse
+
+    class ParallelFunctionCallingWorker(FunctionCallingAgentWorker):
+        mode = "function"
+
+        def _begin(self, step: Any, task: Any) -> List[Any]:
+            if step.input is not None:
+                add_user_step_to_memory(step, task.extra_state["new_memory"], verbose=self._verbose)
+            return self.get_tools(task.input)
+
+        def _tool_calls(self, task: Any, response: Any) -> List[Any]:
+            if task.extra_state["n_function_calls"] >= self._max_function_calls:
+                return []
+            return self._llm.get_tool_calls_from_response(response, error_on_no_tool_call=False)
+
+        def _one(self, tools: List[Any], call: Any) -> Tuple[_Outbox, List[Any], bool, float]:
+            outbox, outputs = _Outbox(), []
+            start = time.perf_counter()
+            direct = self._call_function(tools, call, outbox, outputs, verbose=self._verbose)
+            return outbox, outputs, direct, time.perf_counter() - start
+
+        async def _aone(self, tools: List[Any], call: Any) -> Tuple[_Outbox, List[Any], bool, float]:
+            outbox, outputs = _Outbox(), []
+            start = time.perf_counter()
+            direct = await self._acall_function(tools, call, outbox, outputs, verbose=self._verbose)
+            return outbox, outputs, direct, time.perf_counter() - start
+
+        def _finish(self, step: Any, task: Any, response: Any, results: List[Tuple],
+                    wall: float) -> Any:
+            memory = task.extra_state["new_memory"]
+            memory.put(response.message)
+            outputs: List[Any] = []
+            for outbox, outs, _, _ in results:          # joined in call order
+                for message in outbox:
+                    memory.put(message)
+                outputs.extend(outs)
+            task.extra_state["sources"].extend(outputs)
+            task.extra_state["n_function_calls"] += len(results)
+            answer = response.message.content or ""
+            is_done = not results
+            if len(results) == 1 and results[0][2]:     # return_direct tool
+                is_done, answer = True, str(outputs[-1].content)
+            _record_batch(len(results), sum(r[3] for r in results), wall)
+            return TaskStepOutput(
+                output=AgentChatResponse(response=answer, sources=outputs),
+                task_step=step,
+                is_last=is_done,
+                next_steps=[] if is_done else [step.get_next_step(step_id=str(uuid.uuid4()), input=None)],
+            )
+
+        def run_step(self, step: Any, task: Any, **kwargs: Any) -> Any:
+            tools = self._begin(step, task)
+            response = self._llm.chat_with_tools(
+                tools=tools, user_msg=None, chat_history=self.get_all_messages(task),
+                verbose=self._verbose, allow_parallel_tool_calls=self.allow_parallel_tool_calls)
+            calls = self._tool_calls(task, response)
+            start = time.perf_counter()
+            if len(calls) > 1:
+                with tracing.span("tool.batch", calls=len(calls)), \
+                        ThreadPoolExecutor(max_workers=max(1, min(MAX_PARALLEL, len(calls)))) as pool:
+                    futures = [pool.submit(contextvars.copy_context().run, self._one, tools, c)
+                               for c in calls]
+                    results = [f.result() for f in futures]
+            else:
+                results = [self._one(tools, c) for c in calls]
+            return self._finish(step, task, response, results, time.perf_counter() - start)
+
+        async def arun_step(self, step: Any, task: Any, **kwargs: Any) -> Any:
+            tools = self._begin(step, task)
+            response = await self._llm.achat_with_tools(
+                tools=tools, user_msg=None, chat_history=self.get_all_messages(task),
+                verbose=self._verbose, allow_parallel_tool_calls=self.allow_parallel_tool_calls)
+            calls = self._tool_calls(task, response)
+            start = time.perf_counter()
+            limit = asyncio.Semaphore(max(1, MAX_PARALLEL))
+
+            async def one(call: Any) -> Tuple:
+                async with limit:
+                    return await self._aone(tools, call)
+
+            with tracing.span("tool.batch", calls=len(calls)):
+                results = list(await asyncio.gather(*(one(c) for c in calls)))
+            return self._finish(step, task, response, results, time.perf_counter() - start)
+
+        # Streamed turns run whole; the runner accepts a "dummy stream" answer.
+        def stream_step(self, step: Any, task: Any, **kwargs: Any) -> Any:
+            out = self.run_step(step, task, **kwargs)
+            out.output.is_dummy_stream = True
+            return out
+
+        async def astream_step(self, step: Any, task: Any, **kwargs: Any) -> Any:
+            out = await self.arun_step(step, task, **kwargs)
+            out.output.is_dummy_stream = True
+            return out
+
+    return ParallelFunctionCallingWorker
+
+
+def build_agent(tools: List[Any], llm: Any, *, system_prompt: str, memory: Any = None,
+                verbose: bool = True) -> Any:
+    """A function-calling agent over ``tools`` using the parallel worker."""
+    from llama_index.core.agent import AgentRunner
+    from llama_index.core.llms import ChatMessage, MessageRole
+
+    worker = worker_class()(
+        tools=tools,
+        llm=llm,
+        prefix_messages=[ChatMessage(role=MessageRole.SYSTEM, content=system_prompt)],
+        verbose=verbose,
+        max_function_calls=MAX_CALLS,
+        allow_parallel_tool_calls=True,
+    )
+    return AgentRunner(worker, memory=memory, llm=llm, verbose=verbose)
+
+
+def mode_of(agent: Any) -> str:
+    return getattr(getattr(agent, "agent_worker", None), "mode", "react")
+
+
+@contextmanager
+def observe(agent: Any) -> Iterator[None]:
+    """Record one turn of ``agent``: LLM iterations, tool calls and latency."""
+    tasks = getattr(getattr(agent, "state", None), "task_dict", {})
+    seen = len(tasks)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        new = list(itertools.islice(tasks.values(), seen, None))
+        iterations = sum(len(t.completed_steps) for t in new)
+        calls = sum(len(t.task.extra_state.get("sources", ())) for t in new)
+        mode = mode_of(agent)
+        tracing.current().set(mode=mode, iterations=iterations, tool_calls=calls)
+        with _lock:
+            agg = _turns.setdefault(mode, {"turns": 0, "iterations": 0, "tool_calls": 0,
+                                           "latency_ms": deque(maxlen=1000)})
+            agg["turns"] += 1
+            agg["iterations"] += iterations
+            agg["tool_calls"] += calls
+            agg["latency_ms"].append(ms)
+
+
+def _record_batch(calls: int, tool_seconds: float, wall_seconds: float) -> None:
+    with _lock:
+        _batches["llm_turns"] += 1
+        _batches["tool_calls"] += calls
+        _batches["parallel"] += calls > 1
+        _batches["max_calls"] = max(_batches["max_calls"], calls)
+        _batches["tool_ms"] += tool_seconds * 1000
+        _batches["wall_ms"] += wall_seconds * 1000
+
+
+def stats() -> Dict[str, Any]:
+    """Per specialist mode: turns, iterations and tool calls per turn, latency."""
+    out: Dict[str, Any] = {}
+    with _lock:
+        for mode, agg in _turns.items():
+            latencies: Deque[float] = agg["latency_ms"]
+            ordered = sorted(latencies)
+            turns = max(agg["turns"], 1)
+            out[mode] = {"turns": agg["turns"],
+                         "iterations_per_turn": round(agg["iterations"] / turns, 2),
+                         "tool_calls_per_turn": round(agg["tool_calls"] / turns, 2),
+                         "latency_ms_p50": round(ordered[len(ordered) // 2], 1) if ordered else None,
+                         "latency_ms_p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1)
+                                           if ordered else None}
+        if _batches["llm_turns"]:
+            b = dict(_batches)
+            out["function_batches"] = {
+                "llm_turns": b["llm_turns"], "parallel": b["parallel"], "max_calls": b["max_calls"],
+                "calls_per_llm_turn": round(b["tool_calls"] / b["llm_turns"], 2),
+                "tool_ms_saved": round(max(b["tool_ms"] - b["wall_ms"], 0.0), 1)}
+    return out
@@ -0,0 +1,392 @@
+"""Git Data API helpers (blobs, trees, commits, refs).
+
+``get_tree`` / ``read_files`` list a whole repository in one recursive tree
+call and then download the selected files concurrently as blobs, or stream
+them out of the tarball when many files are wanted.  Every blob read goes
+through the content-addressed ``BlobStore`` first.
+
+``commit_files`` lands any number of file changes as one commit:
+
+1. resolve the branch head and its tree     ─┐ concurrently
+2. create one blob per changed file          ─┘ (blobs in parallel)
+3. create a tree on top of the base tree
+4. create the commit
+5. fast-forward the branch ref
+
+The number of sequential round trips is constant whatever the file count,
+and the branch either moves to the new commit or stays untouched.  Mutation
+listeners (``common.on_mutation``) hear of the commit once, when the ref
+moves.
+"""
+
+from __future__ import annotations
+
+import asyncio, base64, contextvars, os, tarfile, threading
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from mcp_tools.blobstore import Blob, BlobStore, is_commit_sha
+from mcp_tools.common import async_github_json, github_json, github_stream
+
+BLOB_WORKERS = int(os.getenv("GITHUB_BLOB_WORKERS", "8"))
+
+FileChange = Dict[str, Any]   # {"path", "content" | None, "delete", "mode", "encoding"}
+
+_blob_store: BlobStore | None = None
+_blob_store_ready = False
+_blob_store_lock = threading.Lock()
+
+def get_blob_store() -> BlobStore | None:
+    """The process-wide blob store (``None`` when GITHUB_BLOB_CACHE=0)."""
+    global _blob_store, _blob_store_ready
+    if not _blob_store_ready:
+        with _blob_store_lock:
+            if not _blob_store_ready:
+                _blob_store = BlobStore.from_env()
+                _blob_store_ready = True
+    return _blob_store
+
+
+def normalize_changes(files: Iterable[Dict[str, Any]]) -> List[FileChange]:
+    """Validate tool input; a change without content (or ``delete``) removes the path.
+
+    A path listed twice keeps its last change.
+    """
+    changes: Dict[str, FileChange] = {}
+    for f in files:
+        if hasattr(f, "model_dump"):
+            f = f.model_dump()
+        if not f.get("path"):
+            raise ValueError("every file change needs a 'path'")
+        path = f["path"].lstrip("/")
+        delete = bool(f.get("delete")) or f.get("content") is None
+        changes[path] = {"path": path, "content": f.get("content"),
+                         "delete": delete, "mode": f.get("mode") or "100644",
+                         "encoding": f.get("encoding") or "utf-8"}
+    if not changes:
+        raise ValueError("no file changes given")
+    return list(changes.values())
+
+def _blob_body(change: FileChange) -> Dict[str, Any]:
+    return {"content": change["content"], "encoding": change["encoding"]}
+
+def _tree_entries(changes: List[FileChange], blob_shas: Dict[str, str]) -> List[Dict[str, Any]]:
+    return [{"path": c["path"], "mode": c["mode"], "type": "blob",
+             "sha": None if c["delete"] else blob_shas[c["path"]]}
+            for c in changes]
+
+def _result(branch: str, commit: Dict[str, Any], changes: List[FileChange]) -> Dict[str, Any]:
+    return {"branch": branch,
+            "commit": {"sha": commit["sha"], "html_url": commit.get("html_url")},
+            "updated": [c["path"] for c in changes if not c["delete"]],
+            "deleted": [c["path"] for c in changes if c["delete"]]}
+
+# ---------------------------------------------------------------------- #
+# Sync
+# ---------------------------------------------------------------------- #
+def resolve_head(owner: str, repo: str, branch: str | None) -> Tuple[str, str, str]:
+    """(branch, head commit SHA, head tree SHA); ``None`` means the default branch."""
+    base = f"/repos/{owner}/{repo}"
+    if not branch:
+        branch = github_json("GET", base)["default_branch"]
+    head = github_json("GET", f"{base}/git/ref/heads/{branch}")["object"]["sha"]
+    tree = github_json("GET", f"{base}/git/commits/{head}")["tree"]["sha"]
+    return branch, head, tree
+
+def commit_files(owner: str, repo: str, message: str, files: Iterable[Dict[str, Any]],
+                 *, branch: str | None = None) -> Dict[str, Any]:
+    """Create / update / delete many files in a single commit."""
+    base = f"/repos/{owner}/{repo}"
+    changes = normalize_changes(files)
+    writes = [c for c in changes if not c["delete"]]
+    with ThreadPoolExecutor(max_workers=max(1, min(BLOB_WORKERS, len(writes) + 1))) as pool:
+        # copy_context: the requests' spans stay under the calling tool's span
+        head_future = pool.submit(contextvars.copy_context().run, resolve_head, owner, repo, branch)
+        blob_futures = {c["path"]: pool.submit(contextvars.copy_context().run, github_json,
+                                               "POST", f"{base}/git/blobs", json=_blob_body(c))
+                        for c in writes}
+        blob_shas = {path: f.result()["sha"] for path, f in blob_futures.items()}
+        branch, head, base_tree = head_future.result()
+    tree = github_json("POST", f"{base}/git/trees",
+                       json={"base_tree": base_tree, "tree": _tree_entries(changes, blob_shas)})
+    commit = github_json("POST", f"{base}/git/commits",
+                         json={"message": message, "tree": tree["sha"], "parents": [head]})
+    github_json("PATCH", f"{base}/git/refs/heads/{branch}",
+                json={"sha": commit["sha"], "force": False})
+    return _result(branch, commit, changes)
+
+# ---------------------------------------------------------------------- #
+# Async
+# ---------------------------------------------------------------------- #
+async def async_resolve_head(owner: str, repo: str, branch: str | None) -> Tuple[str, str, str]:
+    base = f"/repos/{owner}/{repo}"
+    if not branch:
+        branch = (await async_github_json("GET", base))["default_branch"]
+    head = (await async_github_json("GET", f"{base}/git/ref/heads/{branch}"))["object"]["sha"]
+    tree = (await async_github_json("GET", f"{base}/git/commits/{head}"))["tree"]["sha"]
+    return branch, head, tree
+
+async def async_commit_files(owner: str, repo: str, message: str,
+                             files: Iterable[Dict[str, Any]],
+                             *, branch: str | None = None) -> Dict[str, Any]:
+    base = f"/repos/{owner}/{repo}"
+    changes = normalize_changes(files)
+    writes = [c for c in changes if not c["delete"]]
+    limit = asyncio.Semaphore(BLOB_WORKERS)
+
+    async def blob(change: FileChange) -> str:
+        async with limit:
+            return (await async_github_json("POST", f"{base}/git/blobs",
+                                            json=_blob_body(change)))["sha"]
+
+    head, *shas = await asyncio.gather(async_resolve_head(owner, repo, branch),
+                                       *(blob(c) for c in writes))
+    branch, head_sha, base_tree = head
+    blob_shas = {c["path"]: sha for c, sha in zip(writes, shas)}
+    tree = await async_github_json(
+        "POST", f"{base}/git/trees",
+        json={"base_tree": base_tree, "tree": _tree_entries(changes, blob_shas)})
+    commit = await async_github_json(
+        "POST", f"{base}/git/commits",
+        json={"message": message, "tree": tree["sha"], "parents": [head_sha]})
+    await async_github_json("PATCH", f"{base}/git/refs/heads/{branch}",
+                            json={"sha": commit["sha"], "force": False})
+    return _result(branch, commit, changes)
+
+# ---------------------------------------------------------------------- #
+# Bulk reads: one recursive tree listing, then blobs or the tarball
+# ---------------------------------------------------------------------- #
+READ_MAX_FILE_BYTES  = int(os.getenv("GITHUB_READ_MAX_FILE_BYTES", str(100 << 10)))
+READ_MAX_TOTAL_BYTES = int(os.getenv("GITHUB_READ_MAX_TOTAL_BYTES", str(1 << 20)))
+# "auto" mode streams the tarball instead of fetching blobs above this many files
+TARBALL_MIN_FILES    = int(os.getenv("GITHUB_TARBALL_MIN_FILES", "40"))
+
+
+def get_tree(owner: str, repo: str, ref: str | None = None) -> Dict[str, Any]:
+    """Whole repository tree in one ``git/trees/{ref}?recursive=1`` call."""
+    return github_json("GET", f"/repos/{owner}/{repo}/git/trees/{ref or 'HEAD'}",
+                       params={"recursive": 1})
+
+async def async_get_tree(owner: str, repo: str, ref: str | None = None) -> Dict[str, Any]:
+    return await async_github_json("GET", f"/repos/{owner}/{repo}/git/trees/{ref or 'HEAD'}",
+                                   params={"recursive": 1})
+
+def patterns_of(pattern: str | Iterable[str] | None) -> List[str]:
+    if not pattern:
+        return ["*"]
+    if isinstance(pattern, str):
+        pattern = pattern.split(",")
+    return [p.strip().lstrip("/") for p in pattern if p.strip()]
+
+def matches(path: str, patterns: List[str]) -> bool:
+    """Glob match; ``*`` also crosses directories, so ``*.py`` finds every Python file."""
+    return any(fnmatch(path, p) for p in patterns)
+
+def select_blobs(tree: Dict[str, Any], pattern: str | Iterable[str] | None = None, *,
+                 max_file_bytes: int = READ_MAX_FILE_BYTES,
+                 max_files: int | None = None) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """Blob entries matching ``pattern`` within the size limit, plus skip reasons."""
+    patterns, selected, skipped = patterns_of(pattern), [], {}
+    for entry in tree.get("tree", []):
+        if entry.get("type") != "blob" or not matches(entry["path"], patterns):
+            continue
+        if entry.get("size", 0) > max_file_bytes:
+            skipped[entry["path"]] = f"larger than {max_file_bytes} bytes"
+        elif max_files is not None and len(selected) >= max_files:
+            skipped[entry["path"]] = f"over the {max_files}-file limit"
+        else:
+            selected.append(entry)
+    return selected, skipped
+
+def decode_text(data: Blob) -> str | None:
+    """UTF-8 text, or ``None`` for binary content (works on mapped blobs too)."""
+    if b"\0" in data[:8000]:
+        return None
+    try:
+        return str(data, "utf-8")
+    except UnicodeDecodeError:
+        return None
+
+def _stored(sha: str) -> Blob | None:
+    store = get_blob_store()
+    return store.get(sha) if store else None
+
+def _store(sha: str, data: bytes) -> None:
+    store = get_blob_store()
+    if store:
+        store.put(sha, data)
+
+def read_blob(owner: str, repo: str, sha: str) -> Blob:
+    """Blob content by SHA – from the blob store when possible."""
+    data = _stored(sha)
+    if data is None:
+        blob = github_json("GET", f"/repos/{owner}/{repo}/git/blobs/{sha}")
+        data = base64.b64decode(blob["content"])
+        _store(sha, data)
+    return data
+
+async def async_read_blob(owner: str, repo: str, sha: str) -> Blob:
+    data = _stored(sha)
+    if data is None:
+        blob = await async_github_json("GET", f"/repos/{owner}/{repo}/git/blobs/{sha}")
+        data = base64.b64decode(blob["content"])
+        _store(sha, data)
+    return data
+
+def _split_stored(entries: List[Dict[str, Any]]
+                  ) -> Tuple[List[Tuple[str, Blob]], List[Dict[str, Any]]]:
+    """(path, content) of entries already in the blob store, and the rest."""
+    hits, missing = [], []
+    for e in entries:
+        data = _stored(e["sha"])
+        if data is None:
+            missing.append(e)
+        else:
+            hits.append((e["path"], data))
+    return hits, missing
+
+def _collect(contents: Iterable[Tuple[str, bytes]], skipped: Dict[str, str],
+             max_total_bytes: int) -> Dict[str, Any]:
+    files, total = {}, 0
+    for path, data in contents:
+        text = decode_text(data)
+        if text is None:
+            skipped[path] = "binary"
+        elif total + len(data) > max_total_bytes:
+            skipped[path] = f"over the {max_total_bytes}-byte total limit"
+        else:
+            files[path] = text
+            total += len(data)
+    return {"files": files, "skipped": skipped}
+
+def read_tarball(owner: str, repo: str, ref: str | None, wanted: List[Dict[str, Any]]
+                 ) -> Iterator[Tuple[str, bytes]]:
+    """Stream-extract the ``wanted`` tree entries from the repository tarball."""
+    shas = {e["path"]: e["sha"] for e in wanted}
+    resp = github_stream(f"/repos/{owner}/{repo}/tarball/{ref or ''}".rstrip("/"))
+    try:
+        with tarfile.open(fileobj=resp.raw, mode="r|gz") as tar:
+            for member in tar:
+                # members are prefixed with "<owner>-<repo>-<sha>/"
+                path = member.name.split("/", 1)[-1]
+                if member.isfile() and path in shas:
+                    data = tar.extractfile(member).read()
+                    _store(shas[path], data)
+                    yield path, data
+    finally:
+        resp.close()
+
+def read_files(owner: str, repo: str, ref: str | None = None,
+               pattern: str | Iterable[str] | None = None, *,
+               mode: str = "auto", max_files: int | None = 50,
+               max_file_bytes: int = READ_MAX_FILE_BYTES,
+               max_total_bytes: int = READ_MAX_TOTAL_BYTES) -> Dict[str, Any]:
+    """Decoded text of every file matching ``pattern`` at ``ref``.
+
+    ``mode`` is ``"blobs"`` (concurrent blob downloads), ``"tarball"`` (one
+    streamed archive) or ``"auto"`` (tarball from ``TARBALL_MIN_FILES`` on).
+    """
+    tree = get_tree(owner, repo, ref)
+    entries, skipped = select_blobs(tree, pattern, max_file_bytes=max_file_bytes,
+                                    max_files=max_files)
+    contents, missing = _split_stored(entries)
+    if not missing:
+        pass
+    elif mode == "tarball" or (mode == "auto" and len(missing) >= TARBALL_MIN_FILES):
+        contents += read_tarball(owner, repo, ref, missing)
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, min(BLOB_WORKERS, len(missing)))) as pool:
+            futures = [pool.submit(contextvars.copy_context().run, read_blob, owner, repo, e["sha"])
+                       for e in missing]
+            contents += zip((e["path"] for e in missing), (f.result() for f in futures))
+    result = _collect(contents, skipped, max_total_bytes)
+    return {"ref": ref or "HEAD", "tree_sha": tree.get("sha"),
+            "truncated": tree.get("truncated", False), **result}
+
+async def async_read_files(owner: str, repo: str, ref: str | None = None,
+                           pattern: str | Iterable[str] | None = None, *,
+                           mode: str = "auto", max_files: int | None = 50,
+                           max_file_bytes: int = READ_MAX_FILE_BYTES,
+                           max_total_bytes: int = READ_MAX_TOTAL_BYTES) -> Dict[str, Any]:
+    tree = await async_get_tree(owner, repo, ref)
+    entries, skipped = select_blobs(tree, pattern, max_file_bytes=max_file_bytes,
+                                    max_files=max_files)
+    contents, missing = _split_stored(entries)
+    if not missing:
+        pass
+    elif mode == "tarball" or (mode == "auto" and len(missing) >= TARBALL_MIN_FILES):
+        # tar extraction is blocking: run the streamed download off the loop
+        contents += await asyncio.to_thread(
+            lambda: list(read_tarball(owner, repo, ref, missing)))
+    else:
+        limit = asyncio.Semaphore(BLOB_WORKERS)
+
+        async def one(entry: Dict[str, Any]) -> Tuple[str, Blob]:
+            async with limit:
+                return entry["path"], await async_read_blob(owner, repo, entry["sha"])
+
+        contents += await asyncio.gather(*(one(e) for e in missing))
+    result = _collect(contents, skipped, max_total_bytes)
+    return {"ref": ref or "HEAD", "tree_sha": tree.get("sha"),
+            "truncated": tree.get("truncated", False), **result}
+
+# ---------------------------------------------------------------------- #
+# Single files (Contents API) backed by the blob store
+# ---------------------------------------------------------------------- #
+_META_FIELDS = ("name", "path", "sha", "size", "type", "html_url")
+
+def _cached_contents(owner: str, repo: str, path: str, ref: str | None) -> Dict[str, Any] | None:
+    """Contents payload served offline: only possible for commit-SHA refs."""
+    store = get_blob_store()
+    if not store or not is_commit_sha(ref):
+        return None
+    meta = store.get_meta(owner, repo, ref, path)
+    data = store.get(meta["sha"]) if meta else None
+    if data is None:
+        return None
+    return {**meta, "encoding": "base64", "content": base64.b64encode(data).decode()}
+
+def _file_sha_needing_blob(payload: Any) -> str | None:
+    """SHA of a file the Contents API returned without content (1–100 MB files)."""
+    if isinstance(payload, dict) and payload.get("type") == "file" \
+            and payload.get("encoding") != "base64":
+        return payload["sha"]
+    return None
+
+def _remember_contents(owner: str, repo: str, path: str, ref: str | None,
+                       payload: Any, data: Blob | None = None) -> Any:
+    if not isinstance(payload, dict) or payload.get("type") != "file":
+        return payload                       # directories, symlinks, submodules
+    if data is None:
+        data = base64.b64decode(payload.get("content") or "")
+        _store(payload["sha"], data)
+    else:
+        payload = {**payload, "encoding": "base64",
+                   "content": base64.b64encode(data).decode()}
+    store = get_blob_store()
+    if store and is_commit_sha(ref):
+        store.put_meta(owner, repo, ref, path, {k: payload.get(k) for k in _META_FIELDS})
+    return payload
+
+def read_file_contents(owner: str, repo: str, path: str, ref: str | None = None) -> Any:
+    """Contents API payload of ``path``, consulting the blob store first."""
+    cached = _cached_contents(owner, repo, path, ref)
+    if cached is not None:
+        return cached
+    payload = github_json("GET", f"/repos/{owner}/{repo}/contents/{path}",
+                          params={"ref": ref} if ref else None)
+    sha = _file_sha_needing_blob(payload)
+    data = read_blob(owner, repo, sha) if sha else None
+    return _remember_contents(owner, repo, path, ref, payload, data)
+
+async def async_read_file_contents(owner: str, repo: str, path: str,
+                                   ref: str | None = None) -> Any:
+    cached = _cached_contents(owner, repo, path, ref)
+    if cached is not None:
+        return cached
+    payload = await async_github_json("GET", f"/repos/{owner}/{repo}/contents/{path}",
+                                      params={"ref": ref} if ref else None)
+    sha = _file_sha_needing_blob(payload)
+    data = await async_read_blob(owner, repo, sha) if sha else None
+    return _remember_contents(owner, repo, path, ref, payload, data)
@@ -0,0 +1,271 @@
+"""GitHub GraphQL (v4) backend.
+
+Two uses:
+
+* ``graphql_request`` / ``async_graphql_request`` – run one query through the
+  shared pool and rate limiter (``graphql`` bucket).
+* ``rest_route`` – with ``GITHUB_BACKEND=graphql`` the read endpoints below
+  are answered by one GraphQL query whose result is reshaped to the REST
+  payload, so tool names and projected outputs stay the same:
+
+  ==============================  ===========================================
+  ``/users/{login}``              ``get_user``
+  ``/users/{login}/repos``        ``list_user_repos`` (public, first page)
+  ``/repos/{o}/{r}/branches``     ``list_branches`` (first page)
+  ``/repos/{o}/{r}/issues``       ``list_issues`` (first page, issues only –
+                                  REST also lists pull requests)
+  ``/repos/{o}/{r}/issues/{n}``   ``get_issue``
+  ==============================  ===========================================
+
+  Explicit ``page`` > 1 and ``allPages`` requests stay on REST.  A missing
+  user, repository or issue (a null node) raises the 404 ``HTTPError`` REST
+  would have raised.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Dict, List, Tuple
+
+from mcp_tools import common
+
+Route = Tuple[str, Dict[str, Any], Callable[[Dict[str, Any]], Any]]
+
+# ---------------------------------------------------------------------- #
+# Transport
+# ---------------------------------------------------------------------- #
+def _data(payload: Dict[str, Any]) -> Dict[str, Any]:
+    errors = payload.get("errors") or []
+    if errors and not payload.get("data"):
+        raise RuntimeError("GitHub GraphQL error: " + "; ".join(e.get("message", "") for e in errors))
+    return payload.get("data") or {}
+
+def graphql_request(query: str, variables: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """Run a GraphQL query and return its ``data`` (partial data is kept)."""
+    payload = common.github_json("POST", "/graphql",
+                                 json={"query": query, "variables": variables or {}})
+    return _data(payload)
+
+async def async_graphql_request(query: str,
+                                variables: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    payload = await common.async_github_json(
+        "POST", "/graphql", json={"query": query, "variables": variables or {}})
+    return _data(payload)
+
+# ---------------------------------------------------------------------- #
+# GraphQL selections and their REST-shaped conversions
+# ---------------------------------------------------------------------- #
+REPO_SELECTION = """
+  name nameWithOwner description isPrivate isFork url updatedAt
+  stargazerCount forkCount
+  defaultBranchRef { name }
+  primaryLanguage { name }
+  openIssues: issues(states: OPEN) { totalCount }
+"""
+BRANCH_SELECTION = "name target { oid } branchProtectionRule { id }"
+ISSUE_FIELDS = """
+  number title body url createdAt updatedAt closedAt
+  author { login }
+  labels(first: 20) { nodes { name } }
+  assignees(first: 10) { nodes { login } }
+  comments { totalCount }
+  milestone { title }
+"""
+# IssueState and PullRequestState are distinct enums, so they need distinct aliases.
+ISSUE_SELECTION = (f"... on Issue {{ state {ISSUE_FIELDS} }}"
+                   f" ... on PullRequest {{ prState: state {ISSUE_FIELDS} }}")
+USER_SELECTION = """
+  login databaseId name company websiteUrl location email bio url createdAt
+  repositories(privacy: PUBLIC, ownerAffiliations: OWNER) { totalCount }
+  followers { totalCount }
+  following { totalCount }
+"""
+
+def repo_to_rest(node: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "name": node["name"],
+        "full_name": node["nameWithOwner"],
+        "description": node.get("description"),
+        "private": node.get("isPrivate"),
+        "fork": node.get("isFork"),
+        "default_branch": (node.get("defaultBranchRef") or {}).get("name"),
+        "language": (node.get("primaryLanguage") or {}).get("name"),
+        "stargazers_count": node.get("stargazerCount"),
+        "forks_count": node.get("forkCount"),
+        "open_issues_count": (node.get("openIssues") or {}).get("totalCount"),
+        "updated_at": node.get("updatedAt"),
+        "html_url": node.get("url"),
+    }
+
+def branch_to_rest(node: Dict[str, Any]) -> Dict[str, Any]:
+    return {"name": node["name"],
+            "commit": {"sha": (node.get("target") or {}).get("oid")},
+            "protected": node.get("branchProtectionRule") is not None}
+
+def issue_to_rest(node: Dict[str, Any]) -> Dict[str, Any]:
+    state = node.get("state") or node.get("prState") or "OPEN"
+    issue = {
+        "number": node["number"],
+        "title": node["title"],
+        "state": "closed" if state == "MERGED" else state.lower(),
+        "user": {"login": (node.get("author") or {}).get("login")},
+        "labels": [{"name": l["name"]} for l in node["labels"]["nodes"]],
+        "assignees": [{"login": a["login"]} for a in node["assignees"]["nodes"]],
+        "comments": node["comments"]["totalCount"],
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+        "closed_at": node.get("closedAt"),
+        "html_url": node.get("url"),
+        "body": node.get("body"),
+        "milestone": node.get("milestone"),
+    }
+    if "/pull/" in (node.get("url") or ""):
+        issue["pull_request"] = {"html_url": node["url"]}
+    return issue
+
+def user_to_rest(node: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "login": node["login"], "id": node.get("databaseId"), "type": "User",
+        "html_url": node.get("url"), "name": node.get("name"),
+        "company": node.get("company"), "blog": node.get("websiteUrl"),
+        "location": node.get("location"), "email": node.get("email"),
+        "bio": node.get("bio"),
+        "public_repos": node["repositories"]["totalCount"],
+        "followers": node["followers"]["totalCount"],
+        "following": node["following"]["totalCount"],
+        "created_at": node.get("createdAt"),
+    }
+
+# ---------------------------------------------------------------------- #
+# REST path -> GraphQL query
+# ---------------------------------------------------------------------- #
+_REPO_SORT = {"created": "CREATED_AT", "updated": "UPDATED_AT",
+              "pushed": "PUSHED_AT", "full_name": "NAME"}
+_AFFILIATIONS = {"owner": "[OWNER]", "member": "[COLLABORATOR, ORGANIZATION_MEMBER]",
+                 "all": "[OWNER, COLLABORATOR, ORGANIZATION_MEMBER]"}
+
+def _first(params: Dict[str, Any]) -> int:
+    return min(int(params.get("per_page") or 30), 100)
+
+def _user(login: str, params: Dict[str, Any]) -> Route:
+    return (f"query($login: String!) {{ user(login: $login) {{ {USER_SELECTION} }} }}",
+            {"login": login}, lambda d: user_to_rest(d["user"]))
+
+def _user_repos(login: str, params: Dict[str, Any]) -> Route:
+    sort = params.get("sort") or "full_name"
+    direction = params.get("direction") or ("asc" if sort == "full_name" else "desc")
+    direction = "DESC" if direction.lower() == "desc" else "ASC"
+    affiliations = _AFFILIATIONS.get(params.get("type") or "owner", "[OWNER]")
+    query = (f"query($login: String!, $first: Int!) {{ repositoryOwner(login: $login) {{"
+             f" repositories(first: $first, privacy: PUBLIC, ownerAffiliations: {affiliations},"
+             f" orderBy: {{field: {_REPO_SORT.get(sort, 'NAME')}, direction: {direction}}})"
+             f" {{ nodes {{ {REPO_SELECTION} }} }} }} }}")
+    return (query, {"login": login, "first": _first(params)},
+            lambda d: [repo_to_rest(n) for n in d["repositoryOwner"]["repositories"]["nodes"]])
+
+def _branches(owner: str, name: str, params: Dict[str, Any]) -> Route:
+    query = ("query($owner: String!, $name: String!, $first: Int!) {"
+             " repository(owner: $owner, name: $name) {"
+             ' refs(refPrefix: "refs/heads/", first: $first,'
+             " orderBy: {field: ALPHABETICAL, direction: ASC})"
+             f" {{ nodes {{ {BRANCH_SELECTION} }} }} }} }}")
+    return (query, {"owner": owner, "name": name, "first": _first(params)},
+            lambda d: [branch_to_rest(n) for n in d["repository"]["refs"]["nodes"]])
+
+def _issues(owner: str, name: str, params: Dict[str, Any]) -> Route:
+    state = (params.get("state") or "open").lower()
+    filters: Dict[str, Any] = {}
+    if state != "all":
+        filters["states"] = [state.upper()]
+    if params.get("labels"):
+        filters["labels"] = [l.strip() for l in str(params["labels"]).split(",")]
+    if params.get("assignee"):
+        filters["assignee"] = params["assignee"]
+    query = ("query($owner: String!, $name: String!, $first: Int!, $filterBy: IssueFilters) {"
+             " repository(owner: $owner, name: $name) {"
+             " issues(first: $first, filterBy: $filterBy,"
+             " orderBy: {field: CREATED_AT, direction: DESC})"
+             f" {{ nodes {{ state {ISSUE_FIELDS} }} }} }} }}")
+    return (query, {"owner": owner, "name": name, "first": _first(params), "filterBy": filters},
+            lambda d: [issue_to_rest(n) for n in d["repository"]["issues"]["nodes"]])
+
+def _issue(owner: str, name: str, number: str, params: Dict[str, Any]) -> Route:
+    query = ("query($owner: String!, $name: String!, $number: Int!) {"
+             " repository(owner: $owner, name: $name) {"
+             f" issueOrPullRequest(number: $number) {{ {ISSUE_SELECTION} }} }} }}")
+    def to_rest(d: Dict[str, Any]) -> Dict[str, Any]:
+        node = d["repository"]["issueOrPullRequest"]
+        if node is None:
+            raise _not_found(f"/repos/{owner}/{name}/issues/{number}")
+        return issue_to_rest(node)
+    return query, {"owner": owner, "name": name, "number": int(number)}, to_rest
+
+_ROUTES: List[Tuple[re.Pattern, Callable[..., Route]]] = [
+    (re.compile(r"^/users/([^/]+)$"), _user),
+    (re.compile(r"^/users/([^/]+)/repos$"), _user_repos),
+    (re.compile(r"^/repos/([^/]+)/([^/]+)/branches$"), _branches),
+    (re.compile(r"^/repos/([^/]+)/([^/]+)/issues$"), _issues),
+    (re.compile(r"^/repos/([^/]+)/([^/]+)/issues/(\d+)$"), _issue),
+]
+
+def rest_route(path: str, params: Dict[str, Any] | None) -> Route | None:
+    """GraphQL (query, variables, to_rest) serving a REST GET, if supported."""
+    params = params or {}
+    if int(params.get("page") or 1) > 1:
+        return None
+    for pattern, build in _ROUTES:
+        m = pattern.match(path)
+        if m:
+            query, variables, to_rest = build(*m.groups(), params)
+            return query, variables, _found(path, to_rest)
+    return None
+
+def _found(path: str, to_rest: Callable[[Dict[str, Any]], Any]) -> Callable[[Dict[str, Any]], Any]:
+    """``to_rest`` that answers a null root node (NOT_FOUND) as REST would: HTTP 404."""
+    def convert(data: Dict[str, Any]) -> Any:
+        if not data or any(node is None for node in data.values()):
+            raise _not_found(path)
+        return to_rest(data)
+    return convert
+
+def _not_found(path: str) -> Exception:
+    return common.requests.HTTPError(f"404 Client Error: Not Found for path: {path} (GraphQL)")
+
+# ---------------------------------------------------------------------- #
+# Batched repository overview
+# ---------------------------------------------------------------------- #
+def overview_query(owner: str, repos: List[str], branches: int, issues: int
+                   ) -> Tuple[str, Dict[str, Any]]:
+    """One aliased query covering metadata, branches and open issues of ``repos``."""
+    if not repos:
+        raise ValueError("at least one repository name is required")
+    names = ", ".join(f"$n{i}: String!" for i in range(len(repos)))
+    body = "\n".join(f"  r{i}: repository(owner: $owner, name: $n{i}) {{ ...overview }}"
+                     for i in range(len(repos)))
+    query = (f"query($owner: String!, $branches: Int!, $issues: Int!, {names}) {{\n{body}\n}}\n"
+             "fragment overview on Repository {"
+             f" {REPO_SELECTION}"
+             ' refs(refPrefix: "refs/heads/", first: $branches,'
+             " orderBy: {field: ALPHABETICAL, direction: ASC})"
+             f" {{ totalCount nodes {{ {BRANCH_SELECTION} }} }}"
+             " recentIssues: issues(states: OPEN, first: $issues,"
+             " orderBy: {field: UPDATED_AT, direction: DESC})"
+             f" {{ nodes {{ state {ISSUE_FIELDS} }} }} }}")
+    variables: Dict[str, Any] = {"owner": owner, "branches": branches, "issues": issues}
+    variables.update({f"n{i}": name for i, name in enumerate(repos)})
+    return query, variables
+
+def overview_to_rest(repos: List[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for i, name in enumerate(repos):
+        node = data.get(f"r{i}")
+        if node is None:
+            out[name] = {"error": "repository not found or not accessible"}
+            continue
+        out[name] = {
+            "repository": repo_to_rest(node),
+            "branch_count": node["refs"]["totalCount"],
+            "branches": [branch_to_rest(b) for b in node["refs"]["nodes"]],
+            "open_issues": [issue_to_rest(n) for n in node["recentIssues"]["nodes"]],
+        }
+    return out
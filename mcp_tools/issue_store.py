@@ -0,0 +1,518 @@
+"""Local mirror of the issues in ``GITHUB_USERNAME``'s repositories.
+
+``list_issues`` and ``search_issues`` are answered from a SQLite database
+(``GITHUB_ISSUE_DB``, default ``~/.cache/mcp_tools/issues.sqlite3``):
+
+* full text of titles and bodies is indexed with FTS5 (``porter`` stemming);
+  state, label and assignee filters use ordinary indexes;
+* a repository is mirrored in the background on first use (GitHub answers
+  until then), then synced incrementally: ``GET …/issues?state=all&since=``
+  with the newest ``updated_at`` seen so far, so a refresh of an unchanged
+  repository costs one request and returns nothing;
+* data older than ``GITHUB_ISSUE_STALE_SECONDS`` (default 300) is refreshed
+  before it is served, and every write through the client (close, comment,
+  create) marks the repository stale straight away;
+* queries the local engine cannot express (negated or unknown search
+  qualifiers, other owners) return ``None`` and the tools ask GitHub;
+* a search across all repositories is answered locally only once every
+  repository the owner owns (private ones included, via ``GET /user/repos``)
+  has been mirrored.
+
+``GITHUB_ISSUE_STORE=0`` disables the mirror.  Issues deleted or transferred
+on GitHub stay in the mirror until the database is removed.
+"""
+
+from __future__ import annotations
+
+import asyncio, json, os, re, sqlite3, threading, time
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from mcp_tools import common
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    id         INTEGER PRIMARY KEY,          -- GitHub's global issue id
+    repo       TEXT NOT NULL,                -- owner/name
+    number     INTEGER NOT NULL,
+    state      TEXT NOT NULL,
+    title      TEXT NOT NULL,
+    body       TEXT NOT NULL DEFAULT '',
+    author     TEXT,
+    is_pr      INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT,
+    updated_at TEXT,
+    data       TEXT NOT NULL                 -- the REST payload
+);
+CREATE UNIQUE INDEX IF NOT EXISTS issues_repo_number ON issues(repo, number);
+CREATE INDEX IF NOT EXISTS issues_repo_state ON issues(repo, state, created_at);
+CREATE INDEX IF NOT EXISTS issues_state_updated ON issues(state, updated_at);
+CREATE INDEX IF NOT EXISTS issues_author ON issues(author COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS issue_labels (
+    label    TEXT NOT NULL COLLATE NOCASE,
+    issue_id INTEGER NOT NULL,
+    PRIMARY KEY (label, issue_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS issue_assignees (
+    login    TEXT NOT NULL COLLATE NOCASE,
+    issue_id INTEGER NOT NULL,
+    PRIMARY KEY (login, issue_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sync_state (
+    repo      TEXT PRIMARY KEY,              -- owner/name
+    synced_at REAL NOT NULL,
+    since     TEXT                           -- newest updated_at seen
+);
+CREATE TABLE IF NOT EXISTS repo_lists (
+    owner     TEXT PRIMARY KEY,
+    listed_at REAL NOT NULL,
+    names     TEXT NOT NULL                  -- JSON list of owner/name
+);
+DELETE FROM sync_state WHERE repo LIKE '%/*';  -- repo lists kept here before repo_lists
+"""
+
+_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5(
+    title, body, content='issues', content_rowid='id', tokenize='porter unicode61');
+CREATE TRIGGER IF NOT EXISTS issues_ai AFTER INSERT ON issues BEGIN
+    INSERT INTO issues_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS issues_ad AFTER DELETE ON issues BEGIN
+    INSERT INTO issues_fts(issues_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS issues_au AFTER UPDATE ON issues BEGIN
+    INSERT INTO issues_fts(issues_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    INSERT INTO issues_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+"""
+
+_QUALIFIER = re.compile(r'(-?)(\w+):("[^"]*"|\S+)')
+_ISSUE_PATH = re.compile(r"^/repos/([^/]+)/([^/]+)/issues\b")
+
+
+class IssueStore:
+    def __init__(self, path: str, owner: str, *, stale_seconds: float = 300):
+        self.path = path
+        self.owner = owner
+        self.stale_seconds = stale_seconds
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()          # the connection
+        self._sync_locks: Dict[str, threading.Lock] = {}     # one sync per repo at a time
+        self._backfill: threading.Thread | None = None
+        self._backfill_queue: Dict[str, None] = {}           # ordered set of repos
+        self._counters = {"local_queries": 0, "fallbacks": 0, "syncs": 0,
+                          "sync_requests": 0, "issues_synced": 0, "backfills": 0}
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+            try:
+                self._db.executescript(_FTS)
+                self.fts = True
+            except sqlite3.OperationalError:   # SQLite built without FTS5: LIKE instead
+                self.fts = False
+
+    @classmethod
+    def from_env(cls) -> "IssueStore | None":
+        owner = os.getenv("GITHUB_USERNAME")
+        if os.getenv("GITHUB_ISSUE_STORE", "1") == "0" or not owner:
+            return None
+        path = os.getenv("GITHUB_ISSUE_DB") or os.path.join(
+            os.path.expanduser("~"), ".cache", "mcp_tools", "issues.sqlite3")
+        return cls(path, owner, stale_seconds=float(os.getenv("GITHUB_ISSUE_STALE_SECONDS", "300")))
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[key] += amount
+
+    def _full(self, repo: str) -> str:
+        return repo if "/" in repo else f"{self.owner}/{repo}"
+
+    # ------------------------------------------------------------------ #
+    # Sync
+    # ------------------------------------------------------------------ #
+    def _state(self, key: str) -> Tuple[float, Optional[str]]:
+        with self._lock:
+            row = self._db.execute("SELECT synced_at, since FROM sync_state WHERE repo = ?",
+                                   (key,)).fetchone()
+        return (row["synced_at"], row["since"]) if row else (0.0, None)
+
+    def _set_state(self, key: str, synced_at: float, since: Optional[str]) -> None:
+        with self._lock:
+            self._db.execute("INSERT INTO sync_state(repo, synced_at, since) VALUES (?, ?, ?) "
+                             "ON CONFLICT(repo) DO UPDATE SET synced_at = excluded.synced_at, "
+                             "since = excluded.since", (key, synced_at, since))
+
+    def mark_repo_list_stale(self) -> None:
+        """List the owner's repositories again on next use."""
+        with self._lock:
+            self._db.execute("UPDATE repo_lists SET listed_at = 0 WHERE owner = ?", (self.owner,))
+
+    def is_mirrored(self, repo: str) -> bool:
+        """Whether ``repo`` has been synced at least once."""
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM sync_state WHERE repo = ?",
+                                    (self._full(repo),)).fetchone() is not None
+
+    def is_fresh(self, repo: str) -> bool:
+        return time.time() - self._state(self._full(repo))[0] < self.stale_seconds
+
+    def mark_stale(self, repo: str) -> None:
+        """Refresh ``repo`` before its next query (its ``since`` cursor is kept)."""
+        key = self._full(repo)
+        with self._lock:
+            self._db.execute("UPDATE sync_state SET synced_at = 0 WHERE repo = ?", (key,))
+
+    def upsert(self, repo: str, issues: Iterable[Dict[str, Any]]) -> int:
+        """Store REST issue payloads of ``repo``; returns how many were written."""
+        key = self._full(repo)
+        rows = []
+        for i in issues:
+            rows.append((i["id"], key, i["number"], i["state"], i.get("title") or "",
+                         i.get("body") or "", (i.get("user") or {}).get("login"),
+                         int("pull_request" in i), i.get("created_at"), i.get("updated_at"),
+                         json.dumps(i, separators=(",", ":")),
+                         [l["name"] if isinstance(l, dict) else l for l in i.get("labels") or ()],
+                         [a["login"] for a in i.get("assignees") or () if a]))
+        if not rows:
+            return 0
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                for *row, labels, assignees in rows:
+                    self._db.execute(
+                        "INSERT INTO issues(id, repo, number, state, title, body, author, is_pr, "
+                        "created_at, updated_at, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT(id) DO UPDATE SET repo = excluded.repo, number = excluded.number, "
+                        "state = excluded.state, title = excluded.title, body = excluded.body, "
+                        "author = excluded.author, is_pr = excluded.is_pr, "
+                        "created_at = excluded.created_at, updated_at = excluded.updated_at, "
+                        "data = excluded.data", row)
+                    self._db.execute("DELETE FROM issue_labels WHERE issue_id = ?", (row[0],))
+                    self._db.execute("DELETE FROM issue_assignees WHERE issue_id = ?", (row[0],))
+                    self._db.executemany("INSERT OR IGNORE INTO issue_labels VALUES (?, ?)",
+                                         [(l, row[0]) for l in labels])
+                    self._db.executemany("INSERT OR IGNORE INTO issue_assignees VALUES (?, ?)",
+                                         [(a, row[0]) for a in assignees])
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def delete(self, repo: str, number: int | None = None) -> int:
+        """Forget one issue, or a whole repository (deleted, renamed, transferred)."""
+        key = self._full(repo)
+        where, args = ("repo = ? AND number = ?", (key, number)) if number else ("repo = ?", (key,))
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                ids = [r[0] for r in self._db.execute(f"SELECT id FROM issues WHERE {where}", args)]
+                for table in ("issue_labels", "issue_assignees"):
+                    self._db.executemany(f"DELETE FROM {table} WHERE issue_id = ?", [(i,) for i in ids])
+                self._db.execute(f"DELETE FROM issues WHERE {where}", args)
+                if number is None:
+                    self._db.execute("DELETE FROM sync_state WHERE repo = ?", (key,))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return len(ids)
+
+    def sync(self, repo: str, *, force: bool = False) -> int:
+        """Fetch the issues of ``repo`` changed since the last sync."""
+        key = self._full(repo)
+        with self._lock:
+            lock = self._sync_locks.setdefault(key, threading.Lock())
+        with lock:
+            synced_at, since = self._state(key)
+            if not force and time.time() - synced_at < self.stale_seconds:
+                return 0                     # refreshed by another thread meanwhile
+            started = time.time()
+            params = {"state": "all", "sort": "updated", "direction": "asc", "per_page": 100}
+            if since:
+                params["since"] = since
+            written, pages, newest = 0, 0, since
+            batch: List[Dict[str, Any]] = []
+            for issue in common.paginate(f"/repos/{key}/issues", params):
+                batch.append(issue)
+                if issue.get("updated_at") and (newest is None or issue["updated_at"] > newest):
+                    newest = issue["updated_at"]
+                if len(batch) == 100:
+                    written += self.upsert(key, batch)
+                    batch, pages = [], pages + 1
+            written += self.upsert(key, batch)
+            self._set_state(key, started, newest)
+            self._count("syncs")
+            self._count("sync_requests", pages + 1)
+            self._count("issues_synced", written)
+            return written
+
+    def repos(self) -> List[str]:
+        """``owner/name`` of every repository the owner owns, private ones included
+        (listed at most once per staleness period)."""
+        with self._lock:
+            row = self._db.execute("SELECT listed_at, names FROM repo_lists WHERE owner = ?",
+                                   (self.owner,)).fetchone()
+        if row is not None and time.time() - row["listed_at"] < self.stale_seconds:
+            return json.loads(row["names"])
+        prefix = self.owner.lower() + "/"
+        names = [r["full_name"] for r in common.paginate("/user/repos",
+                                                          {"affiliation": "owner", "per_page": 100})
+                 if r["full_name"].lower().startswith(prefix)]
+        with self._lock:
+            self._db.execute("INSERT INTO repo_lists(owner, listed_at, names) VALUES (?, ?, ?) "
+                             "ON CONFLICT(owner) DO UPDATE SET listed_at = excluded.listed_at, "
+                             "names = excluded.names", (self.owner, time.time(), json.dumps(names)))
+        return names
+
+    def ensure_fresh(self, repos: Iterable[str]) -> None:
+        for repo in repos:
+            if not self.is_fresh(repo):
+                self.sync(repo)
+
+    def backfill(self, repos: Iterable[str]) -> bool:
+        """Mirror the repositories never synced on a background thread.
+
+        Returns ``True`` when all of ``repos`` are already mirrored; callers
+        ask GitHub otherwise.  A failed backfill is retried by the next call.
+        """
+        missing = [self._full(r) for r in repos if not self.is_mirrored(r)]
+        if not missing:
+            return True
+        with self._lock:
+            self._backfill_queue.update(dict.fromkeys(missing))
+            if self._backfill is None:
+                self._backfill = threading.Thread(target=self._run_backfill,
+                                                  name="issue-backfill", daemon=True)
+                self._counters["backfills"] += 1
+                self._backfill.start()
+        return False
+
+    def _run_backfill(self) -> None:
+        while True:
+            with self._lock:
+                if not self._backfill_queue:
+                    self._backfill = None
+                    return
+                repo = next(iter(self._backfill_queue))
+            try:
+                self.sync(repo)
+            except (sqlite3.Error, OSError, common.requests.RequestException, common.RateLimitError):
+                with self._lock:
+                    self._backfill_queue.clear()
+                    self._backfill = None
+                return
+            with self._lock:
+                self._backfill_queue.pop(repo, None)
+
+    def on_mutation(self, path: str) -> None:
+        """``common.on_mutation`` listener: writes to issues make their repo stale."""
+        m = _ISSUE_PATH.match(path)
+        if m and m.group(1).lower() == self.owner.lower():
+            self.mark_stale(f"{m.group(1)}/{m.group(2)}")
+
+    # ------------------------------------------------------------------ #
+    # Queries
+    # ------------------------------------------------------------------ #
+    def _select(self, where: List[str], args: List[Any], order: str, limit: Optional[int],
+                offset: int, join: str = "") -> Tuple[int, List[Dict[str, Any]]]:
+        clause = " AND ".join(where) or "1"
+        with self._lock:
+            total = self._db.execute(f"SELECT count(*) FROM issues {join} WHERE {clause}",
+                                     args).fetchone()[0]
+            rows = self._db.execute(
+                f"SELECT issues.data FROM issues {join} WHERE {clause} ORDER BY {order} "
+                f"LIMIT ? OFFSET ?", [*args, -1 if limit is None else limit, offset]).fetchall()
+        return total, [json.loads(r["data"]) for r in rows]
+
+    @staticmethod
+    def _filters(where: List[str], args: List[Any], *, state: Optional[str] = None,
+                 labels: Iterable[str] = (), assignee: Optional[str] = None,
+                 author: Optional[str] = None, kind: Optional[str] = None,
+                 no: Iterable[str] = ()) -> None:
+        if state and state != "all":
+            where.append("issues.state = ?")
+            args.append(state)
+        for label in labels:
+            where.append("issues.id IN (SELECT issue_id FROM issue_labels WHERE label = ?)")
+            args.append(label)
+        if assignee == "none":
+            no = [*no, "assignee"]
+        elif assignee == "*":
+            where.append("issues.id IN (SELECT issue_id FROM issue_assignees)")
+        elif assignee:
+            where.append("issues.id IN (SELECT issue_id FROM issue_assignees WHERE login = ?)")
+            args.append(assignee)
+        if author:
+            where.append("issues.author = ? COLLATE NOCASE")
+            args.append(author)
+        if kind:
+            where.append("issues.is_pr = ?")
+            args.append(int(kind == "pr"))
+        for missing in no:
+            table = "issue_labels" if missing == "label" else "issue_assignees"
+            where.append(f"issues.id NOT IN (SELECT issue_id FROM {table})")
+
+    @staticmethod
+    def _window(page: Optional[int], per_page: Optional[int], all_pages: bool,
+                max_items: Optional[int]) -> Tuple[Optional[int], int]:
+        if all_pages:
+            return max_items, 0
+        per_page = per_page or 30
+        return per_page, ((page or 1) - 1) * per_page
+
+    def list_issues(self, repo: str, *, state: Optional[str] = None, assignee: Optional[str] = None,
+                    labels: Optional[str] = None, page: Optional[int] = None,
+                    per_page: Optional[int] = None, all_pages: bool = False,
+                    max_items: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+        """Same items and order as ``GET /repos/{owner}/{repo}/issues`` (newest first),
+        or ``None`` while ``repo`` is not mirrored yet."""
+        key = self._full(repo)
+        if not self.backfill([key]):
+            return None
+        self.ensure_fresh([key])
+        where, args = ["issues.repo = ?"], [key]
+        self._filters(where, args, state=state or "open", assignee=assignee,
+                      labels=[l.strip() for l in (labels or "").split(",") if l.strip()])
+        limit, offset = self._window(page, per_page, all_pages, max_items)
+        self._count("local_queries")
+        return self._select(where, args, "issues.created_at DESC, issues.number DESC", limit, offset)[1]
+
+    def search(self, query: str, *, repo: Optional[str] = None, in_title: bool = False,
+               state: Optional[str] = None, page: Optional[int] = None,
+               per_page: Optional[int] = None, all_pages: bool = False,
+               max_items: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """``/search/issues``-shaped result, or ``None`` for queries left to GitHub."""
+        parsed = _parse_query(query, self.owner)
+        if parsed is None:
+            return None
+        words, opts = parsed
+        if opts.pop("in_title", False):
+            in_title = True
+        repos = [self._full(r) for r in opts.pop("repos", [])] + ([self._full(repo)] if repo else [])
+        if any(r.split("/")[0].lower() != self.owner.lower() for r in repos):
+            return None
+        owned = repos or self.repos()
+        if not owned or not self.backfill(owned):
+            return None                  # GitHub answers until the mirror is complete
+        self.ensure_fresh(owned)
+        where: List[str] = []
+        args: List[Any] = []
+        if repos:
+            where.append(f"issues.repo IN ({','.join('?' * len(repos))})")
+            args.extend(repos)
+        else:
+            where.append("issues.repo LIKE ?")
+            args.append(f"{self.owner}/%")
+        self._filters(where, args, state=opts.pop("state", state), **opts)
+        join, order = "", "issues.updated_at DESC"
+        if words and self.fts:
+            column = "title : " if in_title else ""
+            join = "JOIN issues_fts ON issues_fts.rowid = issues.id"
+            where.append("issues_fts MATCH ?")
+            args.append(column + " ".join('"%s"' % w.replace('"', '""') for w in words))
+            order = "bm25(issues_fts)"
+        else:
+            for w in words:
+                where.append("(issues.title LIKE ?" + (")" if in_title else " OR issues.body LIKE ?)"))
+                args.extend([f"%{w}%"] * (1 if in_title else 2))
+        limit, offset = self._window(page, per_page, all_pages, max_items)
+        total, items = self._select(where, args, order, limit, offset, join)
+        self._count("local_queries")
+        return {"total_count": total, "incomplete_results": False, "items": items}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            counters["issues"] = self._db.execute("SELECT count(*) FROM issues").fetchone()[0]
+            counters["repos"] = self._db.execute("SELECT count(*) FROM sync_state").fetchone()[0]
+        return counters
+
+
+def _parse_query(query: str, owner: str) -> Optional[Tuple[List[str], Dict[str, Any]]]:
+    """Free-text words and filters of a search query; ``None`` if unsupported."""
+    opts: Dict[str, Any] = {"labels": [], "repos": [], "no": []}
+    for negated, key, value in _QUALIFIER.findall(query):
+        value = value.strip('"')
+        key, low = key.lower(), value.lower()
+        if negated:
+            return None
+        if key in ("state", "is") and low in ("open", "closed"):
+            opts["state"] = low
+        elif key == "is" and low in ("issue", "pr", "pull-request"):
+            opts["kind"] = "issue" if low == "issue" else "pr"
+        elif key == "type" and low in ("issue", "pr"):
+            opts["kind"] = low
+        elif key == "label":
+            opts["labels"].append(value)
+        elif key in ("assignee", "author"):
+            opts[key] = value
+        elif key == "no" and low in ("label", "assignee"):
+            opts["no"].append(low)
+        elif key == "in" and low == "title":
+            opts["in_title"] = True
+        elif key == "repo":
+            opts["repos"].append(value)
+        elif key in ("user", "owner", "org"):
+            if low != owner.lower():
+                return None              # the mirror only holds the owner's repositories
+        else:
+            return None
+    return re.findall(r"\w+", _QUALIFIER.sub(" ", query)), opts
+
+
+# ---------------------------------------------------------------------- #
+# Process-wide store and tool glue
+# ---------------------------------------------------------------------- #
+_store: IssueStore | None = None
+_store_ready = False
+_store_lock = threading.Lock()
+
+
+def get_issue_store() -> IssueStore | None:
+    """The process-wide mirror (``None`` when GITHUB_ISSUE_STORE=0)."""
+    global _store, _store_ready
+    if not _store_ready:
+        with _store_lock:
+            if not _store_ready:
+                _store = IssueStore.from_env()
+                if _store is not None:
+                    common.on_mutation(_store.on_mutation)
+                _store_ready = True
+    return _store
+
+
+def local_first(local: Callable[..., Any], fn: Callable[..., Any],
+                afn: Callable[..., Awaitable[Any]]) -> Tuple[Callable[..., Any], Callable[..., Awaitable[Any]]]:
+    """Wrap a tool's ``(fn, afn)`` so ``local(store, ...)`` answers when it can.
+
+    ``local`` returns the rendered output, or ``None`` to fall through to
+    the API.  Store errors (a locked database, a failed sync) fall through
+    as well; the async variant runs the store on a worker thread.
+    """
+    def attempt(*args, **kwargs):
+        store = get_issue_store()
+        if store is None:
+            return None
+        try:
+            out = local(store, *args, **kwargs)
+        except (sqlite3.Error, OSError, common.requests.RequestException, common.RateLimitError):
+            out = None
+        if out is None:
+            store._count("fallbacks")
+        return out
+
+    @wraps(fn)
+    def sync(*args, **kwargs):
+        out = attempt(*args, **kwargs)
+        return fn(*args, **kwargs) if out is None else out
+
+    @wraps(afn)
+    async def async_(*args, **kwargs):
+        out = await asyncio.to_thread(attempt, *args, **kwargs)
+        return await afn(*args, **kwargs) if out is None else out
+
+    return sync, async_
@@ -4,7 +4,8 @@ from __future__ import annotations
 import os
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import github_request
+from mcp_tools.common import sync_and_async
+from mcp_tools.projection import ISSUE_SUMMARY
 
 class CloseIssueInput(BaseModel):
     repo:   str = Field(...)
@@ -15,12 +16,14 @@ def _close_issue(repo, number):
     owner = os.getenv("GITHUB_USERNAME")
     if not owner:
         raise RuntimeError("GITHUB_USERNAME env-var required.")
-    return github_request("PATCH",
-                           f"/repos/{owner}/{repo}/issues/{number}",
-                           json={"state": "closed"})
+    return ("PATCH", f"/repos/{owner}/{repo}/issues/{number}",
+            {"json": {"state": "closed"}, "fields": ISSUE_SUMMARY})
+
+_close_issue_fn, _close_issue_afn = sync_and_async(_close_issue, tool="close_issue")
 
 close_issue_tool = FunctionTool.from_defaults(
-    fn=_close_issue,
+    fn=_close_issue_fn,
+    async_fn=_close_issue_afn,
     name="close_issue",
     description="Close (or re-open) an issue in the authenticated user's repository only",
     # input_type=CloseIssueInput,
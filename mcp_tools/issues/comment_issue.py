@@ -4,7 +4,8 @@ from __future__ import annotations
 import os
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import github_request
+from mcp_tools.common import sync_and_async
+from mcp_tools.projection import COMMENT
 
 class CommentIssueInput(BaseModel):
     repo:   str = Field(...)
@@ -16,12 +17,14 @@ def _comment_issue(repo, number, body):
     owner = os.getenv("GITHUB_USERNAME")
     if not owner:
         raise RuntimeError("GITHUB_USERNAME env-var required.")
-    return github_request("POST",
-                           f"/repos/{owner}/{repo}/issues/{number}/comments",
-                           json={"body": body})
+    return ("POST", f"/repos/{owner}/{repo}/issues/{number}/comments",
+            {"json": {"body": body}, "fields": COMMENT})
+
+_comment_issue_fn, _comment_issue_afn = sync_and_async(_comment_issue, tool="comment_issue")
 
 comment_issue_tool = FunctionTool.from_defaults(
-    fn=_comment_issue,
+    fn=_comment_issue_fn,
+    async_fn=_comment_issue_afn,
     name="comment_issue",
     description="Add a comment to an issue in the authenticated user's repository only",
     # input_type=CommentIssueInput,
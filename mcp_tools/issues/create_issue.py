@@ -4,7 +4,8 @@ from __future__ import annotations
 import os
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import github_request
+from mcp_tools.common import sync_and_async
+from mcp_tools.projection import ISSUE_SUMMARY
 
 class CreateIssueInput(BaseModel):
     repo:  str = Field(...)
@@ -22,10 +23,13 @@ def _create_issue(repo, title, *, body=None,
     body_json = {"title": title, "body": body,
                  "labels": labels, "assignees": assignees}
     body_json = {k: v for k, v in body_json.items() if v}
-    return github_request("POST", f"/repos/{owner}/{repo}/issues", json=body_json)
+    return "POST", f"/repos/{owner}/{repo}/issues", {"json": body_json, "fields": ISSUE_SUMMARY}
+
+_create_issue_fn, _create_issue_afn = sync_and_async(_create_issue, tool="create_issue")
 
 create_issue_tool = FunctionTool.from_defaults(
-    fn=_create_issue,
+    fn=_create_issue_fn,
+    async_fn=_create_issue_afn,
     name="create_issue",
     description="Open a new issue in the authenticated user's repository only",
     # input_type=CreateIssueInput,
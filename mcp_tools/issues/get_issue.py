@@ -4,21 +4,26 @@ from __future__ import annotations
 import os
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import github_request
+from mcp_tools.common import sync_and_async
+from mcp_tools.projection import ISSUE, parse_fields
 
 class GetIssueInput(BaseModel):
     repo:   str = Field(...)
     number: int = Field(..., ge=1, description="Issue number")
+    fields: str | None = Field(None, description="CSV of fields to return, '*' for the full payload")
 
-def _get_issue(repo, number):
+def _get_issue(repo, number, *, fields=None):
     # Always use the authenticated user's username
     owner = os.getenv("GITHUB_USERNAME")
     if not owner:
         raise RuntimeError("GITHUB_USERNAME env-var required.")
-    return github_request("GET", f"/repos/{owner}/{repo}/issues/{number}")
+    return "GET", f"/repos/{owner}/{repo}/issues/{number}", {"fields": parse_fields(fields, ISSUE)}
+
+_get_issue_fn, _get_issue_afn = sync_and_async(_get_issue, tool="get_issue")
 
 get_issue_tool = FunctionTool.from_defaults(
-    fn=_get_issue,
+    fn=_get_issue_fn,
+    async_fn=_get_issue_afn,
     name="get_issue",
     description="Retrieve a single issue by number from the authenticated user's repository only",
     # input_type=GetIssueInput,
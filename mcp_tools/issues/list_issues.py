@@ -4,7 +4,9 @@ from __future__ import annotations
 import os
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import github_request
+from mcp_tools.common import render_output, sync_and_async
+from mcp_tools.issue_store import local_first
+from mcp_tools.projection import ISSUE_SUMMARY, parse_fields
 
 class ListIssuesInput(BaseModel):
     repo:  str = Field(...)
@@ -13,9 +15,13 @@ class ListIssuesInput(BaseModel):
     labels: str | None = Field(None, description="CSV list of label names")
     page: int | None = Field(None, ge=1)
     perPage: int | None = Field(None, ge=1, le=100)
+    allPages: bool | None = Field(False, description="Follow pagination and return every item")
+    maxItems: int | None = Field(None, ge=1, description="Cap on items when allPages is set")
+    fields: str | None = Field(None, description="CSV of fields to return, '*' for the full payload")
 
 def _list_issues(repo, *, state=None, assignee=None,
-                  labels=None, page=None, perPage=None):
+                  labels=None, page=None, perPage=None,
+                  allPages=False, maxItems=None, fields=None):
     # Always use the authenticated user's username
     owner = os.getenv("GITHUB_USERNAME")
     if not owner:
@@ -26,12 +32,28 @@ def _list_issues(repo, *, state=None, assignee=None,
     if labels:   params["labels"]   = labels
     if page:     params["page"]     = page
     if perPage:  params["per_page"] = perPage
-    return github_request("GET", f"/repos/{owner}/{repo}/issues", params=params)
+    return ("GET", f"/repos/{owner}/{repo}/issues",
+            {"params": params, "all_pages": allPages, "max_items": maxItems,
+             "fields": parse_fields(fields, ISSUE_SUMMARY)})
+
+def _list_issues_local(store, repo, *, state=None, assignee=None,
+                       labels=None, page=None, perPage=None,
+                       allPages=False, maxItems=None, fields=None):
+    # Answered from the local issue mirror (mcp_tools.issue_store)
+    items = store.list_issues(repo, state=state, assignee=assignee, labels=labels,
+                              page=page, per_page=perPage, all_pages=allPages, max_items=maxItems)
+    if items is None:
+        return None
+    return render_output(items, parse_fields(fields, ISSUE_SUMMARY), "list_issues")
+
+_list_issues_fn, _list_issues_afn = local_first(
+    _list_issues_local, *sync_and_async(_list_issues, tool="list_issues"))
 
 list_issues_tool = FunctionTool.from_defaults(
-    fn=_list_issues,
+    fn=_list_issues_fn,
+    async_fn=_list_issues_afn,
     name="list_issues",
-    description="List issues in the authenticated user's repository only",
+    description="List issues in the authenticated user's repository only. Set allPages=true to fetch every page (optionally capped by maxItems)",
     # input_type=ListIssuesInput,
 )
 
@@ -4,7 +4,9 @@ from __future__ import annotations
 import os
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import github_request
+from mcp_tools.common import render_output, sync_and_async
+from mcp_tools.issue_store import local_first
+from mcp_tools.projection import ISSUE_SUMMARY, parse_fields
 
 class SearchIssuesInput(BaseModel):
     query: str = Field(..., description="Search keywords")
@@ -13,9 +15,13 @@ class SearchIssuesInput(BaseModel):
     state: str | None = Field(None, description="open, closed")
     page: int | None = Field(None, ge=1)
     perPage: int | None = Field(None, ge=1, le=100)
+    allPages: bool | None = Field(False, description="Follow pagination and return every item")
+    maxItems: int | None = Field(None, ge=1, description="Cap on items when allPages is set")
+    fields: str | None = Field(None, description="CSV of fields to return, '*' for the full payload")
 
 def _search_issues(query, *, repo=None, inTitle=False,
-                    state=None, page=None, perPage=None):
+                    state=None, page=None, perPage=None,
+                    allPages=False, maxItems=None, fields=None):
     # Always use the authenticated user's username
     username = os.getenv("GITHUB_USERNAME")
     if not username:
@@ -43,12 +49,29 @@ def _search_issues(query, *, repo=None, inTitle=False,
     params = {"q": qs}
     if page:    params["page"]     = page
     if perPage: params["per_page"] = perPage
-    return github_request("GET", "/search/issues", params=params)
+    return ("GET", "/search/issues",
+            {"params": params, "all_pages": allPages, "max_items": maxItems,
+             "fields": parse_fields(fields, ISSUE_SUMMARY)})
+
+def _search_issues_local(store, query, *, repo=None, inTitle=False,
+                         state=None, page=None, perPage=None,
+                         allPages=False, maxItems=None, fields=None):
+    # Answered from the local issue mirror; None leaves the query to GitHub
+    res = store.search(query, repo=repo, in_title=inTitle, state=state, page=page,
+                       per_page=perPage, all_pages=allPages, max_items=maxItems)
+    if res is None:
+        return None
+    return render_output(res["items"] if allPages else res,
+                         parse_fields(fields, ISSUE_SUMMARY), "search_issues")
+
+_search_issues_fn, _search_issues_afn = local_first(
+    _search_issues_local, *sync_and_async(_search_issues, tool="search_issues"))
 
 search_issues_tool = FunctionTool.from_defaults(
-    fn=_search_issues,
+    fn=_search_issues_fn,
+    async_fn=_search_issues_afn,
     name="search_issues",
-    description="Search issues/pull-requests in the authenticated user's repositories only",
+    description="Search issues/pull-requests in the authenticated user's repositories only. Set allPages=true to fetch every page (optionally capped by maxItems)",
     # input_type=SearchIssuesInput,
 )
 
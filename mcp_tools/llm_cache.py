@@ -0,0 +1,170 @@
+"""Response cache for LLM chat calls.
+
+Agents resend the same prompts over and over: a recurring triage query gives
+the master and every specialist the same conversation, so each ReAct step
+produces the same completion.  ``LLMCache`` keeps those completions:
+
+* **exact tier** – key is the model settings plus every message as written
+  (only surrounding whitespace is stripped: case and inner spacing can be
+  the arguments of a write);
+* **semantic tier** (optional) – when an embedding function is supplied, a
+  miss compares the *last* message with cached entries that share the rest of
+  the conversation exactly, and reuses one whose cosine similarity is at
+  least ``LLM_CACHE_SIMILARITY``.  Only final answers take part: a
+  completion that picks a tool (a ReAct ``Action:`` or function tool calls)
+  is never reused for a merely similar request, since "close issue 12" and
+  "close issue 13" embed almost alike.
+
+Entries expire after ``LLM_CACHE_TTL`` seconds; at most ``LLM_CACHE_ENTRIES``
+are kept (LRU).  ``invalidate_path`` drops entries whose answer may depend on
+a GitHub resource that changed.  A ReAct step only depends on GitHub state
+through the tool observations in its prompt, and those carry the repository
+in their names and URLs, so a write to ``/repos/{o}/{r}/…`` drops every entry
+mentioning ``r``; writes outside a repository (``/user/repos`` …) clear the
+cache.  ``LLM_CACHE=0`` disables the cache.
+"""
+
+from __future__ import annotations
+
+import hashlib, math, os, re, threading, time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Sequence, Tuple
+
+Message = Tuple[str, str]                    # (role, content)
+Embed = Callable[[str], Sequence[float]]
+
+_WS = re.compile(r"\s+")
+_REPO_PATH = re.compile(r"^/repos/[^/]+/([^/]+)")
+_ACTION = re.compile(r"^\s*Action\s*:", re.M)
+
+
+def normalize(text: str) -> str:
+    """Whitespace-collapsed, case-folded text (for matching repository names)."""
+    return _WS.sub(" ", text).strip().casefold()
+
+
+def picks_tool(text: str) -> bool:
+    """Whether a ReAct completion asks for a tool call."""
+    return bool(_ACTION.search(text or ""))
+
+
+class _Entry(NamedTuple):
+    value: Any
+    expires: float
+    prefix: str                          # hash of all messages but the last
+    vector: Tuple[float, ...] | None     # None: exact hits only
+    text: str                            # normalized conversation
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class LLMCache:
+    def __init__(self, *, max_entries: int = 256, ttl: float = 900.0,
+                 embed: Embed | None = None, similarity: float = 0.95):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.embed = embed
+        self.similarity = similarity
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._embedded = threading.local()       # last (text, vector): get() then put()
+        self._counters = {"hits": 0, "semantic_hits": 0, "misses": 0,
+                          "stores": 0, "invalidated": 0, "expired": 0}
+
+    @classmethod
+    def from_env(cls, embed: Embed | None = None) -> "LLMCache | None":
+        if os.getenv("LLM_CACHE", "1") == "0":
+            return None
+        return cls(max_entries=int(os.getenv("LLM_CACHE_ENTRIES", "256")),
+                   ttl=float(os.getenv("LLM_CACHE_TTL", "900")),
+                   embed=embed,
+                   similarity=float(os.getenv("LLM_CACHE_SIMILARITY", "0.95")))
+
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def key(messages: Iterable[Message], settings: Dict[str, Any]) -> Tuple[str, str, str]:
+        """(exact key, prefix key, normalized last message) of a chat call."""
+        msgs = [(role, (content or "").strip()) for role, content in messages]
+        head = repr((sorted(settings.items()), msgs[:-1]))
+        prefix = hashlib.sha256(head.encode()).hexdigest()
+        last = msgs[-1][1] if msgs else ""
+        exact = hashlib.sha256(f"{prefix}\0{msgs[-1:]!r}".encode()).hexdigest()
+        return exact, prefix, last
+
+    def get(self, messages: Iterable[Message], settings: Dict[str, Any]) -> Any:
+        """Cached response for this call, or ``None``."""
+        msgs = list(messages)
+        exact, prefix, last = self.key(msgs, settings)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(exact)
+            if entry is not None and entry.expires <= now:
+                del self._entries[exact]
+                self._counters["expired"] += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(exact)
+                self._counters["hits"] += 1
+                return entry.value
+            candidates = [(k, e) for k, e in self._entries.items()
+                          if e.prefix == prefix and e.vector is not None and e.expires > now
+                          ] if self.embed is not None and last else []
+        if candidates:
+            vector = self._vector(last)
+            best_key, best = max(((k, _cosine(vector, e.vector)) for k, e in candidates),
+                                 key=lambda kv: kv[1])
+            if best >= self.similarity:
+                with self._lock:
+                    entry = self._entries.get(best_key)
+                    if entry is not None:
+                        self._entries.move_to_end(best_key)
+                        self._counters["semantic_hits"] += 1
+                        return entry.value
+        with self._lock:
+            self._counters["misses"] += 1
+        return None
+
+    def put(self, messages: Iterable[Message], settings: Dict[str, Any], value: Any,
+            *, semantic: bool = True) -> None:
+        """Store ``value``; ``semantic=False`` keeps it out of the similarity tier."""
+        msgs = list(messages)
+        exact, prefix, last = self.key(msgs, settings)
+        vector = self._vector(last) if semantic and self.embed is not None and last else None
+        text = " ".join(normalize(c or "") for _, c in msgs)
+        with self._lock:
+            self._entries[exact] = _Entry(value, time.monotonic() + self.ttl, prefix, vector, text)
+            self._entries.move_to_end(exact)
+            self._counters["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _vector(self, text: str) -> Tuple[float, ...]:
+        memo = getattr(self._embedded, "last", None)
+        if memo is None or memo[0] != text:
+            memo = (text, tuple(self.embed(text)))
+            self._embedded.last = memo
+        return memo[1]
+
+    # ------------------------------------------------------------------ #
+    def invalidate_path(self, path: str) -> int:
+        """Drop entries that may depend on the GitHub resource at ``path``."""
+        m = _REPO_PATH.match(path)
+        repo = m.group(1).casefold() if m else None
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if repo is None or repo in e.text]
+            for k in stale:
+                del self._entries[k]
+            self._counters["invalidated"] += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._counters, "entries": len(self._entries)}
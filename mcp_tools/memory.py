@@ -0,0 +1,273 @@
+"""Bounded chat memory for long-running agent sessions.
+
+Every ReAct agent keeps its conversation in memory and resends all of it on
+each LLM call; the specialists also accumulate the master's delegations.
+``CompactingMemory`` holds each agent to a token budget:
+
+* **compaction** – apart from the newest ``AGENT_MEMORY_KEEP_RAW`` messages,
+  large JSON payloads pasted into answers (tool observations echoed back) are
+  replaced by a one-line digest: ``[JSON list, 30 items: #12 "Crash on …", …]``;
+* **folding** – when the history exceeds the budget, the oldest whole turns
+  are folded into a running summary until it is under 3/4 of the budget
+  again, so summaries are updated in batches, not on every turn.  The
+  summary goes back to the model as a system message.
+
+``AGENT_MEMORY_SUMMARY`` picks the summarizer: ``extractive`` (default; one
+line per folded turn, no LLM call), ``llm`` (the agent's LLM rewrites the
+summary, falling back to extractive on error) or ``off`` (old turns are
+dropped).  The summary itself is capped at ``AGENT_MEMORY_SUMMARY_TOKENS``.
+Tokens are estimated at ``projection.BYTES_PER_TOKEN`` characters each.
+
+=================================  =====================================
+AGENT_MEMORY=0                     keep llama_index's default buffer
+AGENT_MEMORY_TOKENS                master budget (default 3000)
+AGENT_MEMORY_SPECIALIST_TOKENS     specialist budget (default 1500)
+AGENT_MEMORY_SUMMARY_TOKENS        summary cap (default 400)
+AGENT_MEMORY_KEEP_RAW              newest messages never compacted (default 2)
+=================================  =====================================
+
+:func:`stats` reports, per agent name, history size, summary size, folds,
+compacted characters and the largest history handed to a prompt.
+"""
+
+from __future__ import annotations
+
+import json, os, re, threading, weakref
+from typing import Any, Dict, List, Optional
+
+from llama_index.core.bridge.pydantic import Field, PrivateAttr
+from llama_index.core.llms import ChatMessage, MessageRole
+from llama_index.core.memory.types import BaseMemory
+
+from mcp_tools import tracing
+from mcp_tools.projection import BYTES_PER_TOKEN
+
+ENABLED            = os.getenv("AGENT_MEMORY", "1") != "0"
+MASTER_TOKENS      = int(os.getenv("AGENT_MEMORY_TOKENS", "3000"))
+SPECIALIST_TOKENS  = int(os.getenv("AGENT_MEMORY_SPECIALIST_TOKENS", "1500"))
+SUMMARY_TOKENS     = int(os.getenv("AGENT_MEMORY_SUMMARY_TOKENS", "400"))
+KEEP_RAW           = int(os.getenv("AGENT_MEMORY_KEEP_RAW", "2"))
+SUMMARIZER         = os.getenv("AGENT_MEMORY_SUMMARY", "extractive")
+
+MIN_JSON_CHARS = 200                 # smaller payloads are kept verbatim
+_JSON_START = re.compile(r"[\[{]")
+_DIGEST_KEYS = ("full_name", "name", "number", "title", "login", "path", "state")
+_SUMMARY_HEADER = "Summary of the earlier conversation:\n"
+_SUMMARY_PROMPT = (
+    "Update the running summary of a conversation between a user and a GitHub agent. "
+    "Keep repository names, issue and PR numbers, file paths, decisions and open "
+    "questions; leave out raw data. Answer with the summary only, at most {words} words.\n\n"
+    "Current summary:\n{summary}\n\nNew turns:\n{turns}"
+)
+
+_instances: "weakref.WeakValueDictionary[int, CompactingMemory]" = weakref.WeakValueDictionary()
+
+
+def count_tokens(text: str) -> int:
+    return (len(text) + BYTES_PER_TOKEN - 1) // BYTES_PER_TOKEN
+
+
+def _message_tokens(m: ChatMessage) -> int:
+    return count_tokens(m.content or "") + 4           # role and framing
+
+
+def _label(item: Any) -> str:
+    if not isinstance(item, dict):
+        return json.dumps(item)[:40]
+    parts = []
+    for key in _DIGEST_KEYS:
+        if key in item and not isinstance(item[key], (dict, list)):
+            value = item[key]
+            parts.append(f"#{value}" if key == "number" else
+                         f'"{value[:40]}"' if key == "title" else str(value))
+            if len(parts) == 2:
+                break
+    return " ".join(parts) or "{" + ", ".join(list(item)[:4]) + "}"
+
+
+def _digest(value: Any, chars: int) -> str:
+    if isinstance(value, list):
+        shown = ", ".join(_label(v) for v in value[:5])
+        more = ", …" if len(value) > 5 else ""
+        return f"[JSON list, {len(value)} items: {shown}{more}]"
+    if isinstance(value, dict) and isinstance(value.get("items"), list):    # search results
+        return f"[JSON search, {value.get('total_count', len(value['items']))} hits: " \
+               f"{', '.join(_label(v) for v in value['items'][:5])}]"
+    return f"[JSON object {_label(value)}, {chars} chars]"
+
+
+def compact_text(text: str) -> str:
+    """Replace JSON payloads of ``MIN_JSON_CHARS`` or more with a digest."""
+    if len(text) < MIN_JSON_CHARS:
+        return text
+    decoder = json.JSONDecoder()
+    out, pos = [], 0
+    for m in _JSON_START.finditer(text):
+        if m.start() < pos:
+            continue
+        try:
+            value, end = decoder.raw_decode(text, m.start())
+        except ValueError:
+            continue
+        if end - m.start() >= MIN_JSON_CHARS:
+            out.append(text[pos:m.start()])
+            out.append(_digest(value, end - m.start()))
+            pos = end
+    return "".join(out) + text[pos:] if out else text
+
+
+class CompactingMemory(BaseMemory):
+    """Chat memory with a token budget, JSON compaction and a running summary."""
+
+    name: str = Field(default="agent", description="Agent name used in stats.")
+    token_budget: int = Field(default=MASTER_TOKENS)
+    summary_tokens: int = Field(default=SUMMARY_TOKENS)
+    keep_raw: int = Field(default=KEEP_RAW)
+    summarizer: str = Field(default=SUMMARIZER)
+    summary: str = Field(default="")
+    messages: List[ChatMessage] = Field(default_factory=list)
+
+    _llm: Any = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default_factory=threading.RLock)
+    _stats: Dict[str, int] = PrivateAttr(default_factory=dict)
+
+    def __init__(self, llm: Any = None, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._llm = llm
+        self._stats = {"folds": 0, "folded_messages": 0, "compacted_chars": 0,
+                       "summary_failures": 0, "max_history_tokens": 0}
+        _instances[id(self)] = self
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CompactingMemory"
+
+    @classmethod
+    def from_defaults(cls, chat_history: Optional[List[ChatMessage]] = None,
+                      llm: Any = None, **kwargs: Any) -> "CompactingMemory":
+        memory = cls(llm=llm, **kwargs)
+        if chat_history:
+            memory.set(chat_history)
+        return memory
+
+    # -- BaseMemory ------------------------------------------------------- #
+    def get(self, input: Optional[str] = None, **kwargs: Any) -> List[ChatMessage]:
+        with self._lock:
+            history = list(self.messages)
+            if self.summary:
+                history.insert(0, ChatMessage(role=MessageRole.SYSTEM,
+                                              content=_SUMMARY_HEADER + self.summary))
+            tokens = sum(_message_tokens(m) for m in history)
+            self._stats["max_history_tokens"] = max(self._stats["max_history_tokens"], tokens)
+        return history
+
+    def get_all(self) -> List[ChatMessage]:
+        with self._lock:
+            return list(self.messages)
+
+    def put(self, message: ChatMessage) -> None:
+        with self._lock:
+            self.messages.append(message)
+            self._enforce()
+
+    def set(self, messages: List[ChatMessage]) -> None:
+        with self._lock:
+            self.messages = list(messages)
+            self._enforce()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.messages = []
+            self.summary = ""
+
+    # -- budget ------------------------------------------------------------ #
+    def history_tokens(self) -> int:
+        with self._lock:
+            return count_tokens(self.summary) + sum(_message_tokens(m) for m in self.messages)
+
+    def _compact(self) -> None:
+        for i, m in enumerate(self.messages[:max(len(self.messages) - self.keep_raw, 0)]):
+            if m.content and len(m.content) >= MIN_JSON_CHARS:
+                compacted = compact_text(m.content)
+                if compacted != m.content:
+                    self._stats["compacted_chars"] += len(m.content) - len(compacted)
+                    self.messages[i] = ChatMessage(role=m.role, content=compacted,
+                                                   additional_kwargs=m.additional_kwargs)
+
+    def _enforce(self) -> None:
+        self._compact()
+        if self.history_tokens() <= self.token_budget:
+            return
+        # Fold whole turns (a user message and what follows it), oldest
+        # first, down to 3/4 of the budget; the newest turn always stays.
+        target = self.token_budget * 3 // 4
+        starts = [i for i, m in enumerate(self.messages) if m.role == MessageRole.USER and i > 0]
+        tokens, cut = self.history_tokens(), 0
+        for nxt in starts:
+            if tokens <= target:
+                break
+            tokens -= sum(_message_tokens(m) for m in self.messages[cut:nxt])
+            cut = nxt
+        if cut == 0:
+            return
+        folded, self.messages = self.messages[:cut], self.messages[cut:]
+        with tracing.span("memory.fold", agent=self.name, messages=len(folded)) as s:
+            self.summary = self._summarize(folded)
+            s.set(summary_tokens=count_tokens(self.summary), history_tokens=self.history_tokens())
+        self._stats["folds"] += 1
+        self._stats["folded_messages"] += len(folded)
+
+    # -- summaries ---------------------------------------------------------- #
+    def _summarize(self, folded: List[ChatMessage]) -> str:
+        if self.summarizer == "off":
+            return ""
+        if self.summarizer == "llm" and self._llm is not None:
+            turns = "\n".join(f"{m.role.value}: {compact_text(m.content or '')}" for m in folded)
+            prompt = _SUMMARY_PROMPT.format(words=self.summary_tokens * 3 // 4,
+                                            summary=self.summary or "(none)", turns=turns)
+            try:
+                response = self._llm.chat([ChatMessage(role=MessageRole.USER, content=prompt)])
+                return self._cap((response.message.content or "").strip())
+            except Exception:
+                self._stats["summary_failures"] += 1
+        lines = [self.summary] if self.summary else []
+        for m in folded:
+            text = " ".join(compact_text(m.content or "").split())
+            if text:
+                lines.append(f"- {m.role.value}: {text[:160]}{'…' if len(text) > 160 else ''}")
+        return self._cap("\n".join(lines))
+
+    def _cap(self, summary: str) -> str:
+        """Drop the oldest summary lines (or truncate) to ``summary_tokens``."""
+        lines = summary.splitlines()
+        while len(lines) > 1 and count_tokens("\n".join(lines)) > self.summary_tokens:
+            lines.pop(0)
+        return "\n".join(lines)[: self.summary_tokens * BYTES_PER_TOKEN]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"messages": len(self.messages), "history_tokens": self.history_tokens(),
+                    "summary_tokens": count_tokens(self.summary), **self._stats}
+
+
+def for_agent(name: str, llm: Any = None, master: bool = False) -> Optional[CompactingMemory]:
+    """Memory for one agent (``None`` with AGENT_MEMORY=0: llama_index's default)."""
+    if not ENABLED:
+        return None
+    return CompactingMemory(llm=llm, name=name,
+                            token_budget=MASTER_TOKENS if master else SPECIALIST_TOKENS)
+
+
+def stats() -> Dict[str, Dict[str, int]]:
+    """Totals per agent name over every live memory (one per agent per session)."""
+    out: Dict[str, Dict[str, int]] = {}
+    for memory in list(_instances.values()):
+        s = memory.stats()
+        agg = out.setdefault(memory.name, {"memories": 0})
+        agg["memories"] += 1
+        for key, value in s.items():
+            if key.startswith("max_"):
+                agg[key] = max(agg.get(key, 0), value)
+            else:
+                agg[key] = agg.get(key, 0) + value
+    return out
@@ -0,0 +1,137 @@
+"""Field projection for tool outputs.
+
+GitHub payloads are mostly hypermedia URLs and nested objects the LLM never
+reads.  Each tool declares a default schema – a tuple of dotted field paths –
+and ``project`` keeps only those, preserving the REST shape::
+
+    project(issue, ("number", "user.login", "labels.name"))
+    # {"number": 7, "user": {"login": "x"}, "labels": [{"name": "bug"}]}
+
+Lists are projected element-wise and search results keep ``total_count``.
+``fields="*"`` returns the untouched payload.
+"""
+
+from __future__ import annotations
+
+import os, threading
+from json import dumps
+from typing import Any, Dict, Iterable, Sequence
+
+Fields = Sequence[str]
+
+USER_SUMMARY = ("login", "id", "type", "html_url")
+USER = USER_SUMMARY + ("name", "company", "blog", "location", "email", "bio",
+                       "public_repos", "followers", "following", "created_at")
+REPO = ("name", "full_name", "description", "private", "fork", "default_branch",
+        "language", "stargazers_count", "forks_count", "open_issues_count",
+        "updated_at", "html_url")
+BRANCH = ("name", "commit.sha", "protected")
+REF = ("ref", "object.sha")
+ISSUE_SUMMARY = ("number", "title", "state", "user.login", "labels.name",
+                 "assignees.login", "comments", "created_at", "updated_at",
+                 "pull_request.html_url", "html_url")
+ISSUE = ISSUE_SUMMARY + ("body", "closed_at", "milestone.title")
+COMMENT = ("id", "user.login", "body", "created_at", "html_url")
+FILE = ("name", "path", "sha", "size", "type", "encoding", "content", "html_url")
+FILE_WRITE = ("content.path", "content.sha", "commit.sha", "commit.html_url")
+
+# Rough average for English/JSON text with GPT-style tokenizers.
+BYTES_PER_TOKEN = 4
+# One call in SAMPLE (per tool, the first included) re-renders the raw payload.
+SAMPLE          = max(1, int(os.getenv("GITHUB_PROJECTION_SAMPLE", "20")))
+
+
+def parse_fields(fields: str | Iterable[str] | None, default: Fields) -> Fields | None:
+    """Normalize a ``fields=`` override (CSV or list); ``"*"`` disables projection."""
+    if fields is None or fields == "" or fields == []:
+        return default
+    if isinstance(fields, str):
+        fields = [f.strip() for f in fields.split(",") if f.strip()]
+    fields = tuple(fields)
+    return None if "*" in fields else fields
+
+
+def _tree(fields: Fields) -> Dict[str, dict]:
+    root: Dict[str, dict] = {}
+    for f in fields:
+        node = root
+        for part in f.split("."):
+            node = node.setdefault(part, {})
+    return root
+
+
+def _apply(obj: Any, tree: Dict[str, dict]) -> Any:
+    if isinstance(obj, list):
+        return [_apply(o, tree) for o in obj]
+    if not isinstance(obj, dict):
+        return obj
+    out = {}
+    for key, sub in tree.items():
+        if key in obj:
+            out[key] = _apply(obj[key], sub) if sub else obj[key]
+    return out
+
+
+def project(data: Any, fields: Fields | None) -> Any:
+    """Keep only ``fields`` of every record in ``data``."""
+    if not fields:
+        return data
+    tree = _tree(fields)
+    if isinstance(data, dict) and isinstance(data.get("items"), list):
+        return {"total_count": data.get("total_count"),
+                "items": _apply(data["items"], tree)}
+    if isinstance(data, dict) and "status_code" in data and len(data) == 1:
+        return data          # empty-body responses (204 …)
+    return _apply(data, tree)
+
+
+# ---------------------------------------------------------------------- #
+# Output-size accounting
+# ---------------------------------------------------------------------- #
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def record(tool: str, raw: Any, output: str) -> None:
+    """Compare ``output`` with the old full, indented rendering of ``raw``.
+
+    That rendering is a second serialization, so it is only measured on a
+    sample of calls; the raw size of the others is extrapolated from the
+    sampled raw/output ratio.
+    """
+    out_bytes = len(output.encode())
+    with _stats_lock:
+        s = _stats.setdefault(tool, {"calls": 0, "out_bytes": 0,
+                                     "sampled_raw": 0, "sampled_out": 0})
+        sampled = s["calls"] % SAMPLE == 0
+        s["calls"] += 1
+        s["out_bytes"] += out_bytes
+    if sampled:
+        raw_bytes = len(dumps(raw, indent=2).encode())
+        with _stats_lock:
+            s["sampled_raw"] += raw_bytes
+            s["sampled_out"] += out_bytes
+
+
+def stats() -> Dict[str, Dict[str, float]]:
+    """Per-tool bytes and estimated tokens before/after projection."""
+    with _stats_lock:
+        snapshot = {k: dict(v) for k, v in _stats.items()}
+    for s in snapshot.values():
+        ratio = s.pop("sampled_raw") / s["sampled_out"] if s["sampled_out"] else 1.0
+        s.pop("sampled_out")
+        s["raw_bytes"] = round(s["out_bytes"] * ratio)
+        s["raw_tokens"] = s["raw_bytes"] // BYTES_PER_TOKEN
+        s["out_tokens"] = s["out_bytes"] // BYTES_PER_TOKEN
+        s["saved_pct"] = round(100 * (1 - s["out_bytes"] / s["raw_bytes"]), 1) if s["raw_bytes"] else 0.0
+    return snapshot
+
+
+def report() -> str:
+    """Human-readable table of :func:`stats`."""
+    rows = [f"{'tool':<24}{'calls':>6}{'raw KB':>10}{'out KB':>10}{'~tokens saved':>15}{'saved':>8}"]
+    for tool, s in sorted(stats().items()):
+        rows.append(f"{tool:<24}{s['calls']:>6}{s['raw_bytes'] / 1024:>10.1f}"
+                    f"{s['out_bytes'] / 1024:>10.1f}{s['raw_tokens'] - s['out_tokens']:>15}"
+                    f"{s['saved_pct']:>7}%")
+    return "\n".join(rows)
@@ -0,0 +1,148 @@
+"""Rate-limit-aware scheduling for GitHub requests.
+
+GitHub meters each resource bucket (``core``, ``search``, ``graphql`` …)
+separately and reports it in ``X-RateLimit-*`` headers.  The limiter keeps
+the latest view of every bucket and hands out send slots:
+
+* when a bucket runs low, calls are spread evenly over what is left of the
+  window instead of bursting into a 403;
+* when it is exhausted (or ``Retry-After`` was sent) callers queue until the
+  reset rather than failing mid-plan;
+* 403/429 rate-limit answers and transient 5xx errors are retried with
+  exponential backoff and full jitter.
+
+The limiter only computes delays; callers sleep (``time.sleep`` or
+``asyncio.sleep``), so the same instance serves sync and async clients.
+"""
+
+from __future__ import annotations
+
+import os, random, threading, time
+from dataclasses import dataclass, asdict
+from typing import Dict, Mapping
+
+RETRYABLE_5XX = {500, 502, 503, 504}
+IDEMPOTENT = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+
+
+class RateLimitError(RuntimeError):
+    """Raised when honouring a limit would mean waiting longer than allowed."""
+
+
+@dataclass
+class Bucket:
+    limit:         int | None = None
+    remaining:     int | None = None
+    reset:         float = 0.0      # epoch seconds
+    blocked_until: float = 0.0      # set by Retry-After / secondary limits
+    next_slot:     float = 0.0      # earliest start for the next paced call
+    requests:      int = 0
+    waits:         int = 0
+    waited_s:      float = 0.0
+    retries:       int = 0
+
+
+class RateLimiter:
+    def __init__(self, *, reserve: int = 1, pace_below: float = 0.2,
+                 max_retries: int = 4, backoff_base: float = 1.0,
+                 backoff_cap: float = 60.0, max_wait: float = 900.0):
+        self.reserve = reserve            # calls kept back for the user
+        self.pace_below = pace_below      # start pacing under this fraction left
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_wait = max_wait
+        self._buckets: Dict[str, Bucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        return cls(
+            reserve=int(os.getenv("GITHUB_RATELIMIT_RESERVE", "1")),
+            pace_below=float(os.getenv("GITHUB_RATELIMIT_PACE_BELOW", "0.2")),
+            max_retries=int(os.getenv("GITHUB_MAX_RETRIES", "4")),
+            max_wait=float(os.getenv("GITHUB_RATELIMIT_MAX_WAIT", "900")),
+        )
+
+    @staticmethod
+    def bucket_for(path: str) -> str:
+        if path.startswith("/graphql"):
+            return "graphql"
+        if path.startswith("/search/code"):
+            return "code_search"
+        if path.startswith("/search"):
+            return "search"
+        return "core"
+
+    def _bucket(self, name: str) -> Bucket:
+        return self._buckets.setdefault(name, Bucket())
+
+    # ------------------------------------------------------------------ #
+    def reserve_slot(self, name: str) -> float:
+        """Claim the next send slot in ``name``; return seconds to wait first."""
+        with self._lock:
+            b, now = self._bucket(name), time.time()
+            start, interval = max(now, b.blocked_until, b.next_slot), 0.0
+            if b.remaining is not None and b.reset > now:
+                if b.remaining <= self.reserve:
+                    start = max(start, b.reset + 0.5)       # queue until reset
+                elif b.limit and b.remaining < b.limit * self.pace_below:
+                    interval = (b.reset - now) / (b.remaining - self.reserve)
+                b.remaining -= 1                            # seen by concurrent callers
+            b.next_slot = start + interval
+            b.requests += 1
+            wait = start - now
+            if wait > self.max_wait:
+                raise RateLimitError(
+                    f"GitHub '{name}' rate limit: next slot in {wait:.0f}s "
+                    f"(> GITHUB_RATELIMIT_MAX_WAIT={self.max_wait:.0f}s)")
+            if wait > 0:
+                b.waits += 1
+                b.waited_s += wait
+            return wait
+
+    def update(self, name: str, headers: Mapping[str, str]) -> None:
+        """Record the bucket state reported by a response."""
+        if headers.get("X-RateLimit-Remaining") is None:
+            return
+        with self._lock:
+            b = self._bucket(headers.get("X-RateLimit-Resource") or name)
+            b.remaining = int(headers["X-RateLimit-Remaining"])
+            if headers.get("X-RateLimit-Limit"):
+                b.limit = int(headers["X-RateLimit-Limit"])
+            if headers.get("X-RateLimit-Reset"):
+                b.reset = float(headers["X-RateLimit-Reset"])
+
+    def retry_delay(self, name: str, method: str, attempt: int, status: int,
+                    headers: Mapping[str, str], text: str = "") -> float | None:
+        """Seconds to wait before retrying, or ``None`` if the answer is final."""
+        limited = status == 429 or (status == 403 and (
+            headers.get("Retry-After") is not None
+            or headers.get("X-RateLimit-Remaining") == "0"
+            or "rate limit" in text.lower()))
+        transient = status in RETRYABLE_5XX and method.upper() in IDEMPOTENT
+        if not (limited or transient) or attempt >= self.max_retries:
+            return None
+        now = time.time()
+        backoff = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        delay = backoff
+        if headers.get("Retry-After"):
+            delay = float(headers["Retry-After"]) + backoff / 4
+        elif headers.get("X-RateLimit-Remaining") == "0" and headers.get("X-RateLimit-Reset"):
+            delay = max(0.0, float(headers["X-RateLimit-Reset"]) - now) + 0.5 + backoff / 4
+        if delay > self.max_wait:
+            raise RateLimitError(
+                f"GitHub '{name}' rate limit: retry in {delay:.0f}s "
+                f"(> GITHUB_RATELIMIT_MAX_WAIT={self.max_wait:.0f}s)")
+        with self._lock:
+            b = self._bucket(headers.get("X-RateLimit-Resource") or name)
+            b.retries += 1
+            if limited:
+                b.blocked_until = max(b.blocked_until, now + delay)
+        return delay
+
+    def stats(self) -> Dict[str, Dict[str, float | int | None]]:
+        """Remaining budget and throttling counters per bucket."""
+        with self._lock:
+            return {name: {k: v for k, v in asdict(b).items() if k != "next_slot"}
+                    for name, b in self._buckets.items()}
@@ -0,0 +1,161 @@
+"""Lazy tool registry.
+
+Importing a tool module builds its ``FunctionTool`` and pulls in llama_index,
+which costs seconds.  The packages therefore no longer import their tool
+files up front: ``tool_manifest.json`` lists every ``*_tool`` object with
+its module, tool name and description, and the package ``__getattr__``
+(PEP 562) imports a module the first time one of its tools is used::
+
+    from mcp_tools.repos import list_branches_tool   # imports one module
+    registry.tools["list_branches"]                  # same, by tool name
+
+The manifest is read without importing anything.  If it is missing or older
+than a tool file it is rebuilt from the sources with ``ast``.  Regenerate it
+with ``python -m mcp_tools.registry``.
+"""
+
+from __future__ import annotations
+
+import ast, json, threading
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Tuple
+
+PACKAGES = ("repos", "issues", "users")
+MANIFEST_PATH = Path(__file__).with_name("tool_manifest.json")
+
+Manifest = Dict[str, Dict[str, Dict[str, str]]]   # package -> attr -> {module, name, description}
+
+_manifest: Manifest | None = None
+_lock = threading.Lock()
+
+
+def _literal(node: ast.AST) -> str | None:
+    try:
+        value = ast.literal_eval(node)
+    except ValueError:
+        return None
+    return value if isinstance(value, str) else None
+
+
+def _scan(path: Path, module: str) -> Dict[str, Dict[str, str]]:
+    """``*_tool`` assignments of a tool file, read from its source."""
+    found: Dict[str, Dict[str, str]] = {}
+    for node in ast.parse(path.read_text(encoding="utf-8")).body:
+        if not (isinstance(node, ast.Assign) and isinstance(node.value, ast.Call)):
+            continue
+        for target in node.targets:
+            if isinstance(target, ast.Name) and target.id.endswith("_tool"):
+                kwargs = {k.arg: _literal(k.value) for k in node.value.keywords if k.arg}
+                found[target.id] = {"module": module,
+                                    "name": kwargs.get("name") or target.id[:-5],
+                                    "description": kwargs.get("description") or ""}
+    return found
+
+
+def _sources() -> Iterator[Tuple[str, Path]]:
+    root = Path(__file__).parent
+    for package in PACKAGES:
+        for path in sorted((root / package).glob("*.py")):
+            if path.name != "__init__.py":
+                yield package, path
+
+
+def build_manifest() -> Manifest:
+    manifest: Manifest = {package: {} for package in PACKAGES}
+    for package, path in _sources():
+        manifest[package].update(_scan(path, f"mcp_tools.{package}.{path.stem}"))
+    return manifest
+
+
+def write_manifest(path: Path = MANIFEST_PATH) -> Manifest:
+    manifest = build_manifest()
+    path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return manifest
+
+
+def _stale() -> bool:
+    try:
+        built = MANIFEST_PATH.stat().st_mtime
+    except FileNotFoundError:
+        return True
+    return any(path.stat().st_mtime > built for _, path in _sources())
+
+
+def manifest() -> Manifest:
+    """The tool manifest (rebuilt in memory when the JSON file is out of date)."""
+    global _manifest
+    if _manifest is None:
+        with _lock:
+            if _manifest is None:
+                if _stale():
+                    _manifest = build_manifest()
+                else:
+                    _manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    return _manifest
+
+
+def load(package: str, attr: str) -> Any:
+    """Import the module defining ``attr`` and return the tool object."""
+    entry = manifest()[package][attr]
+    return getattr(import_module(entry["module"]), attr)
+
+
+def lazy_package(package: str) -> Tuple[Callable[[str], Any], Callable[[], List[str]], List[str]]:
+    """``__getattr__``, ``__dir__`` and ``__all__`` for a tool package ``__init__``."""
+    names = sorted(manifest()[package])
+    namespace = import_module(f"mcp_tools.{package}").__dict__
+
+    def __getattr__(name: str) -> Any:
+        if name not in manifest()[package]:
+            raise AttributeError(f"module 'mcp_tools.{package}' has no attribute {name!r}")
+        tool = namespace[name] = load(package, name)     # cache: later lookups skip us
+        return tool
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(names))
+
+    return __getattr__, __dir__, names
+
+
+class ToolRegistry(Mapping[str, Any]):
+    """Every tool by its tool name; a tool's module is imported on first access."""
+
+    def __init__(self, packages: Tuple[str, ...] = PACKAGES):
+        self.packages = packages
+        self._index: Dict[str, Tuple[str, str, Dict[str, str]]] | None = None
+
+    def _entries(self) -> Dict[str, Tuple[str, str, Dict[str, str]]]:
+        if self._index is None:
+            m = manifest()
+            self._index = {e["name"]: (package, attr, e)
+                           for package in self.packages for attr, e in m[package].items()}
+        return self._index
+
+    def __getitem__(self, name: str) -> Any:
+        package, attr, _ = self._entries()[name]
+        return getattr(import_module(f"mcp_tools.{package}"), attr)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries())
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def describe(self, name: str) -> str:
+        """Tool description without importing the tool."""
+        return self._entries()[name][2]["description"]
+
+    def package_of(self, name: str) -> str:
+        return self._entries()[name][0]
+
+
+tools = ToolRegistry()
+
+
+if __name__ == "__main__":
+    written = write_manifest()
+    print(f"wrote {MANIFEST_PATH} ({sum(len(v) for v in written.values())} tools)")
@@ -0,0 +1,49 @@
+"""commit_files tool – one commit for many files via the Git Data API"""
+
+from __future__ import annotations
+import os
+from pydantic import BaseModel, Field
+from llama_index.core.tools import FunctionTool
+from mcp_tools.common import render_output
+from mcp_tools.gitdata import async_commit_files, commit_files
+
+class FileChangeInput(BaseModel):
+    path:    str = Field(..., description="File path in repo")
+    content: str | None = Field(None, description="New file content; omit to delete the file")
+    delete:  bool | None = Field(False, description="Delete the file")
+
+class CommitFilesInput(BaseModel):
+    repo:    str = Field(...)
+    message: str = Field(..., description="Commit message")
+    files:   list[FileChangeInput] = Field(..., description="Files to create, update or delete")
+    branch:  str | None = Field(None, description="Target branch; defaults to the default branch")
+
+def _owner():
+    # Always use the authenticated user's username
+    owner = os.getenv("GITHUB_USERNAME")
+    if not owner:
+        raise RuntimeError("GITHUB_USERNAME env-var required.")
+    return owner
+
+def _commit_files(repo, message, files, *, branch=None):
+    result = commit_files(_owner(), repo, message, files, branch=branch)
+    return render_output(result, None, "commit_files")
+
+async def _acommit_files(repo, message, files, *, branch=None):
+    result = await async_commit_files(_owner(), repo, message, files, branch=branch)
+    return render_output(result, None, "commit_files")
+
+commit_files_tool = FunctionTool.from_defaults(
+    fn=_commit_files,
+    async_fn=_acommit_files,
+    name="commit_files",
+    description=(
+        "Create, update or delete many files in the authenticated user's repository as a "
+        "single atomic commit. files is a list of {path, content} objects; give "
+        "{path, delete: true} to remove a file. Prefer this over repeated "
+        "create_or_update_file / delete_file calls."
+    ),
+    # input_type=CommitFilesInput,
+)
+
+__all__ = ["commit_files_tool"]
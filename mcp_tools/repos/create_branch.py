@@ -2,7 +2,8 @@ from __future__ import annotations
 import os
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import github_request
+from mcp_tools.common import sync_and_async
+from mcp_tools.projection import REF
 
 class CreateBranchInput(BaseModel):
     repo:   str = Field(...)
@@ -15,12 +16,13 @@ def _create_branch(repo, branch, sha):
     if not owner:
         raise RuntimeError("GITHUB_USERNAME env-var required.")
     body = {"ref": f"refs/heads/{branch}", "sha": sha}
-    return github_request("POST",
-                           f"/repos/{owner}/{repo}/git/refs",
-                           json=body)
+    return "POST", f"/repos/{owner}/{repo}/git/refs", {"json": body, "fields": REF}
+
+_create_branch_fn, _create_branch_afn = sync_and_async(_create_branch, tool="create_branch")
 
 create_branch_tool = FunctionTool.from_defaults(
-    fn=_create_branch,
+    fn=_create_branch_fn,
+    async_fn=_create_branch_afn,
     name="create_branch",
     description="Create a new branch from a SHA in the authenticated user's repository only",
 )
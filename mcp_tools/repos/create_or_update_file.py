@@ -2,7 +2,7 @@ from __future__ import annotations
 import os
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import put_file
+from mcp_tools.common import put_file_spec, sync_and_async
 
 class CreateOrUpdateFileInput(BaseModel):
     repo:    str = Field(...)
@@ -18,11 +18,14 @@ def _create_or_update(repo, path, message, content, *,
     owner = os.getenv("GITHUB_USERNAME")
     if not owner:
         raise RuntimeError("GITHUB_USERNAME env-var required.")
-    return put_file(owner, repo, path, message, content,
-                     branch=branch, sha=sha)
+    return put_file_spec(owner, repo, path, message, content,
+                         branch=branch, sha=sha)
+
+_create_or_update_fn, _create_or_update_afn = sync_and_async(_create_or_update, tool="create_or_update_file")
 
 create_or_update_file_tool = FunctionTool.from_defaults(
-    fn=_create_or_update,
+    fn=_create_or_update_fn,
+    async_fn=_create_or_update_afn,
     name="create_or_update_file",
     description="Create or update a single file in the authenticated user's repository only",
     # input_type=CreateOrUpdateFileInput,
@@ -1,7 +1,8 @@
 from __future__ import annotations
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import github_request
+from mcp_tools.common import sync_and_async
+from mcp_tools.projection import REPO
 
 class CreateRepositoryInput(BaseModel):
     name: str = Field(..., description="Repo name")
@@ -14,10 +15,13 @@ def _create_repository(name: str, *, description=None,
     body = {"name": name, "description": description,
             "private": private, "auto_init": autoInit}
     body = {k: v for k, v in body.items() if v is not None}
-    return github_request("POST", "/user/repos", json=body)
+    return "POST", "/user/repos", {"json": body, "fields": REPO}
+
+_create_repository_fn, _create_repository_afn = sync_and_async(_create_repository, tool="create_repository")
 
 create_repository_tool = FunctionTool.from_defaults(
-    fn=_create_repository,
+    fn=_create_repository_fn,
+    async_fn=_create_repository_afn,
     name="create_repository",
     description="Create a new GitHub repository",
     # input_type=CreateRepositoryInput,
@@ -2,7 +2,7 @@ from __future__ import annotations
 import os
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import delete_file
+from mcp_tools.common import delete_file_spec, sync_and_async
 
 class DeleteFileInput(BaseModel):
     repo:    str = Field(..., description="The name of the repository.")
@@ -17,10 +17,13 @@ def _delete_file(repo: str, path: str, message: str, sha: str, *,
     owner = os.getenv("GITHUB_USERNAME")
     if not owner:
         raise RuntimeError("GITHUB_USERNAME env-var required.")
-    return delete_file(owner, repo, path, message, sha, branch=branch)
+    return delete_file_spec(owner, repo, path, message, sha, branch=branch)
+
+_delete_file_fn, _delete_file_afn = sync_and_async(_delete_file, tool="delete_file")
 
 delete_file_tool = FunctionTool.from_defaults(
-    fn=_delete_file,
+    fn=_delete_file_fn,
+    async_fn=_delete_file_afn,
     name="delete_file",
     description="Delete a single file from the authenticated user's repository. Requires the file's SHA.",
     # input_type=DeleteFileInput, # Optional: uncomment to enforce input schema validation
@@ -0,0 +1,59 @@
+"""fetch_repo_overview tool – POST /graphql (metadata, branches, open issues of many repos)"""
+
+from __future__ import annotations
+import os
+from pydantic import BaseModel, Field
+from llama_index.core.tools import FunctionTool
+from mcp_tools.common import render_output
+from mcp_tools.graphql import (async_graphql_request, graphql_request,
+                               overview_query, overview_to_rest)
+from mcp_tools.projection import BRANCH, ISSUE_SUMMARY, REPO, project
+
+class FetchRepoOverviewInput(BaseModel):
+    repos:    list[str] = Field(..., description="Repository names (CSV string also accepted)")
+    branches: int | None = Field(20, ge=1, le=100, description="Branches per repository")
+    issues:   int | None = Field(10, ge=1, le=100, description="Open issues per repository")
+
+def _overview_request(repos, *, branches=20, issues=10):
+    # Always use the authenticated user's username
+    owner = os.getenv("GITHUB_USERNAME")
+    if not owner:
+        raise RuntimeError("GITHUB_USERNAME env-var required.")
+    if isinstance(repos, str):
+        repos = [r.strip() for r in repos.split(",") if r.strip()]
+    repos = [r.split("/")[-1] for r in repos if r.split("/")[-1]]
+    if not repos:
+        raise ValueError("repos must name at least one repository")
+    query, variables = overview_query(owner, repos, branches or 20, issues or 10)
+    return repos, query, variables
+
+def _shape(repos, data):
+    out = overview_to_rest(repos, data)
+    for entry in out.values():
+        if "repository" in entry:
+            entry["repository"] = project(entry["repository"], REPO)
+            entry["branches"] = project(entry["branches"], BRANCH)
+            entry["open_issues"] = project(entry["open_issues"], ISSUE_SUMMARY)
+    return render_output(out, None, "fetch_repo_overview")
+
+def _fetch_repo_overview(repos, *, branches=20, issues=10):
+    repos, query, variables = _overview_request(repos, branches=branches, issues=issues)
+    return _shape(repos, graphql_request(query, variables))
+
+async def _afetch_repo_overview(repos, *, branches=20, issues=10):
+    repos, query, variables = _overview_request(repos, branches=branches, issues=issues)
+    return _shape(repos, await async_graphql_request(query, variables))
+
+fetch_repo_overview_tool = FunctionTool.from_defaults(
+    fn=_fetch_repo_overview,
+    async_fn=_afetch_repo_overview,
+    name="fetch_repo_overview",
+    description=(
+        "Metadata, branches and open issues for several of the authenticated user's "
+        "repositories in a single request. Prefer this over calling list_branches / "
+        "list_issues once per repository."
+    ),
+    # input_type=FetchRepoOverviewInput,
+)
+
+__all__ = ["fetch_repo_overview_tool"]
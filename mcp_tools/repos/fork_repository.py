@@ -2,7 +2,8 @@ from __future__ import annotations
 import os
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import github_request
+from mcp_tools.common import sync_and_async
+from mcp_tools.projection import REPO
 
 class ForkRepositoryInput(BaseModel):
     repo:  str = Field(...)
@@ -14,12 +15,13 @@ def _fork_repo(repo, *, organization=None):
     if not owner:
         raise RuntimeError("GITHUB_USERNAME env-var required.")
     body = {"organization": organization} if organization else None
-    return github_request("POST",
-                           f"/repos/{owner}/{repo}/forks",
-                           json=body)
+    return "POST", f"/repos/{owner}/{repo}/forks", {"json": body, "fields": REPO}
+
+_fork_repo_fn, _fork_repo_afn = sync_and_async(_fork_repo, tool="fork_repository")
 
 fork_repository_tool = FunctionTool.from_defaults(
-    fn=_fork_repo,
+    fn=_fork_repo_fn,
+    async_fn=_fork_repo_afn,
     name="fork_repository",
     description="Fork a repository owned by the authenticated user only",
     # input_type=ForkRepositoryInput,
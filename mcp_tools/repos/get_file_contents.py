@@ -1,7 +1,9 @@
 from __future__ import annotations
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import github_request
+from mcp_tools.common import render_output
+from mcp_tools.gitdata import async_read_file_contents, read_file_contents
+from mcp_tools.projection import FILE, parse_fields
 import os
 from mcp_tools.common import GITHUB_USERNAME
 
@@ -9,19 +11,26 @@ class GetFileContentsInput(BaseModel):
     repo:  str = Field(...)
     path:  str = Field(..., description="File path in repo")
     ref:   str | None = Field(None, description="Branch/tag/SHA")
+    fields: str | None = Field(None, description="CSV of fields to return, '*' for the full payload")
 
-def _get_file(repo, path, *, ref=None):
+def _owner():
     # Always use the authenticated user's username
     owner = os.getenv("GITHUB_USERNAME")
     if not owner:
         raise RuntimeError("GITHUB_USERNAME env-var required.")
-    params = {"ref": ref} if ref else None
-    return github_request("GET",
-                          f"/repos/{owner}/{repo}/contents/{path}",
-                          params=params)
+    return owner
+
+def _get_file_fn(repo, path, *, ref=None, fields=None):
+    payload = read_file_contents(_owner(), repo, path, ref)
+    return render_output(payload, parse_fields(fields, FILE), "get_file_contents")
+
+async def _get_file_afn(repo, path, *, ref=None, fields=None):
+    payload = await async_read_file_contents(_owner(), repo, path, ref)
+    return render_output(payload, parse_fields(fields, FILE), "get_file_contents")
 
 get_file_contents_tool = FunctionTool.from_defaults(
-    fn=_get_file,
+    fn=_get_file_fn,
+    async_fn=_get_file_afn,
     name="get_file_contents",
     description="Retrieve file metadata + Base64 content from authenticated user's repositories only",
     # input_type=GetFileContentsInput,
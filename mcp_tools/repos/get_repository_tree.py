@@ -0,0 +1,43 @@
+"""get_repository_tree tool – GET /repos/{owner}/{repo}/git/trees/{ref}?recursive=1"""
+
+from __future__ import annotations
+import os
+from pydantic import BaseModel, Field
+from llama_index.core.tools import FunctionTool
+from mcp_tools.common import render_output
+from mcp_tools.gitdata import async_get_tree, get_tree, matches, patterns_of
+
+class GetRepositoryTreeInput(BaseModel):
+    repo:    str = Field(...)
+    ref:     str | None = Field(None, description="Branch/tag/SHA, defaults to HEAD")
+    pattern: str | None = Field(None, description="Glob(s), CSV, e.g. '*.py,docs/*'")
+
+def _owner():
+    # Always use the authenticated user's username
+    owner = os.getenv("GITHUB_USERNAME")
+    if not owner:
+        raise RuntimeError("GITHUB_USERNAME env-var required.")
+    return owner
+
+def _shape(tree, pattern):
+    patterns = patterns_of(pattern)
+    entries = [{"path": e["path"], "type": e["type"], "size": e.get("size")}
+               for e in tree.get("tree", []) if matches(e["path"], patterns)]
+    return render_output({"sha": tree.get("sha"), "truncated": tree.get("truncated", False),
+                          "entries": entries}, None, "get_repository_tree")
+
+def _get_tree(repo, *, ref=None, pattern=None):
+    return _shape(get_tree(_owner(), repo, ref), pattern)
+
+async def _aget_tree(repo, *, ref=None, pattern=None):
+    return _shape(await async_get_tree(_owner(), repo, ref), pattern)
+
+get_repository_tree_tool = FunctionTool.from_defaults(
+    fn=_get_tree,
+    async_fn=_aget_tree,
+    name="get_repository_tree",
+    description="List every file path (with size) of the authenticated user's repository in one call, optionally filtered by glob",
+    # input_type=GetRepositoryTreeInput,
+)
+
+__all__ = ["get_repository_tree_tool"]
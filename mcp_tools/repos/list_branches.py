@@ -2,14 +2,19 @@ from __future__ import annotations
 import os
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import github_request
+from mcp_tools.common import sync_and_async
+from mcp_tools.projection import BRANCH, parse_fields
 
 class ListBranchesInput(BaseModel):
     repo:  str = Field(...)
     page: int | None = Field(None, ge=1)
     perPage: int | None = Field(None, ge=1, le=100)
+    allPages: bool | None = Field(False, description="Follow pagination and return every item")
+    maxItems: int | None = Field(None, ge=1, description="Cap on items when allPages is set")
+    fields: str | None = Field(None, description="CSV of fields to return, '*' for the full payload")
 
-def _list_branches(repo, *, page=None, perPage=None):
+def _list_branches(repo, *, page=None, perPage=None,
+                   allPages=False, maxItems=None, fields=None):
     # Always use the authenticated user's username
     owner = os.getenv("GITHUB_USERNAME")
     if not owner:
@@ -17,13 +22,17 @@ def _list_branches(repo, *, page=None, perPage=None):
     params = {}
     if page:     params["page"]     = page
     if perPage:  params["per_page"] = perPage
-    return github_request("GET",
-                           f"/repos/{owner}/{repo}/branches", params=params)
+    return ("GET", f"/repos/{owner}/{repo}/branches",
+            {"params": params, "all_pages": allPages, "max_items": maxItems,
+             "fields": parse_fields(fields, BRANCH)})
+
+_list_branches_fn, _list_branches_afn = sync_and_async(_list_branches, tool="list_branches")
 
 list_branches_tool = FunctionTool.from_defaults(
-    fn=_list_branches,
+    fn=_list_branches_fn,
+    async_fn=_list_branches_afn,
     name="list_branches",
-    description="List branches in the authenticated user's repository only",
+    description="List branches in the authenticated user's repository only. Set allPages=true to fetch every page (optionally capped by maxItems)",
     # input_type=ListBranchesInput,
 )
 
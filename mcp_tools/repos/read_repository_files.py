@@ -0,0 +1,51 @@
+"""read_repository_files tool – recursive tree + concurrent blob / tarball download"""
+
+from __future__ import annotations
+import os
+from pydantic import BaseModel, Field
+from llama_index.core.tools import FunctionTool
+from mcp_tools.common import render_output
+from mcp_tools.gitdata import READ_MAX_FILE_BYTES, async_read_files, read_files
+
+class ReadRepositoryFilesInput(BaseModel):
+    repo:         str = Field(...)
+    pattern:      str | None = Field(None, description="Glob(s), CSV, e.g. '*.py,README*'")
+    ref:          str | None = Field(None, description="Branch/tag/SHA, defaults to HEAD")
+    maxFiles:     int | None = Field(50, ge=1, le=500)
+    maxFileBytes: int | None = Field(None, ge=1, description="Skip files larger than this")
+    mode:         str | None = Field("auto", description="auto, blobs or tarball")
+
+def _owner():
+    # Always use the authenticated user's username
+    owner = os.getenv("GITHUB_USERNAME")
+    if not owner:
+        raise RuntimeError("GITHUB_USERNAME env-var required.")
+    return owner
+
+def _read_files(repo, *, pattern=None, ref=None, maxFiles=50,
+                maxFileBytes=None, mode="auto"):
+    result = read_files(_owner(), repo, ref, pattern, mode=mode or "auto",
+                        max_files=maxFiles or 50,
+                        max_file_bytes=maxFileBytes or READ_MAX_FILE_BYTES)
+    return render_output(result, None, "read_repository_files")
+
+async def _aread_files(repo, *, pattern=None, ref=None, maxFiles=50,
+                       maxFileBytes=None, mode="auto"):
+    result = await async_read_files(_owner(), repo, ref, pattern, mode=mode or "auto",
+                                    max_files=maxFiles or 50,
+                                    max_file_bytes=maxFileBytes or READ_MAX_FILE_BYTES)
+    return render_output(result, None, "read_repository_files")
+
+read_repository_files_tool = FunctionTool.from_defaults(
+    fn=_read_files,
+    async_fn=_aread_files,
+    name="read_repository_files",
+    description=(
+        "Read the decoded text of many files of the authenticated user's repository in "
+        "one call: lists the tree once, then downloads every file matching the glob "
+        "pattern. Prefer this over repeated get_file_contents calls."
+    ),
+    # input_type=ReadRepositoryFilesInput,
+)
+
+__all__ = ["read_repository_files_tool"]
@@ -2,7 +2,8 @@ from __future__ import annotations
 import os
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import github_request
+from mcp_tools.common import sync_and_async
+from mcp_tools.projection import REPO, parse_fields
 
 class SearchRepositoriesInput(BaseModel):
     query: str = Field(..., description="Search keywords")
@@ -10,8 +11,12 @@ class SearchRepositoriesInput(BaseModel):
     order: str | None = Field(None)
     page: int | None = Field(None, ge=1)
     perPage: int | None = Field(None, ge=1, le=100)
+    allPages: bool | None = Field(False, description="Follow pagination and return every item")
+    maxItems: int | None = Field(None, ge=1, description="Cap on items when allPages is set")
+    fields: str | None = Field(None, description="CSV of fields to return, '*' for the full payload")
 
-def _search_repos(query, *,org = None, sort=None, order=None, page=None, perPage=None):
+def _search_repos(query, *,org = None, sort=None, order=None, page=None, perPage=None,
+                  allPages=False, maxItems=None, fields=None):
     username = os.getenv("GITHUB_USERNAME")
     if not username:
         raise RuntimeError("GITHUB_USERNAME env-var required.")
@@ -22,12 +27,17 @@ def _search_repos(query, *,org = None, sort=None, order=None, page=None, perPage
     if order: params["order"] = order
     if page: params["page"] = page
     if perPage: params["per_page"] = perPage
-    return github_request("GET", "/search/repositories", params=params)
+    return ("GET", "/search/repositories",
+            {"params": params, "all_pages": allPages, "max_items": maxItems,
+             "fields": parse_fields(fields, REPO)})
+
+_search_repos_fn, _search_repos_afn = sync_and_async(_search_repos, tool="search_repositories")
 
 search_repositories_tool = FunctionTool.from_defaults(
-    fn=_search_repos,
+    fn=_search_repos_fn,
+    async_fn=_search_repos_afn,
     name="search_repositories",
-    description="Search repositories owned by the authenticated user only",
+    description="Search repositories owned by the authenticated user only. Set allPages=true to fetch every page (optionally capped by maxItems)",
     # input_type=SearchRepositoriesInput,
 )
 
@@ -0,0 +1,162 @@
+"""Deterministic fast path for simple commands.
+
+Inputs such as "list branches of Final-Project" or "close issue 12 in demo"
+map one-to-one onto a tool call, so they do not need the master and
+specialist LLM round trips.  ``Router.route`` matches the input against a
+small grammar of anchored patterns and calls the tool directly; anything it
+does not recognise returns ``None`` and goes to the agents as before.  So
+do commands naming another owner's repository (``someone/repo``) and tool
+calls that raise: the agents then answer, or explain the failure.
+
+``AGENT_FAST_PATH=0`` disables routing.  ``Router.stats`` reports the hit
+rate and the latency of routed turns.
+"""
+
+from __future__ import annotations
+
+import os, re, threading, time
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+FAST_PATH = os.getenv("AGENT_FAST_PATH", "1") != "0"
+
+Args = Dict[str, Any]
+Rule = Tuple[re.Pattern, str, Callable[[Dict[str, str]], Args]]
+
+_REPO = r"['\"`]?(?:(?P<owner>[\w.-]+)/)?(?P<repo>[\w.-]+?)['\"`]?"
+_IN   = r"(?:in|of|for|on|from)\s+(?:(?:the|my)\s+)?(?:repo(?:sitory)?\s+)?"
+_ISSUE = r"(?:issue|#)\s*#?(?P<number>\d+)"
+_END  = r"\s*[.!?]?\s*$"
+
+
+def _rule(pattern: str, tool: str, args: Callable[[Dict[str, str]], Args], end: str = _END) -> Rule:
+    return re.compile(r"^\s*(?:please\s+)?" + pattern + end, re.I | re.S), tool, args
+
+
+def _number(g: Dict[str, str]) -> int:
+    return int(g["number"])
+
+
+def _unquote(text: str) -> str:
+    """``text`` without one pair of matching surrounding quotes."""
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"`":
+        return text[1:-1]
+    return text
+
+
+RULES: List[Rule] = [
+    # ── repositories ───────────────────────────────────────────────────
+    _rule(r"(?:list|show|get)\s+(?:all\s+)?(?:the\s+)?branches\s+" + _IN + _REPO,
+          "list_branches", lambda g: {"repo": g["repo"], "allPages": True}),
+    _rule(r"(?:show|get|read|cat|open)\s+(?:the\s+)?(?:file\s+)?['\"`]?(?P<path>[\w./-]+\.[\w]+|[\w./-]+/[\w.-]+)['\"`]?\s+"
+          + _IN + _REPO + r"(?:\s+(?:at|on|@)\s+(?P<ref>[\w./-]+))?",
+          "get_file_contents", lambda g: {"repo": g["repo"], "path": g["path"], "ref": g["ref"]}),
+    _rule(r"(?:list|show|get)\s+(?:all\s+)?(?:the\s+)?(?:files|tree|file\s+tree)\s+" + _IN + _REPO,
+          "get_repository_tree", lambda g: {"repo": g["repo"]}),
+    _rule(r"search\s+(?:for\s+)?(?:repos|repositories)\s+(?:for\s+|matching\s+|about\s+)?(?P<query>.+?)",
+          "search_repositories", lambda g: {"query": g["query"].strip("'\"`")}),
+    # ── issues ─────────────────────────────────────────────────────────
+    _rule(r"(?:list|show|get)\s+(?:all\s+)?(?:the\s+)?(?:(?P<state>open|closed|all)\s+)?issues\s+" + _IN + _REPO,
+          "list_issues", lambda g: {"repo": g["repo"], "state": (g["state"] or "open").lower()}),
+    _rule(r"(?:show|get|open|view)\s+(?:the\s+)?" + _ISSUE + r"\s+" + _IN + _REPO,
+          "get_issue", lambda g: {"repo": g["repo"], "number": _number(g)}),
+    _rule(r"close\s+(?:the\s+)?" + _ISSUE + r"\s+" + _IN + _REPO,
+          "close_issue", lambda g: {"repo": g["repo"], "number": _number(g)}),
+    # the body is posted as typed: runs to the end of the input, punctuation included
+    _rule(r"comment\s+(?:on\s+)?(?:the\s+)?" + _ISSUE + r"\s+" + _IN + _REPO
+          + r"\s*(?::|with|saying)\s*(?P<body>.*\S)",
+          "comment_issue", lambda g: {"repo": g["repo"], "number": _number(g), "body": _unquote(g["body"])},
+          end=r"\s*$"),
+    _rule(r"search\s+(?:for\s+)?issues\s+(?:for\s+|matching\s+|about\s+)?['\"`]?(?P<query>.+?)['\"`]?"
+          r"(?:\s+" + _IN + _REPO + ")?",
+          "search_issues", lambda g: {"query": g["query"], "repo": g["repo"]}),
+    # ── users ──────────────────────────────────────────────────────────
+    _rule(r"(?:list|show|get)\s+(?:all\s+)?my\s+(?:repos|repositories)",
+          "list_user_repos", lambda g: {"allPages": True}),
+    _rule(r"(?:list|show|get|who\s+are)\s+(?:all\s+)?my\s+followers",
+          "list_followers", lambda g: {"allPages": True}),
+    _rule(r"(?:list|show|get)\s+(?:all\s+)?(?:the\s+)?(?:people|users)\s+i\s+(?:am\s+)?follow(?:ing)?"
+          r"|who\s+(?:do\s+)?i\s+follow",
+          "list_following", lambda g: {"allPages": True}),
+    _rule(r"who\s+am\s+i|(?:show|get)\s+my\s+(?:profile|account|user)",
+          "get_authenticated_user", lambda g: {}),
+]
+
+
+class Router:
+    """Match simple commands to direct tool calls."""
+
+    def __init__(self, tools: Mapping[str, Any], rules: List[Rule] = RULES,
+                 enabled: bool = FAST_PATH, owner: str | None = None):
+        self.tools = tools
+        self.rules = [r for r in rules if r[1] in tools]
+        self.enabled = enabled
+        self.owner = (owner or os.getenv("GITHUB_USERNAME") or "").lower()
+        self._lock = threading.Lock()
+        self._counters = {"turns": 0, "hits": 0, "errors": 0, "seconds": 0.0}
+        self._by_tool: Dict[str, int] = {}
+
+    def match(self, text: str) -> Tuple[str, Args] | None:
+        """(tool name, kwargs) for ``text``, or ``None`` if no rule applies."""
+        for pattern, tool, build in self.rules:
+            m = pattern.match(text)
+            if m:
+                owner = m.groupdict().get("owner")
+                if owner and owner.lower() != self.owner:
+                    return None          # the tools only reach the owner's repositories
+                args = {k: v for k, v in build(m.groupdict()).items() if v is not None}
+                return tool, args
+        return None
+
+    def _record(self, tool: str | None, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            self._counters["turns"] += 1
+            if error:
+                self._counters["errors"] += 1
+            elif tool:
+                self._counters["hits"] += 1
+                self._counters["seconds"] += seconds
+                self._by_tool[tool] = self._by_tool.get(tool, 0) + 1
+
+    def route(self, text: str) -> str | None:
+        """Run the matching tool and return its output; ``None`` means fall back."""
+        if not self.enabled:
+            return None
+        start = time.perf_counter()
+        hit = self.match(text)
+        if hit is None:
+            self._record(None, 0.0)
+            return None
+        tool, args = hit
+        try:
+            out = str(self.tools[tool].call(**args).raw_output)
+        except Exception:
+            self._record(tool, 0.0, error=True)
+            return None
+        self._record(tool, time.perf_counter() - start)
+        return out
+
+    async def aroute(self, text: str) -> str | None:
+        if not self.enabled:
+            return None
+        start = time.perf_counter()
+        hit = self.match(text)
+        if hit is None:
+            self._record(None, 0.0)
+            return None
+        tool, args = hit
+        try:
+            out = str((await self.tools[tool].acall(**args)).raw_output)
+        except Exception:
+            self._record(tool, 0.0, error=True)
+            return None
+        self._record(tool, time.perf_counter() - start)
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            c = dict(self._counters)
+            by_tool = dict(self._by_tool)
+        return {"turns": c["turns"], "hits": c["hits"], "errors": c["errors"],
+                "hit_rate": round(c["hits"] / c["turns"], 3) if c["turns"] else 0.0,
+                "avg_ms": round(1000 * c["seconds"] / c["hits"], 1) if c["hits"] else 0.0,
+                "by_tool": by_tool}
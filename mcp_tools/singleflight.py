@@ -0,0 +1,155 @@
+"""Single-flight coalescing of concurrent identical GitHub reads.
+
+When the master fans out to several specialists, or several sessions share
+one process, the same ``GET`` (``/users/{u}/repos``, ``/repos/{o}/{r}/branches``
+…) is often sent by many callers at once.  ``SingleFlight`` lets the first
+caller (the *leader*) make the request; callers arriving with the same key
+while it is in flight (*followers*) wait for it and receive the same decoded
+result, or the same exception.  Nothing is kept once the flight lands: this
+is not a cache, so a read issued after a response arrived goes to GitHub
+(and the ETag cache) as before.
+
+Keys are the response-cache keys (token fingerprint, path, sorted query),
+so callers with different tokens never share.  Threads and event loops
+share one table of ``concurrent.futures.Future``: sync followers block on
+``result()``, async followers await it through ``asyncio.wrap_future``
+(shielded, so a cancelled follower does not cancel the flight).  A sync
+caller never waits on a flight led from its own thread's event loop, which
+could not land while it blocks.  If an async leader is cancelled its
+followers send their own request.
+
+Results are shared objects: callers must treat them as read-only.
+``GITHUB_COALESCE=0`` disables the layer.  :meth:`SingleFlight.forget`
+(wired to ``common.on_mutation``) stops new callers from joining reads that
+started before a write.
+"""
+
+from __future__ import annotations
+
+import asyncio, os, threading
+from collections import Counter
+from concurrent.futures import CancelledError, Future
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Flight:
+    __slots__ = ("future", "thread", "waiters")
+
+    def __init__(self, thread: int | None):
+        self.future: Future = Future()
+        self.thread = thread            # set for async leaders: their loop's thread
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Shares one in-flight call among concurrent callers with the same key."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self._counters = {"leaders": 0, "coalesced": 0, "max_waiters": 0,
+                          "errors_shared": 0, "retried_after_cancel": 0}
+        self._paths: Counter = Counter()
+
+    @classmethod
+    def from_env(cls) -> "SingleFlight":
+        return cls(enabled=os.getenv("GITHUB_COALESCE", "1") != "0")
+
+    # ------------------------------------------------------------------ #
+    def _join(self, key: str, thread: int | None) -> Tuple[_Flight, bool]:
+        """The flight for ``key`` and whether the caller leads it."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and not (thread is None and flight.thread == threading.get_ident()):
+                flight.waiters += 1
+                self._counters["coalesced"] += 1
+                self._counters["max_waiters"] = max(self._counters["max_waiters"], flight.waiters)
+                self._paths[key.split(" ", 1)[-1].split("?", 1)[0]] += 1
+                return flight, False
+            flight = _Flight(thread)
+            if key not in self._flights:     # else: a sync caller bypassing its own loop's flight
+                self._flights[key] = flight
+            self._counters["leaders"] += 1
+            return flight, True
+
+    def _land(self, key: str, flight: _Flight) -> None:
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            if flight.waiters and not flight.future.cancelled() and flight.future.exception() is not None:
+                self._counters["errors_shared"] += 1
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """``fn()``, or the result of an identical call already in flight."""
+        if not self.enabled:
+            return fn()
+        flight, leader = self._join(key, None)
+        if not leader:
+            try:
+                return flight.future.result()
+            except CancelledError:
+                self._count("retried_after_cancel")
+                return fn()
+        try:
+            result = fn()
+        except BaseException as e:
+            flight.future.set_exception(e)
+            raise
+        else:
+            flight.future.set_result(result)
+            return result
+        finally:
+            self._land(key, flight)
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async twin of :meth:`do`; joins flights led from threads or other loops too."""
+        if not self.enabled:
+            return await fn()
+        flight, leader = self._join(key, threading.get_ident())
+        if not leader:
+            try:
+                return await asyncio.shield(asyncio.wrap_future(flight.future))
+            except (CancelledError, asyncio.CancelledError):
+                if not flight.future.cancelled():
+                    raise                      # this caller was cancelled
+                self._count("retried_after_cancel")
+                return await fn()
+        try:
+            result = await fn()
+        except (CancelledError, asyncio.CancelledError):
+            flight.future.cancel()             # followers send their own request
+            raise
+        except BaseException as e:
+            flight.future.set_exception(e)
+            raise
+        else:
+            flight.future.set_result(result)
+            return result
+        finally:
+            self._land(key, flight)
+
+    def forget(self, prefix: str) -> int:
+        """Let new callers of paths under ``prefix`` start fresh flights."""
+        with self._lock:
+            doomed = [k for k in self._flights if k.split(" ", 1)[-1].startswith(prefix)]
+            for k in doomed:
+                del self._flights[k]
+        return len(doomed)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Leaders, coalesced followers, coalescing rate and busiest paths."""
+        with self._lock:
+            counters = dict(self._counters)
+            in_flight = len(self._flights)
+            top = dict(self._paths.most_common(5))
+        calls = counters["leaders"] + counters["coalesced"]
+        return {**counters, "in_flight": in_flight,
+                "coalesce_rate": round(counters["coalesced"] / calls, 3) if calls else 0.0,
+                "top_paths": top}
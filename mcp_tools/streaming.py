@@ -0,0 +1,119 @@
+"""Token streaming from the master and specialist agents to the user.
+
+A turn that wants incremental output opens a sink::
+
+    with streaming.stream_to(lambda agent, text: print(text, end="")) as sink:
+        answer = streaming.chat(master_agent, message, "master")
+
+Inside the block :func:`chat` / :func:`achat` run ``agent.stream_chat`` and
+forward each delta of the final answer to the sink, tagged with the agent
+name.  Specialists reached through the agent tools (or a ``run_agent_plan``
+thread, which copies the context) stream into the same sink, so the user
+sees a specialist's answer while the master is still working with it.
+Without a sink both fall back to plain ``agent.chat``.
+
+The sink measures time to first token from its creation; the value lands
+on the span that was open then (``ttft_ms`` on the ``turn``) and in
+:func:`stats`.  Writers may be called from several threads (one per plan
+task); calls are serialized.
+"""
+
+from __future__ import annotations
+
+import threading, time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+from mcp_tools import tracing
+
+Writer = Callable[[str, str], None]          # (agent, text)
+
+_sink: ContextVar[Optional["TokenSink"]] = ContextVar("agent_token_sink", default=None)
+_ttfts: Deque[float] = deque(maxlen=1000)    # recent first-token latencies, ms
+_counters = {"streams": 0, "deltas": 0}
+_lock = threading.Lock()
+
+
+class TokenSink:
+    """Forwards the deltas of one turn to ``write`` and times the first one."""
+
+    def __init__(self, write: Writer):
+        self.write = write
+        self.started = time.perf_counter()
+        self.first_token_ms: Optional[float] = None
+        self.deltas = 0
+        self._span = tracing.current()
+        self._lock = threading.Lock()
+
+    def emit(self, agent: str, text: str) -> None:
+        if not text:
+            return
+        with self._lock:
+            if self.first_token_ms is None:
+                self.first_token_ms = round((time.perf_counter() - self.started) * 1000, 1)
+                self._span.set(ttft_ms=self.first_token_ms)
+                with _lock:
+                    _ttfts.append(self.first_token_ms)
+            self.deltas += 1
+            self.write(agent, text)
+
+
+@contextmanager
+def stream_to(write: Writer) -> Iterator[TokenSink]:
+    """Stream every agent answer produced inside the block to ``write``."""
+    sink = TokenSink(write)
+    token = _sink.set(sink)
+    try:
+        yield sink
+    finally:
+        _sink.reset(token)
+        with _lock:
+            _counters["streams"] += 1
+            _counters["deltas"] += sink.deltas
+
+
+def active() -> bool:
+    return _sink.get() is not None
+
+
+def chat(agent: Any, message: str, name: str) -> str:
+    """``agent.chat(message)``, streaming the answer into the active sink."""
+    sink = _sink.get()
+    if sink is None:
+        return str(agent.chat(message))
+    response = agent.stream_chat(message)
+    if not hasattr(response, "chat_stream"):     # answered without a live stream
+        text = str(response)
+        sink.emit(name, text)
+        return text
+    for delta in response.response_gen:
+        sink.emit(name, delta)
+    return str(response)
+
+
+async def achat(agent: Any, message: str, name: str) -> str:
+    """Async twin of :func:`chat` (``agent.astream_chat``)."""
+    sink = _sink.get()
+    if sink is None:
+        return str(await agent.achat(message))
+    response = await agent.astream_chat(message)
+    if not hasattr(response, "achat_stream"):
+        text = str(response)
+        sink.emit(name, text)
+        return text
+    async for delta in response.async_response_gen():
+        sink.emit(name, delta)
+    return str(response)
+
+
+def stats() -> Dict[str, Any]:
+    """Streams served, deltas forwarded and time-to-first-token percentiles."""
+    with _lock:
+        ttfts = sorted(_ttfts)
+        out: Dict[str, Any] = dict(_counters)
+    if ttfts:
+        out["ttft_ms_p50"] = ttfts[len(ttfts) // 2]
+        out["ttft_ms_p95"] = ttfts[min(len(ttfts) - 1, int(len(ttfts) * 0.95))]
+    return out
@@ -0,0 +1,178 @@
+"""Tool retrieval for the flat single-agent mode.
+
+The hierarchical mode pays two LLM hops per request (master, then a
+specialist) and every specialist prompt lists its whole tool group.  In flat
+mode (``AGENT_MODE=flat``) one ReAct agent answers directly, and each step
+offers it only the ``AGENT_FLAT_TOP_K`` tools most relevant to the request.
+
+``ToolIndex`` ranks the catalogue of :mod:`mcp_tools.registry` (names and
+descriptions from the manifest, so nothing is imported to build it) with
+BM25 over stemmed words, plus a few GitHub synonyms (``pr`` → pull request,
+``readme`` → file contents …).  With an embedding function the BM25 score is
+blended with cosine similarity.  ``ToolRetriever`` is what llama_index's
+``tool_retriever`` hook expects: ``retrieve(message)`` returns the tools,
+importing just those modules.  A follow-up that matches nothing ("and the
+second one?") is searched together with the previous request.
+"""
+
+from __future__ import annotations
+
+import math, os, re, threading
+from collections import Counter
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
+
+from mcp_tools import registry, tracing
+
+TOP_K = int(os.getenv("AGENT_FLAT_TOP_K", "5"))
+
+Embed = Callable[[str], Sequence[float]]
+
+_WORD = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an the of in on for to from by with and or only my me i is are be do does can "
+    "what which who how set true page pages optionally capped maxitems allpages "
+    "authenticated user's users owned single one call".split())
+SYNONYMS: Dict[str, Tuple[str, ...]] = {
+    "repo": ("repository",), "project": ("repository",),
+    "pr": ("pull", "request"), "bug": ("issue",), "ticket": ("issue",),
+    "readme": ("file", "content"), "code": ("file", "content"), "source": ("file", "content"),
+    "folder": ("tree", "file"), "directory": ("tree", "file"), "ls": ("tree", "file"),
+    "profile": ("user",), "account": ("user",), "whoami": ("profile",), "am": ("profile",),
+    "follow": ("follower", "following"), "star": ("repository",),
+    "all": ("every", "list"), "show": ("list", "get"), "open": ("list",), "new": ("create",), "add": ("create", "comment"),
+    "reply": ("comment",), "remove": ("delete",), "shut": ("close",), "reopen": ("close",),
+    "edit": ("update",), "write": ("create", "update", "commit"), "save": ("commit",),
+    "copy": ("fork",), "find": ("search",), "look": ("search",),
+}
+
+
+def _stem(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("ches", "shes", "sses", "xes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    if len(word) > 6 and word.endswith("ing"):
+        return word[:-3]
+    return word
+
+
+def tokenize(text: str, expand: bool = False) -> List[str]:
+    """Stemmed words of ``text`` without stopwords (``expand``: add synonyms)."""
+    words = []
+    for w in _WORD.findall(text.lower().replace("_", " ")):
+        if w in STOPWORDS or len(w) < 2:
+            continue
+        stem = _stem(w)
+        words.append(stem)
+        if expand:
+            words.extend(SYNONYMS.get(stem, SYNONYMS.get(w, ())))
+    return words
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class ToolIndex:
+    """BM25 (optionally blended with embeddings) over tool names and descriptions."""
+
+    def __init__(self, documents: Mapping[str, str], *, embed: Embed | None = None,
+                 k1: float = 1.2, b: float = 0.75):
+        self.names = list(documents)
+        self.texts = dict(documents)
+        self.embed = embed
+        self.k1, self.b = k1, b
+        self._tf = [Counter(tokenize(documents[n])) for n in self.names]
+        self._len = [sum(tf.values()) for tf in self._tf]
+        self._avg = sum(self._len) / max(len(self._len), 1)
+        df = Counter(t for tf in self._tf for t in tf)
+        n = len(self.names)
+        self._idf = {t: math.log(1 + (n - d + 0.5) / (d + 0.5)) for t, d in df.items()}
+        self._vectors: List[Sequence[float]] | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_registry(cls, tools: registry.ToolRegistry = registry.tools,
+                      embed: Embed | None = None) -> "ToolIndex":
+        """Index every tool; the name counts twice, the package once."""
+        packages = {"repos": "repository", "issues": "issue", "users": "user"}
+        return cls({name: f"{name} {name} {packages.get(tools.package_of(name), '')} "
+                          f"{tools.describe(name)}" for name in tools}, embed=embed)
+
+    def _bm25(self, query: List[str]) -> List[float]:
+        scores = []
+        for tf, length in zip(self._tf, self._len):
+            s = 0.0
+            for t in query:
+                f = tf.get(t)
+                if f:
+                    s += self._idf[t] * f * (self.k1 + 1) / (
+                        f + self.k1 * (1 - self.b + self.b * length / self._avg))
+            scores.append(s)
+        return scores
+
+    def _similarities(self, query: str) -> List[float]:
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = [self.embed(self.texts[n]) for n in self.names]
+        q = self.embed(query)
+        return [_cosine(q, v) for v in self._vectors]
+
+    def search(self, query: str, k: int = TOP_K) -> List[Tuple[str, float]]:
+        """The ``k`` best tools for ``query`` as ``(name, score)``, best first."""
+        scores = self._bm25(tokenize(query, expand=True))
+        if self.embed is not None:
+            top = max(scores) or 1.0
+            scores = [0.5 * s / top + 0.5 * c for s, c in zip(scores, self._similarities(query))]
+        ranked = sorted(zip(self.names, scores), key=lambda p: -p[1])
+        return ranked[:k]
+
+
+class ToolRetriever:
+    """``tool_retriever`` for a ReAct agent: the top-k tools per request."""
+
+    def __init__(self, index: ToolIndex, k: int = TOP_K,
+                 tools: Mapping[str, Any] = registry.tools):
+        self.index = index
+        self.k = k
+        self.tools = tools
+        self._previous = ""
+
+    def select(self, message: str) -> List[str]:
+        ranked = self.index.search(message, self.k)
+        previous, self._previous = self._previous, message
+        if previous and message != previous and not any(score > 0 for _, score in ranked):
+            ranked = self.index.search(f"{previous} {message}", self.k)
+            _count(["follow_ups"])
+        return [name for name, _ in ranked]
+
+    def retrieve(self, message: Any) -> List[Any]:
+        text = getattr(message, "query_str", message) or ""
+        with tracing.span("tool.select", k=self.k) as s:
+            names = self.select(str(text))
+            s.set(tools=",".join(names))
+        _count(["retrievals"] + ["tools_offered"] * len(names) + [f"offered:{n}" for n in names])
+        return [self.tools[n] for n in names]
+
+
+_counters: Counter = Counter()
+_lock = threading.Lock()
+
+
+def _count(keys: List[str]) -> None:
+    with _lock:
+        _counters.update(keys)
+
+
+def stats() -> Dict[str, Any]:
+    """Retrievals, tools offered per step and the most offered tools (all retrievers)."""
+    with _lock:
+        c = dict(_counters)
+    offered = Counter({k.split(":", 1)[1]: v for k, v in c.items() if k.startswith("offered:")})
+    return {"retrievals": c.get("retrievals", 0), "follow_ups": c.get("follow_ups", 0),
+            "tools_per_step": round(c.get("tools_offered", 0) / max(c.get("retrievals", 0), 1), 2),
+            "top_tools": dict(offered.most_common(5))}
@@ -0,0 +1,398 @@
+"""Structured tracing of agent turns, LLM calls, tools and GitHub requests.
+
+Off by default.  ``AGENT_TRACE=1`` keeps finished spans in memory for
+:func:`summary`; ``AGENT_TRACE_FILE=path`` turns tracing on and also appends
+one JSON line per span.  Records follow the OpenTelemetry span model (trace,
+span and parent ids, unix-nano start/end, attributes, status).  With
+``AGENT_TRACE_OTEL=1`` and ``opentelemetry-api`` installed every span is
+mirrored to the global OTel tracer provider as well.
+
+Span names: ``turn`` (one user request), ``agent.chat`` (a specialist run),
+``llm.chat``, ``tool.call``, ``github.request`` (one client call, pagination
+included), ``http`` (one HTTP exchange, retries included) and ``json.render``.
+Streamed turns carry ``ttft_ms``, the time to the first token shown.
+
+    with tracing.session(session_id), tracing.span("turn", agent="master") as s:
+        ...
+        s.set(route="fast_path")
+
+Spans nest through a ``ContextVar``; work handed to a thread pool keeps its
+parent when submitted through ``contextvars.copy_context().run``.  LLM and
+tool spans come from the llama_index callback manager (:func:`instrument_llm`);
+they are :func:`detached`: parented explicitly, never made current.
+``python -m mcp_tools.tracing spans.jsonl [--session ID]`` summarises a file.
+"""
+
+from __future__ import annotations
+
+import json, os, secrets, threading, time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+
+TRACE_FILE = os.getenv("AGENT_TRACE_FILE", "")
+ENABLED    = os.getenv("AGENT_TRACE", "1" if TRACE_FILE else "0") != "0"
+BUFFER     = int(os.getenv("AGENT_TRACE_BUFFER", "20000"))     # finished spans kept
+OTEL       = os.getenv("AGENT_TRACE_OTEL", "0") != "0"
+
+_current: ContextVar[Optional["Span"]] = ContextVar("agent_trace_span", default=None)
+_session: ContextVar[Optional[str]] = ContextVar("agent_trace_session", default=None)
+_finished: Deque[Dict[str, Any]] = deque(maxlen=BUFFER)
+_lock = threading.Lock()
+_file = None
+_otel_tracer: Any = None
+
+
+class Span:
+    """A timed operation; use as a context manager (see :func:`span`)."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "session_id",
+                 "start_ns", "end_ns", "attributes", "status", "_token", "_otel")
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.session_id = _session.get()
+        self.attributes = attributes
+        self.status = "OK"
+        self.start_ns = self.end_ns = 0
+        self._token = self._otel = None
+        if _otel_tracer is not None:
+            self._otel = _otel_start(self, parent)
+
+    def set(self, **attributes: Any) -> "Span":
+        self.attributes.update(attributes)
+        return self
+
+    def add(self, key: str, amount: float = 1) -> None:
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def start(self) -> "Span":
+        """Start timing without making the span current (see :func:`detached`)."""
+        self.start_ns = time.time_ns()
+        return self
+
+    def finish(self, exc: BaseException | None = None) -> None:
+        self.end_ns = time.time_ns()
+        if exc is not None:
+            self.status = "ERROR"
+            self.attributes["error"] = f"{type(exc).__name__}: {exc}"
+        _export(self)
+
+    def __enter__(self) -> "Span":
+        self.start()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        _current.reset(self._token)
+        self.finish(exc)
+        return False
+
+    def record(self) -> Dict[str, Any]:
+        return {"name": self.name, "trace_id": self.trace_id, "span_id": self.span_id,
+                "parent_id": self.parent_id, "session_id": self.session_id,
+                "start_time_unix_nano": self.start_ns, "end_time_unix_nano": self.end_ns,
+                "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+                "status": self.status, "attributes": self.attributes}
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is off: every call does nothing."""
+
+    def set(self, **attributes: Any) -> "_NoopSpan":
+        return self
+
+    def add(self, key: str, amount: float = 1) -> None:
+        pass
+
+    def start(self) -> "_NoopSpan":
+        return self
+
+    def finish(self, exc: BaseException | None = None) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def enabled() -> bool:
+    return ENABLED
+
+
+def configure(enable: bool | None = None, path: str | None = None, otel: bool | None = None) -> None:
+    """Change the environment defaults at runtime (``path=""`` stops the file)."""
+    global ENABLED, TRACE_FILE, OTEL, _file, _otel_tracer
+    with _lock:
+        if path is not None:
+            if _file is not None:
+                _file.close()
+                _file = None
+            TRACE_FILE = path
+            if path and enable is None:
+                enable = True
+        if enable is not None:
+            ENABLED = enable
+        if otel is not None:
+            OTEL = otel
+            _otel_tracer = None
+    if OTEL and _otel_tracer is None:
+        _otel_setup()
+
+
+def span(name: str, **attributes: Any) -> Span | _NoopSpan:
+    """A child of the current span (a new trace at the top level)."""
+    if not ENABLED:
+        return _NOOP
+    return Span(name, _current.get(), attributes)
+
+
+def detached(name: str, parent: Span | _NoopSpan | None = None, **attributes: Any) -> Span | _NoopSpan:
+    """A started span that never becomes current; end it with ``finish()``.
+
+    For spans opened and closed by callbacks, which may run in different
+    contexts: ``parent`` defaults to the current span.
+    """
+    if not ENABLED:
+        return _NOOP
+    return Span(name, parent if isinstance(parent, Span) else _current.get(), attributes).start()
+
+
+def current() -> Span | _NoopSpan:
+    """The innermost open span, for adding attributes from deeper code."""
+    return (_current.get() or _NOOP) if ENABLED else _NOOP
+
+
+@contextmanager
+def session(session_id: str | None) -> Iterator[None]:
+    """Tag every span started inside the block with ``session_id``."""
+    token = _session.set(session_id)
+    try:
+        yield
+    finally:
+        _session.reset(token)
+
+
+# ---------------------------------------------------------------------- #
+# Export
+# ---------------------------------------------------------------------- #
+def _export(s: Span) -> None:
+    record = s.record()
+    with _lock:
+        _finished.append(record)
+        if TRACE_FILE:
+            global _file
+            if _file is None:
+                _file = open(TRACE_FILE, "a", encoding="utf-8", buffering=1)
+            _file.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+    if s._otel is not None:
+        _otel_end(s)
+
+
+def _otel_setup() -> None:
+    global _otel_tracer
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        print("AGENT_TRACE_OTEL needs opentelemetry-api; spans stay local.")
+        return
+    _otel_tracer = trace.get_tracer("mcp_tools")
+
+
+def _otel_start(s: Span, parent: Optional[Span]) -> Any:
+    from opentelemetry import trace
+    context = trace.set_span_in_context(parent._otel) if parent is not None and parent._otel else None
+    return _otel_tracer.start_span(s.name, context=context, start_time=time.time_ns())
+
+
+def _otel_end(s: Span) -> None:
+    from opentelemetry.trace import Status, StatusCode
+    for key, value in s.attributes.items():
+        s._otel.set_attribute(key, value if isinstance(value, (str, bool, int, float)) else str(value))
+    if s.session_id:
+        s._otel.set_attribute("session.id", s.session_id)
+    if s.status == "ERROR":
+        s._otel.set_status(Status(StatusCode.ERROR, s.attributes.get("error")))
+    s._otel.end(end_time=s.end_ns)
+
+
+if OTEL:
+    _otel_setup()
+
+
+# ---------------------------------------------------------------------- #
+# Summaries
+# ---------------------------------------------------------------------- #
+def finished_spans(session_id: str | None = None) -> List[Dict[str, Any]]:
+    with _lock:
+        records = list(_finished)
+    if session_id is None:
+        return records
+    return [r for r in records if r["session_id"] == session_id]
+
+
+def sessions() -> List[str]:
+    return sorted({r["session_id"] for r in finished_spans() if r["session_id"]})
+
+
+def summarize(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Time per span name plus LLM token, GitHub request and cache totals."""
+    by_name: Dict[str, Dict[str, float]] = {}
+    llm = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cache_hits": 0}
+    github = {"requests": 0, "http_exchanges": 0, "retries": 0, "revalidated": 0,
+              "response_bytes": 0, "output_bytes": 0}
+    turns, ttfts = 0, []
+    for r in records:
+        a = r["attributes"]
+        stats = by_name.setdefault(r["name"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "errors": 0})
+        stats["count"] += 1
+        stats["total_ms"] += r["duration_ms"]
+        stats["max_ms"] = max(stats["max_ms"], r["duration_ms"])
+        stats["errors"] += r["status"] == "ERROR"
+        if r["name"] == "turn":
+            turns += 1
+            if "ttft_ms" in a:
+                ttfts.append(a["ttft_ms"])
+        elif r["name"] == "llm.chat":
+            llm["calls"] += 1
+            llm["prompt_tokens"] += a.get("prompt_tokens", 0)
+            llm["completion_tokens"] += a.get("completion_tokens", 0)
+            llm["cache_hits"] += a.get("cache") == "hit"
+        elif r["name"] == "github.request":
+            github["requests"] += 1
+            github["output_bytes"] += a.get("output_bytes", 0)
+        elif r["name"] == "http":
+            github["http_exchanges"] += 1
+            github["retries"] += max(a.get("attempts", 1) - 1, 0)
+            github["revalidated"] += a.get("cache") == "revalidated"
+            github["response_bytes"] += a.get("bytes", 0)
+    for stats in by_name.values():
+        stats["total_ms"] = round(stats["total_ms"], 1)
+        stats["max_ms"] = round(stats["max_ms"], 1)
+    out = {"turns": turns, "spans": by_name, "llm": llm, "github": github}
+    if ttfts:                                # streamed turns (mcp_tools.streaming)
+        ttfts.sort()
+        out["ttft_ms"] = {"turns": len(ttfts), "p50": ttfts[len(ttfts) // 2], "max": ttfts[-1]}
+    return out
+
+
+def summary(session_id: str | None = None) -> Dict[str, Any]:
+    """:func:`summarize` over the buffered spans (of one session, if given)."""
+    return summarize(finished_spans(session_id))
+
+
+def format_summary(s: Dict[str, Any]) -> str:
+    lines = [f"turns: {s['turns']}", f"{'span':<16}{'count':>7}{'total ms':>11}{'max ms':>10}{'errors':>8}"]
+    for name, st in sorted(s["spans"].items(), key=lambda kv: -kv[1]["total_ms"]):
+        lines.append(f"{name:<16}{st['count']:>7}{st['total_ms']:>11.1f}{st['max_ms']:>10.1f}{st['errors']:>8}")
+    lines.append(f"llm: {s['llm']}")
+    lines.append(f"github: {s['github']}")
+    if "ttft_ms" in s:
+        lines.append(f"time to first token: {s['ttft_ms']}")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------- #
+# llama_index hook: LLM and tool spans
+# ---------------------------------------------------------------------- #
+def _usage(response: Any) -> tuple | None:
+    raw = getattr(response, "raw", None)
+    usage = raw.get("usage") if isinstance(raw, dict) else getattr(raw, "usage", None)
+    if usage is None:
+        return None
+    get = usage.get if isinstance(usage, dict) else (lambda k: getattr(usage, k, None))
+    return get("prompt_tokens"), get("completion_tokens")
+
+
+def _chars(messages: Any) -> int:
+    return sum(len(getattr(m, "content", None) or "") for m in messages or ())
+
+
+def instrument_llm(llm: Any) -> Any:
+    """Add the tracing callback handler to ``llm`` (and the agents built on it)."""
+    from llama_index.core.callbacks import CallbackManager
+    from llama_index.core.callbacks.base_handler import BaseCallbackHandler
+    from llama_index.core.callbacks.schema import CBEventType, EventPayload
+
+    class TracingCallbackHandler(BaseCallbackHandler):
+        """Opens an ``llm.chat`` / ``tool.call`` span per callback event."""
+
+        def __init__(self) -> None:
+            super().__init__(event_starts_to_ignore=[], event_ends_to_ignore=[])
+            self._open: Dict[str, Span | _NoopSpan] = {}
+
+        def on_event_start(self, event_type, payload=None, event_id="", parent_id="", **kwargs):
+            payload = payload or {}
+            parent = self._open.get(parent_id)
+            if event_type == CBEventType.LLM:
+                model = (payload.get(EventPayload.SERIALIZED) or {}).get("model")
+                messages = payload.get(EventPayload.MESSAGES)
+                s = detached("llm.chat", parent, model=model, messages=len(messages or ()),
+                             prompt_chars=_chars(messages))
+            elif event_type == CBEventType.FUNCTION_CALL:
+                tool = payload.get(EventPayload.TOOL)
+                args = payload.get(EventPayload.FUNCTION_CALL)
+                s = detached("tool.call", parent, tool=getattr(tool, "name", "unknown"),
+                             input_bytes=len(json.dumps(args, default=str)))
+            else:
+                return event_id
+            self._open[event_id] = s
+            return event_id
+
+        def on_event_end(self, event_type, payload=None, event_id="", **kwargs):
+            s = self._open.pop(event_id, None)
+            if s is None:
+                return
+            payload = payload or {}
+            exc = payload.get(EventPayload.EXCEPTION)
+            if event_type == CBEventType.LLM and exc is None:
+                response = payload.get(EventPayload.RESPONSE)
+                text = getattr(getattr(response, "message", None), "content", None) or ""
+                usage = _usage(response)
+                if usage and usage[0] is not None:
+                    s.set(prompt_tokens=usage[0], completion_tokens=usage[1] or 0)
+                else:                    # no usage block: ~4 characters per token
+                    s.set(prompt_tokens=s.attributes["prompt_chars"] // 4,
+                          completion_tokens=len(text) // 4, tokens_estimated=True)
+            elif event_type == CBEventType.FUNCTION_CALL:
+                s.set(output_bytes=len(str(payload.get(EventPayload.FUNCTION_OUTPUT, ""))))
+            s.finish(exc)
+
+        def start_trace(self, trace_id=None) -> None:
+            pass
+
+        def end_trace(self, trace_id=None, trace_map=None) -> None:
+            pass
+
+    manager = llm.callback_manager or CallbackManager([])
+    if not any(type(h).__name__ == "TracingCallbackHandler" for h in manager.handlers):
+        manager.add_handler(TracingCallbackHandler())
+    llm.callback_manager = manager
+    return llm
+
+
+def load(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarise a span file written with AGENT_TRACE_FILE.")
+    parser.add_argument("path")
+    parser.add_argument("--session", help="only spans of this session id")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    records = [r for r in load(args.path) if args.session is None or r["session_id"] == args.session]
+    result = summarize(records)
+    print(json.dumps(result, indent=2) if args.json else format_summary(result))
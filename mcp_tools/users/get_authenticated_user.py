@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import github_request
+from mcp_tools.common import sync_and_async
+from mcp_tools.projection import USER, parse_fields
 
-def _me():
+def _me(*, fields=None):
     """Return the authenticated account profile (requires GITHUB_TOKEN)."""
-    return github_request("GET", "/user")
+    return "GET", "/user", {"fields": parse_fields(fields, USER)}
+
+_me_fn, _me_afn = sync_and_async(_me, tool="get_authenticated_user")
 
 get_authenticated_user_tool = FunctionTool.from_defaults(
-    fn=_me,
+    fn=_me_fn,
+    async_fn=_me_afn,
     name="get_authenticated_user",
     description="Fetch the profile of the token-owner (login, id, email, etc.)",
     # input_type=None,          # no parameters
@@ -4,21 +4,25 @@ from __future__ import annotations
 import os
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import github_request
+from mcp_tools.common import sync_and_async
+from mcp_tools.projection import USER, parse_fields
 
-# No input needed as we'll always use the authenticated user
+# Only the output projection is configurable: the user is always the authenticated one
 class GetUserInput(BaseModel):
-    pass
+    fields: str | None = Field(None, description="CSV of fields to return, '*' for the full payload")
 
-def _get_user():
+def _get_user(*, fields=None):
     # Always use the authenticated user's username
     username = os.getenv("GITHUB_USERNAME")
     if not username:
         raise RuntimeError("GITHUB_USERNAME env-var required.")
-    return github_request("GET", f"/users/{username}")
+    return "GET", f"/users/{username}", {"fields": parse_fields(fields, USER)}
+
+_get_user_fn, _get_user_afn = sync_and_async(_get_user, tool="get_user")
 
 get_user_tool = FunctionTool.from_defaults(
-    fn=_get_user,
+    fn=_get_user_fn,
+    async_fn=_get_user_afn,
     name="get_user",
     description="Fetch the authenticated user's profile only",
     # input_type=GetUserInput,
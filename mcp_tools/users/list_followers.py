@@ -4,13 +4,18 @@ from __future__ import annotations
 import os
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import github_request
+from mcp_tools.common import sync_and_async
+from mcp_tools.projection import USER_SUMMARY, parse_fields
 
 class ListFollowersInput(BaseModel):
     page: int | None = Field(None, ge=1)
     perPage: int | None = Field(None, ge=1, le=100)
+    allPages: bool | None = Field(False, description="Follow pagination and return every item")
+    maxItems: int | None = Field(None, ge=1, description="Cap on items when allPages is set")
+    fields: str | None = Field(None, description="CSV of fields to return, '*' for the full payload")
 
-def _list_followers(*, page=None, perPage=None):
+def _list_followers(*, page=None, perPage=None,
+                    allPages=False, maxItems=None, fields=None):
     # Always use the authenticated user's username
     username = os.getenv("GITHUB_USERNAME")
     if not username:
@@ -18,12 +23,17 @@ def _list_followers(*, page=None, perPage=None):
     params = {}
     if page:    params["page"]     = page
     if perPage: params["per_page"] = perPage
-    return github_request("GET", f"/users/{username}/followers", params=params)
+    return ("GET", f"/users/{username}/followers",
+            {"params": params, "all_pages": allPages, "max_items": maxItems,
+             "fields": parse_fields(fields, USER_SUMMARY)})
+
+_list_followers_fn, _list_followers_afn = sync_and_async(_list_followers, tool="list_followers")
 
 list_followers_tool = FunctionTool.from_defaults(
-    fn=_list_followers,
+    fn=_list_followers_fn,
+    async_fn=_list_followers_afn,
     name="list_followers",
-    description="List followers of the authenticated user only",
+    description="List followers of the authenticated user only. Set allPages=true to fetch every page (optionally capped by maxItems)",
     # input_type=ListFollowersInput,
 )
 
@@ -4,13 +4,18 @@ from __future__ import annotations
 import os
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import github_request
+from mcp_tools.common import sync_and_async
+from mcp_tools.projection import USER_SUMMARY, parse_fields
 
 class ListFollowingInput(BaseModel):
     page: int | None = Field(None, ge=1)
     perPage: int | None = Field(None, ge=1, le=100)
+    allPages: bool | None = Field(False, description="Follow pagination and return every item")
+    maxItems: int | None = Field(None, ge=1, description="Cap on items when allPages is set")
+    fields: str | None = Field(None, description="CSV of fields to return, '*' for the full payload")
 
-def _list_following(*, page=None, perPage=None):
+def _list_following(*, page=None, perPage=None,
+                    allPages=False, maxItems=None, fields=None):
     # Always use the authenticated user's username
     username = os.getenv("GITHUB_USERNAME")
     if not username:
@@ -18,12 +23,17 @@ def _list_following(*, page=None, perPage=None):
     params = {}
     if page:    params["page"]     = page
     if perPage: params["per_page"] = perPage
-    return github_request("GET", f"/users/{username}/following", params=params)
+    return ("GET", f"/users/{username}/following",
+            {"params": params, "all_pages": allPages, "max_items": maxItems,
+             "fields": parse_fields(fields, USER_SUMMARY)})
+
+_list_following_fn, _list_following_afn = sync_and_async(_list_following, tool="list_following")
 
 list_following_tool = FunctionTool.from_defaults(
-    fn=_list_following,
+    fn=_list_following_fn,
+    async_fn=_list_following_afn,
     name="list_following",
-    description="List accounts the authenticated user is following",
+    description="List accounts the authenticated user is following. Set allPages=true to fetch every page (optionally capped by maxItems)",
     # input_type=ListFollowingInput,
 )
 
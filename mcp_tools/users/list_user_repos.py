@@ -4,7 +4,8 @@ from __future__ import annotations
 import os
 from pydantic import BaseModel, Field
 from llama_index.core.tools import FunctionTool
-from mcp_tools.common import github_request
+from mcp_tools.common import sync_and_async
+from mcp_tools.projection import REPO, parse_fields
 
 class ListUserReposInput(BaseModel):
     type: str | None = Field(None, description="all, owner, member")
@@ -12,9 +13,13 @@ class ListUserReposInput(BaseModel):
     direction: str | None = Field(None, description="asc or desc")
     page: int | None = Field(None, ge=1)
     perPage: int | None = Field(None, ge=1, le=100)
+    allPages: bool | None = Field(False, description="Follow pagination and return every item")
+    maxItems: int | None = Field(None, ge=1, description="Cap on items when allPages is set")
+    fields: str | None = Field(None, description="CSV of fields to return, '*' for the full payload")
 
 def _list_repos(*, type=None, sort=None,
-                 direction=None, page=None, perPage=None):
+                 direction=None, page=None, perPage=None,
+                 allPages=False, maxItems=None, fields=None):
     # Always use the authenticated user's username
     username = os.getenv("GITHUB_USERNAME")
     if not username:
@@ -25,12 +30,17 @@ def _list_repos(*, type=None, sort=None,
     if direction: params["direction"] = direction
     if page:      params["page"]      = page
     if perPage:   params["per_page"]  = perPage
-    return github_request("GET", f"/users/{username}/repos", params=params)
+    return ("GET", f"/users/{username}/repos",
+            {"params": params, "all_pages": allPages, "max_items": maxItems,
+             "fields": parse_fields(fields, REPO)})
+
+_list_repos_fn, _list_repos_afn = sync_and_async(_list_repos, tool="list_user_repos")
 
 list_user_repos_tool = FunctionTool.from_defaults(
-    fn=_list_repos,
+    fn=_list_repos_fn,
+    async_fn=_list_repos_afn,
     name="list_user_repos",
-    description="List repositories owned by the authenticated user only",
+    description="List repositories owned by the authenticated user only. Set allPages=true to fetch every page (optionally capped by maxItems)",
     # input_type=ListUserReposInput,
 )
 
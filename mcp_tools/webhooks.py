@@ -0,0 +1,385 @@
+"""GitHub webhook receiver that keeps the local caches exact.
+
+Instead of polling or trusting TTLs, GitHub tells us what changed.  Each
+delivery is checked against ``X-Hub-Signature-256`` (HMAC-SHA256 with
+``GITHUB_WEBHOOK_SECRET``) and turned into precise cache effects:
+
+=============  ===========================================================
+push           branch listing, refs/trees of the branch, changed files and
+               the directories that gained or lost entries (everything
+               under ``contents`` when the payload's commit list is truncated)
+issues         the issue, the issue list, search; the issue mirror is
+               updated from the payload (dropped on deleted/transferred)
+issue_comment  the issue's comments, the issue, the list; mirror updated
+create/delete  branch or tag listings and the ref's refs/trees
+repository     the repo and the repo listings; the mirror forgets deleted,
+               renamed and transferred repositories
+=============  ===========================================================
+
+Cached GET responses (``common.response_cache``) are dropped, and
+``common.notify_mutation`` runs for the touched paths, so every other
+listener (LLM response cache, issue mirror) reacts as it does to our own
+writes.  Blobs need nothing: they are content-addressed.
+
+The receiver must live in the process that owns the caches:
+``agent_server.py`` serves it at ``POST /webhooks/github`` and the CLI
+starts one when ``GITHUB_WEBHOOK_PORT`` is set.  With
+``GITHUB_WEBHOOK_RECORD_DIR`` every accepted delivery is saved as JSON;
+``python -m mcp_tools.webhooks replay FILE…`` feeds recordings back through
+the processor (no signature needed), ``… serve`` runs a standalone receiver.
+"""
+
+from __future__ import annotations
+
+import hashlib, hmac, json, os, threading, time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qs
+
+from mcp_tools import common, issue_store
+
+SECRET         = os.getenv("GITHUB_WEBHOOK_SECRET", "")
+RECORD_DIR     = os.getenv("GITHUB_WEBHOOK_RECORD_DIR", "")
+MAX_BODY_BYTES = 25 << 20            # GitHub caps payloads at 25 MB
+SEEN_DELIVERIES = 1024               # redeliveries inside this window are ignored
+
+
+def verify_signature(secret: str, body: bytes, header: str | None) -> bool:
+    """True if ``header`` (``sha256=<hex>``) signs ``body`` with ``secret``."""
+    if not secret or not header or not header.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, header[len("sha256="):])
+
+
+def sign(secret: str, body: bytes) -> str:
+    """``X-Hub-Signature-256`` value for ``body`` (for tests and replays)."""
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+@dataclass
+class Effects:
+    """What one delivery changes in the caches."""
+    prefixes: List[str] = field(default_factory=list)      # drop paths below these
+    exact: List[str] = field(default_factory=list)         # drop these paths (any query)
+    notify: List[str] = field(default_factory=list)        # common.notify_mutation
+    upserts: List[Tuple[str, Dict[str, Any]]] = field(default_factory=list)      # (repo, issue)
+    deletes: List[Tuple[str, Optional[int]]] = field(default_factory=list)       # (repo, number|None)
+    stale_repo_lists: List[str] = field(default_factory=list)                    # owners
+
+
+def _repo(payload: Mapping[str, Any]) -> Tuple[str, str]:
+    full = payload["repository"]["full_name"]
+    return full, f"/repos/{full}"
+
+
+def _parent(path: str) -> str:
+    return path.rsplit("/", 1)[0] if "/" in path else ""
+
+
+def _listings(owner: str) -> Effects:
+    return Effects(prefixes=["/user/repos", f"/users/{owner}/repos", "/search/repositories"],
+                   stale_repo_lists=[owner])
+
+
+def _push(p: Mapping[str, Any]) -> Effects:
+    full, base = _repo(p)
+    ref = p.get("ref") or ""
+    fx = Effects(notify=[f"{base}/contents"])
+    if ref.startswith("refs/tags/"):
+        tag = ref[len("refs/tags/"):]
+        fx.exact += [f"{base}/tags"]
+        fx.prefixes += [f"{base}/git/refs/tags/{tag}", f"{base}/git/ref/tags/{tag}"]
+        return fx
+    branch = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+    fx.exact += [f"{base}/branches", f"{base}/commits"]
+    fx.prefixes += [f"{base}/branches/{branch}", f"{base}/git/refs/heads/{branch}",
+                    f"{base}/git/ref/heads/{branch}", f"{base}/git/trees/{branch}",
+                    f"{base}/commits/{branch}"]
+    commits = p.get("commits") or []
+    # "size" counts every commit pushed; the list itself may be truncated
+    truncated = len(commits) < p["size"] if "size" in p else len(commits) >= 20
+    partial = p.get("forced") or p.get("deleted") or p.get("created") or truncated
+    if partial:
+        fx.prefixes.append(f"{base}/contents")
+        return fx
+    for c in commits:
+        for path in c.get("modified") or ():
+            fx.prefixes.append(f"{base}/contents/{path}")
+        for path in (c.get("added") or []) + (c.get("removed") or []):
+            fx.prefixes.append(f"{base}/contents/{path}")
+            parent = _parent(path)
+            while True:                      # new or emptied directories show up above too
+                fx.exact.append(f"{base}/contents/{parent}" if parent else f"{base}/contents")
+                if not parent:
+                    break
+                parent = _parent(parent)
+    if any(path.lower().startswith("readme") for c in commits
+           for path in (c.get("added") or []) + (c.get("modified") or []) + (c.get("removed") or [])):
+        fx.exact.append(f"{base}/readme")
+    return fx
+
+
+def _issues(p: Mapping[str, Any]) -> Effects:
+    full, base = _repo(p)
+    issue = p["issue"]
+    n = issue["number"]
+    fx = Effects(prefixes=[f"{base}/issues/{n}", "/search/issues"],
+                 exact=[f"{base}/issues", base],          # the repo carries open_issues_count
+                 notify=[f"{base}/issues/{n}"])
+    if p.get("action") in ("deleted", "transferred"):
+        fx.deletes.append((full, n))
+    else:
+        fx.upserts.append((full, issue))
+    return fx
+
+
+def _issue_comment(p: Mapping[str, Any]) -> Effects:
+    full, base = _repo(p)
+    issue = p["issue"]
+    n = issue["number"]
+    return Effects(prefixes=[f"{base}/issues/{n}/comments", f"{base}/issues/comments", "/search/issues"],
+                   exact=[f"{base}/issues/{n}", f"{base}/issues"],
+                   notify=[f"{base}/issues/{n}/comments"], upserts=[(full, issue)])
+
+
+def _ref_event(p: Mapping[str, Any]) -> Effects:
+    full, base = _repo(p)
+    ref, kind = p.get("ref") or "", p.get("ref_type")
+    if kind == "tag":
+        return Effects(exact=[f"{base}/tags"], notify=[f"{base}/git/refs/tags/{ref}"],
+                       prefixes=[f"{base}/git/refs/tags/{ref}", f"{base}/git/ref/tags/{ref}"])
+    if kind == "branch":
+        return Effects(exact=[f"{base}/branches"], notify=[f"{base}/git/refs/heads/{ref}"],
+                       prefixes=[f"{base}/branches/{ref}", f"{base}/git/refs/heads/{ref}",
+                                 f"{base}/git/ref/heads/{ref}", f"{base}/git/trees/{ref}"])
+    return Effects()                         # create/delete of a repository: see "repository"
+
+
+def _repository(p: Mapping[str, Any]) -> Effects:
+    full, base = _repo(p)
+    owner = full.split("/")[0]
+    action = p.get("action")
+    fx = _listings(owner)
+    gone = [full] if action in ("deleted", "transferred") else []
+    if action == "renamed":
+        old = (p.get("changes") or {}).get("repository", {}).get("name", {}).get("from")
+        if old:
+            gone.append(f"{owner}/{old}")
+    for name in gone:
+        fx.prefixes.append(f"/repos/{name}/")
+        fx.exact.append(f"/repos/{name}")
+        fx.deletes.append((name, None))
+    fx.exact.append(base)
+    fx.notify.append(base)
+    return fx
+
+
+HANDLERS: Dict[str, Callable[[Mapping[str, Any]], Effects]] = {
+    "push": _push, "issues": _issues, "issue_comment": _issue_comment,
+    "create": _ref_event, "delete": _ref_event, "repository": _repository,
+}
+
+
+class WebhookProcessor:
+    """Applies deliveries to the response cache, issue mirror and mutation listeners."""
+
+    def __init__(self, response_cache=None,
+                 get_store: Callable[[], Any] = issue_store.get_issue_store):
+        self.response_cache = response_cache or common.response_cache
+        self.get_store = get_store
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"deliveries": 0, "ignored": 0, "duplicates": 0,
+                          "invalidated": 0, "issues_updated": 0, "issues_deleted": 0}
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[key] += amount
+
+    def _duplicate(self, delivery: str | None) -> bool:
+        if not delivery:
+            return False
+        with self._lock:
+            return delivery in self._seen
+
+    def _remember(self, delivery: str | None) -> None:
+        """Mark ``delivery`` applied; a failed one stays eligible for redelivery."""
+        if not delivery:
+            return
+        with self._lock:
+            self._seen[delivery] = None
+            while len(self._seen) > SEEN_DELIVERIES:
+                self._seen.popitem(last=False)
+
+    def handle(self, event: str, payload: Mapping[str, Any],
+               delivery: str | None = None) -> Dict[str, Any]:
+        """Apply one delivery; returns a summary of what was touched."""
+        result: Dict[str, Any] = {"event": event, "action": payload.get("action")}
+        handler = HANDLERS.get(event)
+        if handler is None or "repository" not in payload:
+            self._count("ignored")
+            return {**result, "ignored": True}
+        if self._duplicate(delivery):
+            self._count("duplicates")
+            return {**result, "duplicate": True}
+        fx = handler(payload)
+        dropped = sum(self.response_cache.invalidate(p) for p in dict.fromkeys(fx.prefixes))
+        dropped += sum(self.response_cache.invalidate(p, exact=True) for p in dict.fromkeys(fx.exact))
+        for path in dict.fromkeys(fx.notify):
+            common.notify_mutation(path)
+        store = self.get_store()
+        updated = deleted = 0
+        if store is not None:
+            mine = lambda repo: repo.split("/")[0].lower() == store.owner.lower()
+            fx.deletes = [(r, n) for r, n in fx.deletes if mine(r)]
+            fx.upserts = [(r, i) for r, i in fx.upserts if mine(r)]
+            for repo, number in fx.deletes:
+                deleted += store.delete(repo, number)
+            for repo, issue in fx.upserts:
+                updated += store.upsert(repo, [issue])
+            if any(owner.lower() == store.owner.lower() for owner in fx.stale_repo_lists):
+                store.mark_repo_list_stale()
+        self._remember(delivery)
+        self._count("deliveries")
+        self._count("invalidated", dropped)
+        self._count("issues_updated", updated)
+        self._count("issues_deleted", deleted)
+        return {**result, "repository": payload["repository"].get("full_name"),
+                "invalidated": dropped, "notified": list(dict.fromkeys(fx.notify)),
+                "issues_updated": updated, "issues_deleted": deleted}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+
+_processor: WebhookProcessor | None = None
+_processor_lock = threading.Lock()
+
+
+def get_processor() -> WebhookProcessor:
+    global _processor
+    if _processor is None:
+        with _processor_lock:
+            if _processor is None:
+                _processor = WebhookProcessor()
+    return _processor
+
+
+# ---------------------------------------------------------------------- #
+# HTTP
+# ---------------------------------------------------------------------- #
+def _record(event: str, delivery: str | None, payload: Any) -> None:
+    os.makedirs(RECORD_DIR, exist_ok=True)
+    name = f"{time.strftime('%Y%m%dT%H%M%S')}-{event}-{delivery or os.getpid()}.json"
+    with open(os.path.join(RECORD_DIR, name), "w", encoding="utf-8") as fh:
+        json.dump({"event": event, "delivery": delivery, "payload": payload}, fh)
+
+
+def receive(headers: Mapping[str, str], body: bytes, *, secret: str | None = None,
+            processor: WebhookProcessor | None = None) -> Tuple[int, Dict[str, Any]]:
+    """Verify and apply one HTTP delivery: ``(status, JSON reply)``."""
+    secret = SECRET if secret is None else secret
+    if not secret:
+        return 503, {"error": "GITHUB_WEBHOOK_SECRET is not set"}
+    if not verify_signature(secret, body, headers.get("X-Hub-Signature-256")):
+        return 401, {"error": "bad signature"}
+    event = headers.get("X-GitHub-Event") or ""
+    delivery = headers.get("X-GitHub-Delivery")
+    if (headers.get("Content-Type") or "").startswith("application/x-www-form-urlencoded"):
+        body = (parse_qs(body.decode()).get("payload") or ["{}"])[0].encode()
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        return 400, {"error": "invalid JSON payload"}
+    if not isinstance(payload, dict):
+        return 400, {"error": "payload must be a JSON object"}
+    if event == "ping":
+        return 200, {"pong": payload.get("zen", True)}
+    if RECORD_DIR:
+        _record(event, delivery, payload)
+    try:
+        return 200, (processor or get_processor()).handle(event, payload, delivery)
+    except (KeyError, TypeError, AttributeError, ValueError) as e:
+        return 400, {"error": f"malformed {event} payload: {type(e).__name__}: {e}"}
+    except Exception as e:                   # cache or mirror failure: GitHub redelivers on 5xx
+        return 500, {"error": f"{type(e).__name__}: {e}"}
+
+
+class WebhookRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        length = self.headers.get("Content-Length") or "0"
+        if not length.isdigit():
+            status, reply = 400, {"error": "bad Content-Length"}
+            self.close_connection = True     # the body is left unread
+        elif int(length) > MAX_BODY_BYTES:
+            status, reply = 413, {"error": "payload too large"}
+            self.close_connection = True
+        else:
+            try:
+                status, reply = receive(self.headers, self.rfile.read(int(length)))
+            except Exception as e:
+                status, reply = 500, {"error": f"{type(e).__name__}: {e}"}
+        body = json.dumps(reply, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def start_receiver(host: str = "127.0.0.1", port: int = 8787) -> ThreadingHTTPServer:
+    """Serve deliveries on a background thread of this process."""
+    server = ThreadingHTTPServer((host, port), WebhookRequestHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def replay(paths: Iterable[str], event: str | None = None,
+           processor: WebhookProcessor | None = None) -> List[Dict[str, Any]]:
+    """Apply recorded deliveries (``{"event", "payload"}`` files, or raw payloads with ``event``)."""
+    processor = processor or get_processor()
+    results = []
+    for path in paths:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        if "payload" in data and "event" in data:
+            results.append(processor.handle(data["event"], data["payload"], data.get("delivery")))
+        elif event:
+            results.append(processor.handle(event, data))
+        else:
+            raise ValueError(f"{path}: not a recording; pass the event name")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="GitHub webhook receiver for cache invalidation.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="run a standalone receiver")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=int(os.getenv("GITHUB_WEBHOOK_PORT", "8787")))
+    rep = sub.add_parser("replay", help="apply recorded deliveries")
+    rep.add_argument("files", nargs="+")
+    rep.add_argument("--event", help="event name for raw payload files")
+    args = parser.parse_args()
+    if args.command == "replay":
+        for r in replay(args.files, args.event):
+            print(json.dumps(r))
+    else:
+        receiver = start_receiver(args.host, args.port)
+        print(f"webhook receiver on http://{args.host}:{receiver.server_port}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            receiver.shutdown()